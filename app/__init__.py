@@ -15,11 +15,14 @@ from app.models.job import Job
 from app.models.meeting import Meeting
 from app.models.action import Action
 from app.models.exotel_calls import ExotelCall
+from app.models.exotel_call_deliveries import ExotelCallDelivery
 from app.models.mobile_app_calls import MobileAppCall
+from app.models.reconciliation_tasks import ReconciliationTask
 from app.models.jwt_token_blocklist import TokenBlocklist
 from app.models.semantic_document import SemanticDocument
 from app.models.search_analytics import SearchAnalytics
 from app.external.aws.ecs_client import ECSClient
+from app.utils.json_provider import ORJSONProvider
 
 from flask import Flask
 
@@ -41,12 +44,15 @@ def allow_localhost_origin(origin):
 
 @jwt.token_in_blocklist_loader
 def check_if_token_revoked(jwt_header, jwt_payload):
-    jti = jwt_payload["jti"]
-    return db.session.query(TokenBlocklist.id).filter_by(jti=jti).first() is not None
+    from app.services.token_service import TokenBlocklistService
+
+    # Redis EXISTS once the denylist is synced; DB only as a fallback
+    return TokenBlocklistService.is_token_revoked(jwt_payload["jti"])
 
 
 def create_app():
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     CORS(app, supports_credentials=True, origins=["http://localhost:8080", "http://app.chirpworks.ai", "https://app.chirpworks.ai"])
     app.config.from_object(Config)
     app.secret_key = Config.SECRET_KEY
@@ -64,15 +70,13 @@ def create_app():
         from app.routes import register_routes
         register_routes(app)
 
+        from app.commands import register_commands
+        register_commands(app)
+
         # ecs_client = ECSClient()
 
         # Start job monitoring in a separate thread
         # monitor_thread = threading.Thread(target=ecs_client.monitor_agent_jobs, args=(app,), daemon=True)
         # monitor_thread.start()
 
-    # Set up token revocation checking
-    @jwt.token_in_blocklist_loader
-    def check_if_token_revoked_callback(jwt_header, jwt_payload):
-        return check_if_token_revoked(jwt_header, jwt_payload)
-
     return app
@@ -0,0 +1,35 @@
+import click
+
+
+def register_commands(app):
+    """Register the app's `flask` CLI commands."""
+
+    @app.cli.command("ensure-app-call-partitions")
+    def ensure_app_call_partitions():
+        """
+        Create any missing app_calls monthly partitions. Run on deploy (after
+        flask db upgrade) and on a daily schedule (cron / ECS scheduled task).
+        """
+        from app.services.call_service import CallService
+
+        CallService.ensure_app_call_partitions()
+        click.echo("app_calls partitions are up to date")
+
+    @app.cli.command("retry-reconciliation-tasks")
+    def retry_reconciliation_tasks():
+        """
+        Retry webhook reconciliation work that gave up or was lost with its
+        worker. Run on a schedule (cron / ECS scheduled task), e.g. every 15 minutes.
+        """
+        from app.tasks import retry_reconciliation_tasks as run_retries
+
+        retried = run_retries()
+        click.echo(f"Retried {retried} reconciliation tasks")
+
+    @app.cli.command("backfill-products-discussed")
+    def backfill_products_discussed():
+        """One-off: materialize buyers.avg_products_discussed for buyers that don't have it yet."""
+        from app.services.buyer_service import BuyerService
+
+        filled = BuyerService.backfill_products_discussed_summaries()
+        click.echo(f"Filled avg_products_discussed for {filled} buyers")
@@ -37,6 +37,11 @@ class ExotelCreds:
     EXOTEL_API_TOKEN = os.environ.get('EXOTEL_API_TOKEN')
 
 
+class RunPodCreds:
+    RUNPOD_API_KEY = os.environ.get('RUNPOD_API_KEY')
+    RUNPOD_DIARIZATION_URL = os.environ.get('RUNPOD_DIARIZATION_URL')
+
+
 class CalendarName(Enum):
     GOOGLE = 'google'
 
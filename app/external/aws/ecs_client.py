@@ -1,4 +1,5 @@
 import os
+import threading
 import time
 from datetime import datetime, timedelta
 import logging
@@ -41,7 +42,7 @@ class ECSClient:
 
     def get_agent_task_status(self, job_id):
         """Fetch ECS task status using job_id."""
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if not job:
             return None
 
@@ -170,3 +171,21 @@ class ECSClient:
         except Exception as e:
             logging.error(f"Failed to start diarization ECS task for job_id: {job_id} with error {str(e)}")
             raise e
+
+
+_shared_ecs_client = None
+_shared_ecs_client_lock = threading.Lock()
+
+
+def get_ecs_client() -> ECSClient:
+    """
+    Process-wide ECSClient, created on first use. boto3 clients are thread-safe, so
+    request handlers and background launch threads share one instead of repeating
+    credential resolution and connection setup per call.
+    """
+    global _shared_ecs_client
+    if _shared_ecs_client is None:
+        with _shared_ecs_client_lock:
+            if _shared_ecs_client is None:
+                _shared_ecs_client = ECSClient()
+    return _shared_ecs_client
@@ -1,5 +1,6 @@
 import boto3
 import os
+import threading
 
 import logging
 from dotenv import load_dotenv
@@ -26,17 +27,25 @@ class S3Client:
     def download_token_file(self, object_name, download_path):
         self.download_file(self.token_bucket_name, object_name, download_path)
 
-    def upload_file(self, bucket_name, file_path, object_name=None):
-        """Uploads a file to S3"""
+    def upload_file(self, bucket_name, file_path, object_name=None, config=None):
+        """Uploads a file to S3, optionally with a boto3 TransferConfig for multipart uploads"""
         if object_name is None:
             object_name = os.path.basename(file_path)
 
         try:
-            self.s3.upload_file(file_path, bucket_name, object_name)
+            self.s3.upload_file(file_path, bucket_name, object_name, Config=config)
             return
         except Exception as e:
             return str(e)
 
+    def upload_fileobj(self, bucket_name, fileobj, object_name, config=None):
+        """Streams a readable file-like object to S3 as a (multipart) upload"""
+        try:
+            self.s3.upload_fileobj(fileobj, bucket_name, object_name, Config=config)
+        except Exception as e:
+            logging.error(f'Failed to upload {object_name} to S3: {e}')
+            raise e
+
     def download_file(self, bucket_name, object_name, download_path):
         """Downloads a file from S3"""
         try:
@@ -45,6 +54,14 @@ class S3Client:
         except Exception as e:
             return str(e)
 
+    def generate_presigned_put_url(self, bucket_name, key, expires_in=3600):
+        """Presigned URL that lets a client PUT an object straight to S3"""
+        return self.s3.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': bucket_name, 'Key': key},
+            ExpiresIn=expires_in
+        )
+
     def get_file_content(self, bucket_name, key):
         try:
             response = self.s3.get_object(Bucket=bucket_name, Key=key)
@@ -62,3 +79,20 @@ class S3Client:
             logging.error(f'Failed to upload file {key} to S3: {e}')
             raise e
 
+
+
+_shared_s3_client = None
+_shared_s3_client_lock = threading.Lock()
+
+
+def get_s3_client() -> S3Client:
+    """
+    Process-wide S3Client, created on first use. boto3 clients are thread-safe, so
+    request handlers and background threads share one boto3 client.
+    """
+    global _shared_s3_client
+    if _shared_s3_client is None:
+        with _shared_s3_client_lock:
+            if _shared_s3_client is None:
+                _shared_s3_client = S3Client()
+    return _shared_s3_client
@@ -1,4 +1,3 @@
-import traceback
 from typing import Optional
 
 import logging
@@ -140,7 +139,7 @@ class CallAnalysis:
                     )
             db.session.flush()
         except Exception as e:
-            logging.error(f"Failed to run analytical analysis with error {e}: {traceback.format_exc()}")
+            logging.exception("Failed to run analytical analysis")
             raise e
 
     def process_descriptive_prompt(self):
@@ -190,5 +189,5 @@ class CallAnalysis:
             self.meeting.llm_descriptive_response = self.descriptive_call_analysis
             db.session.flush()
         except Exception as e:
-            logging.error(f"Failed to run descriptive analysis with error {e}: {traceback.format_exc()}")
+            logging.exception("Failed to run descriptive analysis")
             raise e
@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 
-from app.external.aws.ecs_client import ECSClient
+from app.external.aws.ecs_client import get_ecs_client
 from app.constants import CalendarName
 
 
 class JobScheduler:
     def __init__(self):
-        self.ecs_client = ECSClient()
+        # Shared process-wide boto3 client, not a new one per scheduler
+        self.ecs_client = get_ecs_client()
 
     # def schedule_agent_job(self, event: dict, calendar_name: CalendarName):
     #     start_time_str = event['start']['dateTime']
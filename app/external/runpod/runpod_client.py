@@ -0,0 +1,80 @@
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.constants import RunPodCreds
+
+logging = logging.getLogger(__name__)
+
+
+class RunPodClient:
+    # (connect, read) seconds for a RunPod API call
+    TIMEOUT = (3, 10)
+
+    def __init__(self):
+        """
+        Initialize a pooled HTTP session for the RunPod API. Connections are kept
+        alive between calls, and rate limits (429) and transient 5xx responses are
+        retried with backoff, honouring Retry-After. Connection failures are retried,
+        but read timeouts are not: the POST may already have started a job.
+        """
+        self.session = requests.Session()
+        retries = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"POST"})
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Sent with every request on the session, so no per-call header dict
+        self.session.headers.update({"Authorization": f"Bearer {RunPodCreds.RUNPOD_API_KEY}"})
+
+    def start_diarization(self, job_id):
+        """Start the speaker diarization endpoint for a job."""
+        runpod_diarization_url = RunPodCreds.RUNPOD_DIARIZATION_URL
+        if not runpod_diarization_url:
+            logging.error("RUNPOD_DIARIZATION_URL environment variable not set")
+            return None
+        if not RunPodCreds.RUNPOD_API_KEY:
+            logging.error("RUNPOD_API_KEY environment variable not set")
+            return None
+
+        payload = {
+            "input": {
+                "job_id": str(job_id),
+            }
+        }
+        response = self.session.post(
+            runpod_diarization_url, json=payload, timeout=self.TIMEOUT
+        )
+        if response.status_code == 200:
+            result = response.json()
+            logging.info(f"Successfully started diarization: {str(result)}")
+            return result
+
+        logging.error(f"Error in starting diarization: {response.status_code}, {response.text}")
+        return None
+
+
+_shared_runpod_client = None
+_shared_runpod_client_lock = threading.Lock()
+
+
+def get_runpod_client() -> RunPodClient:
+    """
+    Process-wide RunPodClient, created on first use, so every diarization
+    request reuses the same pooled TLS connections.
+    """
+    global _shared_runpod_client
+    if _shared_runpod_client is None:
+        with _shared_runpod_client_lock:
+            if _shared_runpod_client is None:
+                _shared_runpod_client = RunPodClient()
+    return _shared_runpod_client
@@ -11,6 +11,11 @@ class Buyer(db.Model):
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     phone = db.Column(db.String(20), nullable=False)
+    # '+91 <last 10>' display form (same rule as denormalize_phone_number), maintained by Postgres
+    phone_display = db.Column(
+        db.String(20),
+        db.Computed("CASE WHEN length(phone) >= 10 THEN '+91 ' || right(phone, 10) ELSE phone END", persisted=True)
+    )
     name = db.Column(db.String(100), nullable=True)
     email = db.Column(db.String(100), nullable=True)
     agency_id = db.Column(UUID(as_uuid=True), db.ForeignKey('agencies.id'), nullable=False)
@@ -19,5 +24,13 @@ class Buyer(db.Model):
     actions = db.relationship('Action', back_populates='buyer', cascade='all, delete-orphan')
     risks = db.Column(db.JSON, nullable=True)
     products_discussed = db.Column(db.JSON, nullable=True)
+    # Products aggregated from all of the buyer's meetings; maintained by BuyerService
+    avg_products_discussed = db.Column(db.JSON, nullable=True)
     key_highlights = db.Column(db.JSON, nullable=True)
     company_name = db.Column(db.String(100), nullable=True)
+    # Start of the latest meeting with this buyer; maintained by BuyerService.record_contact
+    last_contacted_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    # Maintained by the actions_pending_count_trg trigger on actions
+    pending_actions_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bumped on every write (including materialized fields); used as the ETag for buyer reads
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=db.func.now(), onupdate=db.func.now())
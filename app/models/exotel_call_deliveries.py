@@ -0,0 +1,11 @@
+from app import db
+
+
+# Exotel CallSids whose recording webhook has been accepted. Unlike exotel_calls,
+# rows are never deleted on reconciliation, so a redelivered webhook is
+# recognised even after its call became a meeting
+class ExotelCallDelivery(db.Model):
+    __tablename__ = 'exotel_call_deliveries'
+
+    call_sid = db.Column(db.String(64), primary_key=True)
+    received_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
@@ -7,9 +7,14 @@ from sqlalchemy import UUID
 from app import db
 
 
-# Deal model
+# Exotel recording awaiting reconciliation with a mobile app call log
 class ExotelCall(db.Model):
     __tablename__ = 'exotel_calls'
+    # Reconciliation lookup: phone equality plus a start/end time window. call_from is
+    # always stored normalized ('0091' + last 10 digits) by CallService, so lookups
+    # compare the plain column and need no expression index
+    __table_args__ = (db.Index('ix_exotel_calls_from_time', 'call_from', 'start_time', 'end_time'),)
+
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     call_from = db.Column(db.String(15), nullable=False)
     start_time = db.Column(db.DateTime(timezone=True), default=datetime.now(ZoneInfo("Asia/Kolkata")), nullable=False)
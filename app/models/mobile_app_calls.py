@@ -7,15 +7,23 @@ from sqlalchemy import UUID
 from app import db
 
 
-# Deal model
+# Call log entry from the mobile app; removed once reconciled into a Meeting
 class MobileAppCall(db.Model):
     __tablename__ = 'app_calls'
+    # Reconciliation lookup: phone equality plus a start/end time window. seller_number is
+    # always stored normalized ('0091' + last 10 digits) by CallService, so lookups
+    # compare the plain column and need no expression index
+    __table_args__ = (db.Index('ix_app_calls_seller_time', 'seller_number', 'start_time', 'end_time'),)
+
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     mobile_app_call_id = db.Column(db.String(50), nullable=False)
     buyer_number = db.Column(db.String(15), nullable=False)
     seller_number = db.Column(db.String(15), nullable=False)
     call_type = db.Column(db.String, nullable=True)
-    start_time = db.Column(db.DateTime(timezone=True), default=datetime.now(ZoneInfo("Asia/Kolkata")), nullable=False)
+    # Part of the primary key: app_calls is partitioned by start_time, and a
+    # partitioned table's primary key must include the partition key
+    start_time = db.Column(db.DateTime(timezone=True), default=datetime.now(ZoneInfo("Asia/Kolkata")),
+                           primary_key=True, nullable=False)
     end_time = db.Column(db.DateTime(timezone=True), default=datetime.now(ZoneInfo("Asia/Kolkata")), nullable=False)
     duration = db.Column(db.Integer, nullable=False, default=0)
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('sellers.id'), nullable=False)
@@ -0,0 +1,21 @@
+import uuid
+
+from sqlalchemy import UUID
+
+from app import db
+
+
+# Durable record of queued reconciliation work (app/tasks/reconcile.py). A row is
+# deleted once its task succeeds, so any row left behind belongs to a task that
+# gave up or was lost with its worker, and `flask retry-reconciliation-tasks` retries it
+class ReconciliationTask(db.Model):
+    __tablename__ = 'reconciliation_tasks'
+    __table_args__ = (db.Index('ix_reconciliation_tasks_updated_at', 'updated_at'),)
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    task = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
@@ -20,11 +20,20 @@ class SellerRole(Enum):
 
 class Seller(db.Model):
     __tablename__ = 'sellers'
+    # Cheaper hash for generated single-use OTPs (16 random chars); user-chosen
+    # passwords keep werkzeug's default cost
+    OTP_PASSWORD_HASH_METHOD = 'pbkdf2:sha256:10000'
+
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     username = db.Column(db.String(150), nullable=True, unique=True)
     name = db.Column(db.String(100), nullable=False, unique=False)
     email = db.Column(db.String(150), nullable=False, unique=True)
     phone = db.Column(db.String(20), nullable=False, unique=True)
+    # Last 10 digits of phone, maintained by Postgres; backs sellers_phone_norm_idx
+    phone_normalized = db.Column(
+        db.String(20),
+        db.Computed(r"right(regexp_replace(phone, '\D', '', 'g'), 10)", persisted=True)
+    )
     password_hash = db.Column(db.String(200), nullable=False)
     role = db.Column(db.Enum(SellerRole), default=SellerRole.USER)
     agency_id = db.Column(UUID(as_uuid=True), db.ForeignKey('agencies.id'), nullable=False)
@@ -52,5 +61,5 @@ class Seller(db.Model):
     def generate_access_token(self, **kwargs):
         return create_access_token(identity=self.id, **kwargs)
 
-    def generate_refresh_token(self):
-        return create_refresh_token(identity=self.id)
+    def generate_refresh_token(self, **kwargs):
+        return create_refresh_token(identity=self.id, **kwargs)
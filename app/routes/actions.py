@@ -1,5 +1,4 @@
 import logging
-import traceback
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
@@ -77,9 +76,8 @@ def get_actions():
         
         return jsonify(response), 200
 
-    except Exception as e:
-        logging.error(f"Error fetching actions: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Error fetching actions")
         return jsonify({"error": "Failed to fetch actions"}), 500
 
 
@@ -104,9 +102,8 @@ def get_action_by_id(action_id: str):
 
         return jsonify(action), 200
 
-    except Exception as e:
-        logging.error(f"Error fetching action {action_id}: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Error fetching action %s", action_id)
         return jsonify({"error": "Failed to fetch action"}), 500
 
 
@@ -143,7 +140,6 @@ def update_actions():
         except ValueError as ve:
             return jsonify({"error": str(ve)}), 404
 
-    except Exception as e:
-        logging.error(f"Error updating actions: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Error updating actions")
         return jsonify({"error": "Failed to update actions"}), 500
@@ -1,5 +1,4 @@
 import logging
-import traceback
 
 from flask import Blueprint, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
@@ -61,9 +60,8 @@ def create_agency():
             logging.warning(f"Agency creation failed - duplicate name: {str(ve)}")
             return jsonify({'error': str(ve)}), 409  # Conflict status code
             
-    except Exception as e:
-        logging.error(f"Failed to create agency with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to create agency")
         return jsonify({'error': 'Agency creation failed'}), 500
 
 
@@ -135,9 +133,8 @@ def create_product():
             logging.error(f"Database error while creating product: {str(e)}")
             return jsonify({'error': 'Failed to create product due to database error'}), 500
             
-    except Exception as e:
-        logging.error(f"Failed to create product with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to create product")
         return jsonify({'error': 'Product creation failed'}), 500
 
 
@@ -201,9 +198,8 @@ def get_agency_product_catalogue():
             logging.error(f"Database error while fetching products: {str(e)}")
             return jsonify({'error': 'Failed to fetch products due to database error'}), 500
             
-    except Exception as e:
-        logging.error(f"Failed to fetch product catalogue with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to fetch product catalogue")
         return jsonify({'error': 'Failed to fetch product catalogue'}), 500
 
 
@@ -270,9 +266,8 @@ def get_agency_sellers():
             logging.error(f"Database error while fetching sellers: {str(e)}")
             return jsonify({'error': 'Failed to fetch sellers due to database error'}), 500
             
-    except Exception as e:
-        logging.error(f"Failed to fetch agency sellers with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to fetch agency sellers")
         return jsonify({'error': 'Failed to fetch agency sellers'}), 500
 
 
@@ -324,9 +319,8 @@ def get_agency_details():
             logging.error(f"Database error while fetching agency details: {str(e)}")
             return jsonify({'error': 'Failed to fetch agency details due to database error'}), 500
             
-    except Exception as e:
-        logging.error(f"Failed to fetch agency details with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to fetch agency details")
         return jsonify({'error': 'Failed to fetch agency details'}), 500
 
 
@@ -393,9 +387,8 @@ def update_agency_description():
             logging.error(f"Database error while updating agency description: {str(e)}")
             return jsonify({'error': 'Failed to update agency description due to database error'}), 500
             
-    except Exception as e:
-        logging.error(f"Failed to update agency description with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to update agency description")
         return jsonify({'error': 'Failed to update agency description'}), 500
 
 
@@ -464,9 +457,8 @@ def update_product(product_id):
             logging.error(f"Database error while updating product: {str(e)}")
             return jsonify({'error': 'Failed to update product due to database error'}), 500
             
-    except Exception as e:
-        logging.error(f"Failed to update product {product_id} with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to update product %s", product_id)
         return jsonify({'error': 'Failed to update product'}), 500
 
 
@@ -525,10 +517,8 @@ def add_seller_to_agency():
             if not agency:
                 return jsonify({'error': f'Agency with name "{agency_name}" not found'}), 404
         
-        # Check if seller already exists
-        existing_user_by_email = SellerService.get_by_email(email)
-        existing_user_by_phone = SellerService.get_by_phone(phone)
-        if existing_user_by_email or existing_user_by_phone:
+        # Check if seller already exists (single email OR phone query)
+        if SellerService.exists_by_email_or_phone(email, phone):
             return jsonify({'error': 'Seller with this email or phone already exists'}), 409
         
         # Normalize phone number
@@ -561,7 +551,6 @@ def add_seller_to_agency():
             logging.error(f"Database error while creating seller: {str(e)}")
             return jsonify({'error': 'Failed to create seller due to database error'}), 500
             
-    except Exception as e:
-        logging.error(f"Failed to add seller to agency with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to add seller to agency")
         return jsonify({'error': 'Failed to add seller to agency'}), 500
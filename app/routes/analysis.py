@@ -1,5 +1,4 @@
 import logging
-import traceback
 import requests
 import os
 import threading
@@ -120,6 +119,5 @@ def trigger_analysis():
 
         return jsonify({"message": f"Analysis task triggered successfully for job_id: {job_id}"}), 200
     except Exception as e:
-        logging.error(f"Failed to trigger analysis for Job ID: {job_id} with error: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to trigger analysis for Job ID: %s", job_id)
         return jsonify({"error": f"Failed to trigger call analysis: {str(e)}"}), 500
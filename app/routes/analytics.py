@@ -1,16 +1,16 @@
 import logging
-import traceback
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+import pandas as pd
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from app import db, Meeting, MobileAppCall
 from app.models.buyer import Buyer
-from app.services import SellerService
+from app.services import SellerService, AnalyticsCacheService
 from app.constants import CallDirection, MobileAppCallStatus
 from app.models.seller import SellerRole
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_, select
 from app.utils.call_recording_utils import denormalize_phone_number
 from app.utils.time_utils import get_date_range_from_timeframe, get_granularity_from_timeframe, validate_time_frame, parse_date_range_params
 
@@ -18,6 +18,218 @@ logging = logging.getLogger(__name__)
 
 analytics_bp = Blueprint("analytics", __name__)
 
+ANALYTICS_MAX_DAYS_RANGE = 90
+
+# Bucket keys are formatted once at import instead of once per bucket per request
+HOUR_KEYS = tuple(f"hour{hour}" for hour in range(24))
+# (end_date - start_date).days <= ANALYTICS_MAX_DAYS_RANGE yields at most that many + 2 daily buckets
+DAY_KEYS = tuple(f"day{day}" for day in range(ANALYTICS_MAX_DAYS_RANGE + 2))
+
+
+def _count_meetings_by_direction(seller_ids, range_start, range_end):
+    """
+    Count answered (meeting) calls per direction in one query using COUNT(*) FILTER.
+
+    Returns:
+        (outgoing, incoming) counts
+    """
+    return tuple(
+        db.session.query(
+            func.count().filter(Meeting.direction == CallDirection.OUTGOING.value),
+            func.count().filter(Meeting.direction == CallDirection.INCOMING.value)
+        )
+        .filter(Meeting.seller_id.in_(seller_ids))
+        .filter(Meeting.start_time >= range_start)
+        .filter(Meeting.start_time <= range_end)
+        .one()
+    )
+
+
+def _count_app_calls_by_status(seller_ids, range_start, range_end):
+    """
+    Count mobile app calls per direction/status bucket in one query using COUNT(*) FILTER.
+
+    Returns:
+        (outgoing_processing, incoming_processing, outgoing_unanswered, incoming_unanswered) counts
+    """
+    return tuple(
+        db.session.query(
+            func.count().filter(
+                (MobileAppCall.call_type == "outgoing") &
+                (MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
+            ),
+            func.count().filter(
+                (MobileAppCall.call_type == "incoming") &
+                (MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
+            ),
+            func.count().filter(
+                (MobileAppCall.call_type == "outgoing") &
+                (MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value)
+            ),
+            func.count().filter(
+                (MobileAppCall.call_type == "incoming") &
+                MobileAppCall.status.in_([
+                    MobileAppCallStatus.MISSED.value,
+                    MobileAppCallStatus.REJECTED.value
+                ])
+            )
+        )
+        .filter(MobileAppCall.user_id.in_(seller_ids))
+        .filter(MobileAppCall.start_time >= range_start)
+        .filter(MobileAppCall.start_time <= range_end)
+        .one()
+    )
+
+
+def _fetch_seller_call_frames(seller_uuid, range_start, range_end, tz):
+    """
+    Fetch one seller's meetings and unanswered app calls in a range, one query per table.
+
+    Returns:
+        (meetings_df, app_calls_df), with start_time as UTC timestamps plus a local_time column in tz
+    """
+    meeting_rows = db.session.execute(
+        select(Meeting.start_time, Meeting.direction, Buyer.phone)
+        .join(Buyer, Meeting.buyer_id == Buyer.id)
+        .where(Meeting.seller_id == seller_uuid)
+        .where(Meeting.start_time >= range_start)
+        .where(Meeting.start_time <= range_end)
+    ).all()
+    # Only unanswered calls are counted from app calls; answered ones are meetings
+    app_call_rows = db.session.execute(
+        select(MobileAppCall.start_time, MobileAppCall.call_type)
+        .where(MobileAppCall.user_id == seller_uuid)
+        .where(MobileAppCall.start_time >= range_start)
+        .where(MobileAppCall.start_time <= range_end)
+        .where(or_(
+            and_(
+                MobileAppCall.call_type == "outgoing",
+                MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value
+            ),
+            and_(
+                MobileAppCall.call_type == "incoming",
+                MobileAppCall.status.in_([
+                    MobileAppCallStatus.MISSED.value,
+                    MobileAppCallStatus.REJECTED.value
+                ])
+            )
+        ))
+    ).all()
+
+    meetings_df = pd.DataFrame(meeting_rows, columns=["start_time", "direction", "phone"])
+    app_calls_df = pd.DataFrame(app_call_rows, columns=["start_time", "call_type"])
+    meetings_df["start_time"] = pd.to_datetime(meetings_df["start_time"], utc=True)
+    app_calls_df["start_time"] = pd.to_datetime(app_calls_df["start_time"], utc=True)
+    meetings_df["local_time"] = meetings_df["start_time"].dt.tz_convert(tz)
+    app_calls_df["local_time"] = app_calls_df["start_time"].dt.tz_convert(tz)
+    return meetings_df, app_calls_df
+
+
+def _bucket_seller_counts(meetings_df, app_calls_df, bucket_column, bucket_index, bucket_keys):
+    """
+    Count outgoing/incoming calls and unique leads per bucket of bucket_column.
+
+    Returns:
+        (sales_data, total_outgoing_calls, total_incoming_calls, total_unique_leads)
+    """
+    def _bucket_counts(buckets):
+        return buckets.value_counts().reindex(bucket_index, fill_value=0)
+
+    outgoing_calls = (
+        _bucket_counts(meetings_df.loc[meetings_df["direction"] == CallDirection.OUTGOING.value, bucket_column]) +
+        _bucket_counts(app_calls_df.loc[app_calls_df["call_type"] == "outgoing", bucket_column])
+    )
+    incoming_calls = (
+        _bucket_counts(meetings_df.loc[meetings_df["direction"] == CallDirection.INCOMING.value, bucket_column]) +
+        _bucket_counts(app_calls_df.loc[app_calls_df["call_type"] == "incoming", bucket_column])
+    )
+    # Only count buyers who had actual meetings/conversations
+    unique_leads = meetings_df.groupby(bucket_column)["phone"].nunique().reindex(bucket_index, fill_value=0)
+
+    sales_data = {}
+    for position, bucket in enumerate(bucket_index):
+        sales_data[bucket_keys[position]] = {
+            "outgoing_calls": int(outgoing_calls[bucket]),
+            "incoming_calls": int(incoming_calls[bucket]),
+            "unique_leads_engaged": int(unique_leads[bucket])
+        }
+
+    return sales_data, int(outgoing_calls.sum()), int(incoming_calls.sum()), int(unique_leads.sum())
+
+
+def _count_unique_leads_in_range(meetings_df, start_date, end_date):
+    """Unique leads for the entire time period (fix double counting)."""
+    in_range = (
+        (meetings_df["start_time"] >= pd.Timestamp(start_date)) &
+        (meetings_df["start_time"] <= pd.Timestamp(end_date))
+    )
+    return int(meetings_df.loc[in_range, "phone"].nunique())
+
+
+def _get_seller_hourly_counts(seller_uuid, start_date, end_date):
+    """
+    Build the 24 hourly buckets of start_date's day for one seller from a single
+    range fetch per table, grouping by hour in pandas instead of issuing queries per hour.
+
+    Returns:
+        (sales_data, total_outgoing_calls, total_incoming_calls, total_unique_leads, total_unique_leads_corrected)
+    """
+    tz = start_date.tzinfo or ZoneInfo("Asia/Kolkata")
+    day_start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_end = start_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+    # The fetch also covers the rest of the range, for the corrected unique lead total
+    meetings_df, app_calls_df = _fetch_seller_call_frames(seller_uuid, day_start, max(day_end, end_date), tz)
+
+    day_meetings_df = meetings_df[meetings_df["local_time"] <= pd.Timestamp(day_end)].copy()
+    day_app_calls_df = app_calls_df[app_calls_df["local_time"] <= pd.Timestamp(day_end)].copy()
+    day_meetings_df["hour"] = day_meetings_df["local_time"].dt.hour
+    day_app_calls_df["hour"] = day_app_calls_df["local_time"].dt.hour
+
+    sales_data, total_outgoing_calls, total_incoming_calls, total_unique_leads = _bucket_seller_counts(
+        day_meetings_df, day_app_calls_df, "hour", pd.Index(range(24)), HOUR_KEYS
+    )
+    return (
+        sales_data,
+        total_outgoing_calls,
+        total_incoming_calls,
+        total_unique_leads,
+        _count_unique_leads_in_range(meetings_df, start_date, end_date)
+    )
+
+
+def _get_seller_daily_counts(seller_uuid, start_date, end_date):
+    """
+    Build the daily buckets for one seller from a single range fetch per table,
+    grouping by day in pandas instead of issuing queries per day.
+
+    Returns:
+        (sales_data, total_outgoing_calls, total_incoming_calls, total_unique_leads, total_unique_leads_corrected)
+    """
+    tz = start_date.tzinfo or ZoneInfo("Asia/Kolkata")
+    bucket_dates = []
+    current_date = start_date
+    while current_date <= end_date:
+        bucket_dates.append(current_date.date())
+        current_date += timedelta(days=1)
+    # Buckets span whole days, matching the previous per-day day_start/day_end queries
+    range_start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    range_end = datetime.combine(bucket_dates[-1], datetime.max.time()).replace(tzinfo=tz)
+    meetings_df, app_calls_df = _fetch_seller_call_frames(seller_uuid, range_start, range_end, tz)
+
+    meetings_df["day"] = meetings_df["local_time"].dt.date
+    app_calls_df["day"] = app_calls_df["local_time"].dt.date
+
+    sales_data, total_outgoing_calls, total_incoming_calls, total_unique_leads = _bucket_seller_counts(
+        meetings_df, app_calls_df, "day", pd.Index(bucket_dates), DAY_KEYS
+    )
+    return (
+        sales_data,
+        total_outgoing_calls,
+        total_incoming_calls,
+        total_unique_leads,
+        _count_unique_leads_in_range(meetings_df, start_date, end_date)
+    )
+
 
 @analytics_bp.route("/total_call_data", methods=["GET"])
 @jwt_required()
@@ -29,7 +241,7 @@ def get_total_call_data():
             return jsonify({"error": "Seller not found"}), 404
         
         # Parse date range parameters (supports both new date range and legacy time_frame)
-        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=90)
+        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=ANALYTICS_MAX_DAYS_RANGE)
         if error_response:
             return jsonify(error_response[0]), error_response[1]
         
@@ -38,6 +250,7 @@ def get_total_call_data():
         granularity = "hourly" if date_diff <= 2 else "daily"
         agency_sellers = SellerService.get_by_agency(user.agency_id)
         agency_sellers = [seller for seller in agency_sellers if seller.role != SellerRole.MANAGER]
+        agency_seller_ids = [s.id for s in agency_sellers]
         
         if granularity == "hourly":
             sales_data = {}
@@ -48,63 +261,11 @@ def get_total_call_data():
                 hour_start = start_date.replace(hour=hour)
                 hour_end = hour_start.replace(minute=59, second=59, microsecond=999999)
                 
-                # Meetings answered
-                outgoing_meet = (
-                    Meeting.query
-                    .filter(Meeting.seller_id.in_([s.id for s in agency_sellers]))
-                    .filter(Meeting.direction == CallDirection.OUTGOING.value)
-                    .filter(Meeting.start_time >= hour_start)
-                    .filter(Meeting.start_time <= hour_end)
-                    .count()
-                )
-                incoming_meet = (
-                    Meeting.query
-                    .filter(Meeting.seller_id.in_([s.id for s in agency_sellers]))
-                    .filter(Meeting.direction == CallDirection.INCOMING.value)
-                    .filter(Meeting.start_time >= hour_start)
-                    .filter(Meeting.start_time <= hour_end)
-                    .count()
-                )
-                # Mobile processing treated as answered
-                outgoing_proc = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
-                    .filter(MobileAppCall.call_type == "outgoing")
-                    .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-                    .filter(MobileAppCall.start_time >= hour_start)
-                    .filter(MobileAppCall.start_time <= hour_end)
-                    .count()
-                )
-                incoming_proc = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
-                    .filter(MobileAppCall.call_type == "incoming")
-                    .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-                    .filter(MobileAppCall.start_time >= hour_start)
-                    .filter(MobileAppCall.start_time <= hour_end)
-                    .count()
-                )
-                # Unanswered
-                outgoing_unans = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
-                    .filter(MobileAppCall.call_type == "outgoing")
-                    .filter(MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value)
-                    .filter(MobileAppCall.start_time >= hour_start)
-                    .filter(MobileAppCall.start_time <= hour_end)
-                    .count()
-                )
-                incoming_unans = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
-                    .filter(MobileAppCall.call_type == "incoming")
-                    .filter(MobileAppCall.status.in_([
-                        MobileAppCallStatus.MISSED.value,
-                        MobileAppCallStatus.REJECTED.value
-                    ]))
-                    .filter(MobileAppCall.start_time >= hour_start)
-                    .filter(MobileAppCall.start_time <= hour_end)
-                    .count()
+                # Meetings answered, both directions in one query
+                outgoing_meet, incoming_meet = _count_meetings_by_direction(agency_seller_ids, hour_start, hour_end)
+                # Mobile processing treated as answered, plus unanswered, in one query
+                outgoing_proc, incoming_proc, outgoing_unans, incoming_unans = _count_app_calls_by_status(
+                    agency_seller_ids, hour_start, hour_end
                 )
                 outgoing_calls_in_hour = outgoing_meet + outgoing_proc + outgoing_unans
                 incoming_calls_in_hour = incoming_meet + incoming_proc + incoming_unans
@@ -114,14 +275,14 @@ def get_total_call_data():
                 meeting_phones_q = (
                     db.session.query(Buyer.phone.label('phone'))
                     .join(Meeting, Meeting.buyer_id == Buyer.id)
-                    .filter(Meeting.seller_id.in_([s.id for s in agency_sellers]))
+                    .filter(Meeting.seller_id.in_(agency_seller_ids))
                     .filter(Meeting.start_time >= hour_start)
                     .filter(Meeting.start_time <= hour_end)
                     .distinct()
                 )
                 mac_phones_q = (
                     db.session.query(MobileAppCall.buyer_number.label('phone'))
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
+                    .filter(MobileAppCall.user_id.in_(agency_seller_ids))
                     .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
                     .filter(MobileAppCall.start_time >= hour_start)
                     .filter(MobileAppCall.start_time <= hour_end)
@@ -129,7 +290,7 @@ def get_total_call_data():
                 )
                 union_phones_hour = meeting_phones_q.union(mac_phones_q).subquery()
                 unique_leads_in_hour = db.session.query(func.count()).select_from(union_phones_hour).scalar() or 0
-                sales_data[f"hour{hour}"] = {
+                sales_data[HOUR_KEYS[hour]] = {
                     "outgoing_calls": outgoing_calls_in_hour,
                     "incoming_calls": incoming_calls_in_hour,
                     "unique_leads_engaged": unique_leads_in_hour
@@ -140,14 +301,14 @@ def get_total_call_data():
             meeting_phones_total_q = (
                 db.session.query(Buyer.phone.label('phone'))
                 .join(Meeting, Meeting.buyer_id == Buyer.id)
-                .filter(Meeting.seller_id.in_([s.id for s in agency_sellers]))
+                .filter(Meeting.seller_id.in_(agency_seller_ids))
                 .filter(Meeting.start_time >= start_date)
                 .filter(Meeting.start_time <= end_date)
                 .distinct()
             )
             mac_phones_total_q = (
                 db.session.query(MobileAppCall.buyer_number.label('phone'))
-                .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
+                .filter(MobileAppCall.user_id.in_(agency_seller_ids))
                 .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
                 .filter(MobileAppCall.start_time >= start_date)
                 .filter(MobileAppCall.start_time <= end_date)
@@ -165,74 +326,25 @@ def get_total_call_data():
             while current_date <= end_date:
                 day_start = current_date.replace(hour=0, minute=0, second=0, microsecond=0)
                 day_end = current_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-                outgoing_meet = (
-                    Meeting.query
-                    .filter(Meeting.seller_id.in_([s.id for s in agency_sellers]))
-                    .filter(Meeting.direction == CallDirection.OUTGOING.value)
-                    .filter(Meeting.start_time >= day_start)
-                    .filter(Meeting.start_time <= day_end)
-                    .count()
-                )
-                incoming_meet = (
-                    Meeting.query
-                    .filter(Meeting.seller_id.in_([s.id for s in agency_sellers]))
-                    .filter(Meeting.direction == CallDirection.INCOMING.value)
-                    .filter(Meeting.start_time >= day_start)
-                    .filter(Meeting.start_time <= day_end)
-                    .count()
-                )
-                outgoing_proc = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
-                    .filter(MobileAppCall.call_type == "outgoing")
-                    .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-                    .filter(MobileAppCall.start_time >= day_start)
-                    .filter(MobileAppCall.start_time <= day_end)
-                    .count()
-                )
-                incoming_proc = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
-                    .filter(MobileAppCall.call_type == "incoming")
-                    .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-                    .filter(MobileAppCall.start_time >= day_start)
-                    .filter(MobileAppCall.start_time <= day_end)
-                    .count()
-                )
-                outgoing_unans = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
-                    .filter(MobileAppCall.call_type == "outgoing")
-                    .filter(MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value)
-                    .filter(MobileAppCall.start_time >= day_start)
-                    .filter(MobileAppCall.start_time <= day_end)
-                    .count()
-                )
-                incoming_unans = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
-                    .filter(MobileAppCall.call_type == "incoming")
-                    .filter(MobileAppCall.status.in_([
-                        MobileAppCallStatus.MISSED.value,
-                        MobileAppCallStatus.REJECTED.value
-                    ]))
-                    .filter(MobileAppCall.start_time >= day_start)
-                    .filter(MobileAppCall.start_time <= day_end)
-                    .count()
+                # Meetings answered, both directions in one query
+                outgoing_meet, incoming_meet = _count_meetings_by_direction(agency_seller_ids, day_start, day_end)
+                # Mobile processing treated as answered, plus unanswered, in one query
+                outgoing_proc, incoming_proc, outgoing_unans, incoming_unans = _count_app_calls_by_status(
+                    agency_seller_ids, day_start, day_end
                 )
                 outgoing_calls_in_day = outgoing_meet + outgoing_proc + outgoing_unans
                 incoming_calls_in_day = incoming_meet + incoming_proc + incoming_unans
                 meeting_phones_day_q = (
                     db.session.query(Buyer.phone.label('phone'))
                     .join(Meeting, Meeting.buyer_id == Buyer.id)
-                    .filter(Meeting.seller_id.in_([s.id for s in agency_sellers]))
+                    .filter(Meeting.seller_id.in_(agency_seller_ids))
                     .filter(Meeting.start_time >= day_start)
                     .filter(Meeting.start_time <= day_end)
                     .distinct()
                 )
                 mac_phones_day_q = (
                     db.session.query(MobileAppCall.buyer_number.label('phone'))
-                    .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
+                    .filter(MobileAppCall.user_id.in_(agency_seller_ids))
                     .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
                     .filter(MobileAppCall.start_time >= day_start)
                     .filter(MobileAppCall.start_time <= day_end)
@@ -240,7 +352,7 @@ def get_total_call_data():
                 )
                 union_phones_day = meeting_phones_day_q.union(mac_phones_day_q).subquery()
                 unique_leads_in_day = db.session.query(func.count()).select_from(union_phones_day).scalar() or 0
-                sales_data[f"day{day_count}"] = {
+                sales_data[DAY_KEYS[day_count]] = {
                     "outgoing_calls": outgoing_calls_in_day,
                     "incoming_calls": incoming_calls_in_day,
                     "unique_leads_engaged": unique_leads_in_day
@@ -253,14 +365,14 @@ def get_total_call_data():
             meeting_phones_total_q = (
                 db.session.query(Buyer.phone.label('phone'))
                 .join(Meeting, Meeting.buyer_id == Buyer.id)
-                .filter(Meeting.seller_id.in_([s.id for s in agency_sellers]))
+                .filter(Meeting.seller_id.in_(agency_seller_ids))
                 .filter(Meeting.start_time >= start_date)
                 .filter(Meeting.start_time <= end_date)
                 .distinct()
             )
             mac_phones_total_q = (
                 db.session.query(MobileAppCall.buyer_number.label('phone'))
-                .filter(MobileAppCall.user_id.in_([s.id for s in agency_sellers]))
+                .filter(MobileAppCall.user_id.in_(agency_seller_ids))
                 .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
                 .filter(MobileAppCall.start_time >= start_date)
                 .filter(MobileAppCall.start_time <= end_date)
@@ -279,8 +391,7 @@ def get_total_call_data():
         }
         return jsonify(result), 200
     except Exception as e:
-        logging.error(f"Failed to fetch total call data: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch total call data: %s", e)
         return jsonify({"error": f"Failed to fetch total call data: {str(e)}"}), 500
 
 
@@ -294,7 +405,7 @@ def get_team_call_data():
             return jsonify({"error": "Seller not found"}), 404
         
         # Parse date range parameters (supports both new date range and legacy time_frame)
-        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=90)
+        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=ANALYTICS_MAX_DAYS_RANGE)
         if error_response:
             return jsonify(error_response[0]), error_response[1]
         agency_sellers = SellerService.get_by_agency(user.agency_id)
@@ -302,73 +413,20 @@ def get_team_call_data():
         agency_sellers = [seller for seller in agency_sellers if seller.role != SellerRole.MANAGER]
         seller_data = []
         for seller in agency_sellers:
-            # Count outgoing calls that resulted in meetings (answered)
-            outgoing_calls_answered_meetings = (
-                Meeting.query
-                .filter(Meeting.seller_id == seller.id)
-                .filter(Meeting.direction == CallDirection.OUTGOING.value)
-                .filter(Meeting.start_time >= start_date)
-                .filter(Meeting.start_time <= end_date)
-                .count()
-            )
-            # Include MobileAppCall Processing as answered (outgoing)
-            outgoing_calls_answered_processing = (
-                MobileAppCall.query
-                .filter(MobileAppCall.user_id == seller.id)
-                .filter(MobileAppCall.call_type == "outgoing")
-                .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-                .filter(MobileAppCall.start_time >= start_date)
-                .filter(MobileAppCall.start_time <= end_date)
-                .count()
+            # Answered calls (meetings plus Processing app calls) and unanswered app calls,
+            # one FILTER query per table
+            outgoing_calls_answered_meetings, incoming_calls_answered_meetings = _count_meetings_by_direction(
+                [seller.id], start_date, end_date
             )
+            (
+                outgoing_calls_answered_processing,
+                incoming_calls_answered_processing,
+                outgoing_calls_unanswered,
+                incoming_calls_unanswered
+            ) = _count_app_calls_by_status([seller.id], start_date, end_date)
             outgoing_calls_answered = outgoing_calls_answered_meetings + outgoing_calls_answered_processing
-            
-            # Count incoming calls that resulted in meetings (answered)
-            incoming_calls_answered_meetings = (
-                Meeting.query
-                .filter(Meeting.seller_id == seller.id)
-                .filter(Meeting.direction == CallDirection.INCOMING.value)
-                .filter(Meeting.start_time >= start_date)
-                .filter(Meeting.start_time <= end_date)
-                .count()
-            )
-            # Include MobileAppCall Processing as answered (incoming)
-            incoming_calls_answered_processing = (
-                MobileAppCall.query
-                .filter(MobileAppCall.user_id == seller.id)
-                .filter(MobileAppCall.call_type == "incoming")
-                .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-                .filter(MobileAppCall.start_time >= start_date)
-                .filter(MobileAppCall.start_time <= end_date)
-                .count()
-            )
             incoming_calls_answered = incoming_calls_answered_meetings + incoming_calls_answered_processing
             
-            # Count unanswered outgoing calls from MobileAppCall table
-            outgoing_calls_unanswered = (
-                MobileAppCall.query
-                .filter(MobileAppCall.user_id == seller.id)
-                .filter(MobileAppCall.call_type == "outgoing")
-                .filter(MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value)
-                .filter(MobileAppCall.start_time >= start_date)
-                .filter(MobileAppCall.start_time <= end_date)
-                .count()
-            )
-            
-            # Count incoming unanswered calls (missed and rejected) from MobileAppCall table
-            incoming_calls_unanswered = (
-                MobileAppCall.query
-                .filter(MobileAppCall.user_id == seller.id)
-                .filter(MobileAppCall.call_type == "incoming")
-                .filter(MobileAppCall.status.in_([
-                    MobileAppCallStatus.MISSED.value,
-                    MobileAppCallStatus.REJECTED.value
-                ]))
-                .filter(MobileAppCall.start_time >= start_date)
-                .filter(MobileAppCall.start_time <= end_date)
-                .count()
-            )
-            
             # Total calls by direction (answered + unanswered)
             outgoing_calls = outgoing_calls_answered + outgoing_calls_unanswered
             incoming_calls = incoming_calls_answered + incoming_calls_unanswered
@@ -408,8 +466,7 @@ def get_team_call_data():
         result = {"seller_data": seller_data}
         return jsonify(result), 200
     except Exception as e:
-        logging.error(f"Failed to fetch team call data: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch team call data: %s", e)
         return jsonify({"error": f"Failed to fetch team call data: {str(e)}"}), 500
 
 
@@ -423,7 +480,7 @@ def get_call_data(seller_uuid):
             return jsonify({"error": "Seller not found"}), 404
         
         # Parse date range parameters (supports both new date range and legacy time_frame)
-        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=90)
+        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=ANALYTICS_MAX_DAYS_RANGE)
         if error_response:
             return jsonify(error_response[0]), error_response[1]
         seller = SellerService.get_by_id(str(seller_uuid))
@@ -432,62 +489,14 @@ def get_call_data(seller_uuid):
         if seller.agency_id != user.agency_id:
             return jsonify({"error": "Unauthorized access to seller data"}), 403
         
-        outgoing_meet = (
-            Meeting.query
-            .filter(Meeting.seller_id == seller_uuid)
-            .filter(Meeting.direction == CallDirection.OUTGOING.value)
-            .filter(Meeting.start_time >= start_date)
-            .filter(Meeting.start_time <= end_date)
-            .count()
-        )
-        incoming_meet = (
-            Meeting.query
-            .filter(Meeting.seller_id == seller_uuid)
-            .filter(Meeting.direction == CallDirection.INCOMING.value)
-            .filter(Meeting.start_time >= start_date)
-            .filter(Meeting.start_time <= end_date)
-            .count()
-        )
-        outgoing_proc = (
-            MobileAppCall.query
-            .filter(MobileAppCall.user_id == seller_uuid)
-            .filter(MobileAppCall.call_type == "outgoing")
-            .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-            .filter(MobileAppCall.start_time >= start_date)
-            .filter(MobileAppCall.start_time <= end_date)
-            .count()
-        )
-        incoming_proc = (
-            MobileAppCall.query
-            .filter(MobileAppCall.user_id == seller_uuid)
-            .filter(MobileAppCall.call_type == "incoming")
-            .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-            .filter(MobileAppCall.start_time >= start_date)
-            .filter(MobileAppCall.start_time <= end_date)
-            .count()
-        )
-        
-        outgoing_calls_unanswered = (
-            MobileAppCall.query
-            .filter(MobileAppCall.user_id == seller_uuid)
-            .filter(MobileAppCall.call_type == "outgoing")
-            .filter(MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value)
-            .filter(MobileAppCall.start_time >= start_date)
-            .filter(MobileAppCall.start_time <= end_date)
-            .count()
-        )
-        incoming_calls_unanswered = (
-            MobileAppCall.query
-            .filter(MobileAppCall.user_id == seller_uuid)
-            .filter(MobileAppCall.call_type == "incoming")
-            .filter(MobileAppCall.status.in_([
-                MobileAppCallStatus.MISSED.value,
-                MobileAppCallStatus.REJECTED.value
-            ]))
-            .filter(MobileAppCall.start_time >= start_date)
-            .filter(MobileAppCall.start_time <= end_date)
-            .count()
-        )
+        # One FILTER query per table instead of one COUNT per bucket
+        outgoing_meet, incoming_meet = _count_meetings_by_direction([seller_uuid], start_date, end_date)
+        (
+            outgoing_proc,
+            incoming_proc,
+            outgoing_calls_unanswered,
+            incoming_calls_unanswered
+        ) = _count_app_calls_by_status([seller_uuid], start_date, end_date)
         
         outgoing_calls = outgoing_meet + outgoing_proc + outgoing_calls_unanswered
         incoming_calls = incoming_meet + incoming_proc + incoming_calls_unanswered
@@ -511,8 +520,7 @@ def get_call_data(seller_uuid):
         }
         return jsonify(result), 200
     except Exception as e:
-        logging.error(f"Failed to fetch call data for seller {seller_uuid}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch call data for seller %s: %s", seller_uuid, e)
         return jsonify({"error": f"Failed to fetch call data: {str(e)}"}), 500
 
 
@@ -525,7 +533,7 @@ def get_seller_call_analytics():
         if not user:
             return jsonify({"error": "Seller not found"}), 404
         
-        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=90)
+        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=ANALYTICS_MAX_DAYS_RANGE)
         if error_response:
             return jsonify(error_response[0]), error_response[1]
         
@@ -537,61 +545,14 @@ def get_seller_call_analytics():
             seller = SellerService.get_by_id(seller_id)
             if not seller or seller.agency_id != user.agency_id or seller.role == SellerRole.MANAGER:
                 continue
-            outgoing_meet = (
-                Meeting.query
-                .filter(Meeting.seller_id == seller_id)
-                .filter(Meeting.direction == CallDirection.OUTGOING.value)
-                .filter(Meeting.start_time >= start_date)
-                .filter(Meeting.start_time <= end_date)
-                .count()
-            )
-            incoming_meet = (
-                Meeting.query
-                .filter(Meeting.seller_id == seller_id)
-                .filter(Meeting.direction == CallDirection.INCOMING.value)
-                .filter(Meeting.start_time >= start_date)
-                .filter(Meeting.start_time <= end_date)
-                .count()
-            )
-            outgoing_proc = (
-                MobileAppCall.query
-                .filter(MobileAppCall.user_id == seller_id)
-                .filter(MobileAppCall.call_type == "outgoing")
-                .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-                .filter(MobileAppCall.start_time >= start_date)
-                .filter(MobileAppCall.start_time <= end_date)
-                .count()
-            )
-            incoming_proc = (
-                MobileAppCall.query
-                .filter(MobileAppCall.user_id == seller_id)
-                .filter(MobileAppCall.call_type == "incoming")
-                .filter(MobileAppCall.status == MobileAppCallStatus.PROCESSING.value)
-                .filter(MobileAppCall.start_time >= start_date)
-                .filter(MobileAppCall.start_time <= end_date)
-                .count()
-            )
-            unanswered_outgoing_calls = (
-                MobileAppCall.query
-                .filter(MobileAppCall.user_id == seller_id)
-                .filter(MobileAppCall.call_type == "outgoing")
-                .filter(MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value)
-                .filter(MobileAppCall.start_time >= start_date)
-                .filter(MobileAppCall.start_time <= end_date)
-                .count()
-            )
-            incoming_calls_unanswered = (
-                MobileAppCall.query
-                .filter(MobileAppCall.user_id == seller_id)
-                .filter(MobileAppCall.call_type == "incoming")
-                .filter(MobileAppCall.status.in_([
-                    MobileAppCallStatus.MISSED.value,
-                    MobileAppCallStatus.REJECTED.value
-                ]))
-                .filter(MobileAppCall.start_time >= start_date)
-                .filter(MobileAppCall.start_time <= end_date)
-                .count()
-            )
+            # One FILTER query per table instead of one COUNT per bucket
+            outgoing_meet, incoming_meet = _count_meetings_by_direction([seller_id], start_date, end_date)
+            (
+                outgoing_proc,
+                incoming_proc,
+                unanswered_outgoing_calls,
+                incoming_calls_unanswered
+            ) = _count_app_calls_by_status([seller_id], start_date, end_date)
             outgoing_calls = outgoing_meet + outgoing_proc + unanswered_outgoing_calls
             incoming_calls = incoming_meet + incoming_proc + incoming_calls_unanswered
             seller_data.append({
@@ -618,8 +579,7 @@ def get_seller_call_analytics():
         result = {"seller_data": seller_data}
         return jsonify(result), 200
     except Exception as e:
-        logging.error(f"Failed to fetch seller call analytics: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch seller call analytics: %s", e)
         return jsonify({"error": f"Failed to fetch seller call analytics: {str(e)}"}), 500
 
 
@@ -646,9 +606,15 @@ def get_seller_call_data(seller_uuid):
             return jsonify({"error": "Unauthorized access to seller data"}), 403
         
         # Parse date range parameters (supports both new date range and legacy time_frame)
-        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=90)
+        start_date, end_date, error_response = parse_date_range_params(default_days_back=7, max_days_range=ANALYTICS_MAX_DAYS_RANGE)
         if error_response:
             return jsonify(error_response[0]), error_response[1]
+
+        # Past windows are immutable and live ones are short-lived; new calls bump the seller version
+        cache_key = AnalyticsCacheService.build_seller_call_data_key(str(seller_uuid), start_date, end_date)
+        cached_result = AnalyticsCacheService.get_cached_response(cache_key)
+        if cached_result:
+            return jsonify(cached_result), 200
         
         # Determine granularity based on date range (for backward compatibility)
         date_diff = (end_date - start_date).days
@@ -658,186 +624,23 @@ def get_seller_call_data(seller_uuid):
             granularity = "daily"
         
         if granularity == "hourly":
-            sales_data = {}
-            total_outgoing_calls = 0
-            total_incoming_calls = 0
-            total_unique_leads = 0
-            
-            for hour in range(24):
-                hour_start = start_date.replace(hour=hour)
-                hour_end = hour_start.replace(minute=59, second=59, microsecond=999999)
-                
-                # Count outgoing calls that resulted in meetings (answered)
-                outgoing_calls_answered_in_hour = (
-                    Meeting.query
-                    .filter(Meeting.seller_id == seller_uuid)
-                    .filter(Meeting.direction == CallDirection.OUTGOING.value)
-                    .filter(Meeting.start_time >= hour_start)
-                    .filter(Meeting.start_time <= hour_end)
-                    .count()
-                )
-                
-                # Count incoming calls that resulted in meetings (answered)
-                incoming_calls_answered_in_hour = (
-                    Meeting.query
-                    .filter(Meeting.seller_id == seller_uuid)
-                    .filter(Meeting.direction == CallDirection.INCOMING.value)
-                    .filter(Meeting.start_time >= hour_start)
-                    .filter(Meeting.start_time <= hour_end)
-                    .count()
-                )
-                
-                # Count unanswered outgoing calls from MobileAppCall table
-                outgoing_calls_unanswered_in_hour = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id == seller_uuid)
-                    .filter(MobileAppCall.call_type == "outgoing")
-                    .filter(MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value)
-                    .filter(MobileAppCall.start_time >= hour_start)
-                    .filter(MobileAppCall.start_time <= hour_end)
-                    .count()
-                )
-                
-                # Count incoming unanswered calls (missed and rejected) from MobileAppCall table
-                incoming_calls_unanswered_in_hour = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id == seller_uuid)
-                    .filter(MobileAppCall.call_type == "incoming")
-                    .filter(MobileAppCall.status.in_([
-                        MobileAppCallStatus.MISSED.value,
-                        MobileAppCallStatus.REJECTED.value
-                    ]))
-                    .filter(MobileAppCall.start_time >= hour_start)
-                    .filter(MobileAppCall.start_time <= hour_end)
-                    .count()
-                )
-                
-                # Total calls by direction
-                outgoing_calls_in_hour = outgoing_calls_answered_in_hour + outgoing_calls_unanswered_in_hour
-                incoming_calls_in_hour = incoming_calls_answered_in_hour + incoming_calls_unanswered_in_hour
-                
-                # Get unique buyer phone numbers only from Meeting table (actual conversations)
-                # Only count buyers who had actual meetings/conversations
-                unique_leads_in_hour = (
-                    db.session.query(func.count(func.distinct(Buyer.phone)))
-                    .join(Meeting, Meeting.buyer_id == Buyer.id)
-                    .filter(Meeting.seller_id == seller_uuid)
-                    .filter(Meeting.start_time >= hour_start)
-                    .filter(Meeting.start_time <= hour_end)
-                    .scalar() or 0
-                )
-                
-                sales_data[f"hour{hour}"] = {
-                    "outgoing_calls": outgoing_calls_in_hour,
-                    "incoming_calls": incoming_calls_in_hour,
-                    "unique_leads_engaged": unique_leads_in_hour
-                }
-                total_outgoing_calls += outgoing_calls_in_hour
-                total_incoming_calls += incoming_calls_in_hour
-                total_unique_leads += unique_leads_in_hour
-            
-            # Calculate unique leads for the entire time period (fix double counting)
-            total_unique_leads_corrected = (
-                db.session.query(func.count(func.distinct(Buyer.phone)))
-                .join(Meeting, Meeting.buyer_id == Buyer.id)
-                .filter(Meeting.seller_id == seller_uuid)
-                .filter(Meeting.start_time >= start_date)
-                .filter(Meeting.start_time <= end_date)
-                .scalar() or 0
-            )
+            # Hourly granularity: one fetch per table, bucketed in pandas
+            (
+                sales_data,
+                total_outgoing_calls,
+                total_incoming_calls,
+                total_unique_leads,
+                total_unique_leads_corrected
+            ) = _get_seller_hourly_counts(seller_uuid, start_date, end_date)
         else:
-            # Daily granularity
-            sales_data = {}
-            total_outgoing_calls = 0
-            total_incoming_calls = 0
-            total_unique_leads = 0
-            current_date = start_date
-            day_count = 0
-            
-            while current_date <= end_date:
-                day_start = current_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                day_end = current_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-                
-                # Count outgoing calls that resulted in meetings (answered)
-                outgoing_calls_answered_in_day = (
-                    Meeting.query
-                    .filter(Meeting.seller_id == seller_uuid)
-                    .filter(Meeting.direction == CallDirection.OUTGOING.value)
-                    .filter(Meeting.start_time >= day_start)
-                    .filter(Meeting.start_time <= day_end)
-                    .count()
-                )
-                
-                # Count incoming calls that resulted in meetings (answered)
-                incoming_calls_answered_in_day = (
-                    Meeting.query
-                    .filter(Meeting.seller_id == seller_uuid)
-                    .filter(Meeting.direction == CallDirection.INCOMING.value)
-                    .filter(Meeting.start_time >= day_start)
-                    .filter(Meeting.start_time <= day_end)
-                    .count()
-                )
-                
-                # Count unanswered outgoing calls from MobileAppCall table
-                outgoing_calls_unanswered_in_day = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id == seller_uuid)
-                    .filter(MobileAppCall.call_type == "outgoing")
-                    .filter(MobileAppCall.status == MobileAppCallStatus.NOT_ANSWERED.value)
-                    .filter(MobileAppCall.start_time >= day_start)
-                    .filter(MobileAppCall.start_time <= day_end)
-                    .count()
-                )
-                
-                # Count incoming unanswered calls (missed and rejected) from MobileAppCall table
-                incoming_calls_unanswered_in_day = (
-                    MobileAppCall.query
-                    .filter(MobileAppCall.user_id == seller_uuid)
-                    .filter(MobileAppCall.call_type == "incoming")
-                    .filter(MobileAppCall.status.in_([
-                        MobileAppCallStatus.MISSED.value,
-                        MobileAppCallStatus.REJECTED.value
-                    ]))
-                    .filter(MobileAppCall.start_time >= day_start)
-                    .filter(MobileAppCall.start_time <= day_end)
-                    .count()
-                )
-                
-                # Total calls by direction
-                outgoing_calls_in_day = outgoing_calls_answered_in_day + outgoing_calls_unanswered_in_day
-                incoming_calls_in_day = incoming_calls_answered_in_day + incoming_calls_unanswered_in_day
-                
-                # Get unique buyer phone numbers only from Meeting table (actual conversations)
-                # Only count buyers who had actual meetings/conversations
-                unique_leads_in_day = (
-                    db.session.query(func.count(func.distinct(Buyer.phone)))
-                    .join(Meeting, Meeting.buyer_id == Buyer.id)
-                    .filter(Meeting.seller_id == seller_uuid)
-                    .filter(Meeting.start_time >= day_start)
-                    .filter(Meeting.start_time <= day_end)
-                    .scalar() or 0
-                )
-                
-                sales_data[f"day{day_count}"] = {
-                    "outgoing_calls": outgoing_calls_in_day,
-                    "incoming_calls": incoming_calls_in_day,
-                    "unique_leads_engaged": unique_leads_in_day
-                }
-                total_outgoing_calls += outgoing_calls_in_day
-                total_incoming_calls += incoming_calls_in_day
-                total_unique_leads += unique_leads_in_day
-                current_date += timedelta(days=1)
-                day_count += 1
-            
-            # Calculate unique leads for the entire time period (fix double counting)
-            total_unique_leads_corrected = (
-                db.session.query(func.count(func.distinct(Buyer.phone)))
-                .join(Meeting, Meeting.buyer_id == Buyer.id)
-                .filter(Meeting.seller_id == seller_uuid)
-                .filter(Meeting.start_time >= start_date)
-                .filter(Meeting.start_time <= end_date)
-                .scalar() or 0
-            )
+            # Daily granularity: one fetch per table, bucketed in pandas
+            (
+                sales_data,
+                total_outgoing_calls,
+                total_incoming_calls,
+                total_unique_leads,
+                total_unique_leads_corrected
+            ) = _get_seller_daily_counts(seller_uuid, start_date, end_date)
         
         result = {
             "seller_id": str(seller_uuid),
@@ -851,9 +654,9 @@ def get_seller_call_data(seller_uuid):
                 "unique_leads_engaged": total_unique_leads_corrected
             }
         }
+        AnalyticsCacheService.cache_response(cache_key, result, end_date)
         return jsonify(result), 200
         
     except Exception as e:
-        logging.error(f"Failed to fetch seller call data for seller {seller_uuid}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch seller call data for seller %s: %s", seller_uuid, e)
         return jsonify({"error": f"Failed to fetch seller call data: {str(e)}"}), 500
@@ -1,29 +1,64 @@
 import json
 import logging
-import traceback
+import re
+import threading
+import time
 
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.external.aws.s3_client import S3Client
-from app.utils.auth_utils import generate_secure_otp, send_otp_email
+from app.utils.auth_utils import email_worker, generate_secure_otp, queue_otp_email
+from app.utils.call_recording_utils import normalize_phone_number, phone_number_key
 from app.config import Config
 
-from app.utils.call_recording_utils import normalize_phone_number
 from app.services import AuthService, SellerService
 
 logging = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
 
-def load_agency_mapping_from_s3():
-    try:
-        s3_client = S3Client()
-        content = s3_client.get_file_content(bucket_name="agency-name-mapping-config", key="agency_mapping.json")
-        return json.loads(content)
-    except Exception as e:
-        print(f"Failed to fetch agency mapping from S3: {e}")
-        return {}
+AGENCY_MAPPING_TTL_SECONDS = 300
+
+# Last known good agency mapping (and a case-folded name index built from it),
+# refreshed from S3 at most once per TTL. Readers never take the lock.
+_agency_mapping = {}
+_agency_mapping_cf = {}
+_agency_mapping_loaded_at = 0.0
+_agency_mapping_lock = threading.Lock()
+
+
+def _agency_mapping_is_fresh():
+    return bool(_agency_mapping) and time.monotonic() - _agency_mapping_loaded_at < AGENCY_MAPPING_TTL_SECONDS
+
+
+def _refresh_agency_mapping():
+    global _agency_mapping, _agency_mapping_cf, _agency_mapping_loaded_at
+
+    with _agency_mapping_lock:
+        # Another request may have refreshed it while we waited for the lock
+        if _agency_mapping_is_fresh():
+            return
+        try:
+            s3_client = S3Client()
+            content = s3_client.get_file_content(bucket_name="agency-name-mapping-config", key="agency_mapping.json")
+            mapping = json.loads(content)
+            mapping_cf = {name.strip().casefold(): agency_id for name, agency_id in mapping.items()}
+            # Swap in fully built dicts; the index first so a reader never sees a name without it
+            _agency_mapping_cf = mapping_cf
+            _agency_mapping = mapping
+            _agency_mapping_loaded_at = time.monotonic()
+        except Exception:
+            # Keep serving the last known good copy on a transient S3 failure
+            logging.exception("Failed to fetch agency mapping from S3")
+
+
+def get_agency_id_by_name(agency_name):
+    """Resolve an agency name to its id, ignoring case and surrounding whitespace."""
+    if not _agency_mapping_is_fresh():
+        _refresh_agency_mapping()
+    return _agency_mapping_cf.get(agency_name.strip().casefold())
 
 
 @auth_bp.route('/signup', methods=['POST'])
@@ -43,44 +78,56 @@ def signup():
             logging.error({'error': 'Missing required fields'})
             return jsonify({'error': 'Missing required fields'}), 400
 
-        agency_id_name_mapping = load_agency_mapping_from_s3()
-        agency_id = agency_id_name_mapping.get(agency_name)
+        # Cheap format checks before any S3/DB I/O
+        if not _EMAIL_RE.match(email):
+            logging.error({'error': 'Invalid email format'})
+            return jsonify({'error': 'Invalid email format'}), 400
+        if len(phone_number_key(phone)) < 10:
+            logging.error({'error': 'Invalid phone number'})
+            return jsonify({'error': 'Invalid phone number'}), 400
+
+        # Normalize once at the edge; everything below uses the stored form
+        phone = normalize_phone_number(phone)
+
+        agency_id = get_agency_id_by_name(agency_name)
         if not agency_id:
             logging.error({'error': 'Invalid Agency Name'})
             return jsonify({'error': 'Invalid Agency Name'}), 400
 
-        logging.info("Checking if Seller already exists")
-        existing_user_by_email = SellerService.get_by_email(email)
-        existing_user_by_phone = SellerService.get_by_phone(phone)
-        if existing_user_by_email or existing_user_by_phone:
-            logging.error({'error': 'Seller already exists'})
-            return jsonify({'error': 'Seller already exists'}), 400
-        logging.info(f"Seller doesn't exist. Creating new user with name {name} and email {email} and phone {phone}")
+        # Refuse before creating the seller if the OTP email couldn't be queued
+        if not email_worker.has_capacity():
+            logging.error({'error': 'Email queue full'})
+            return jsonify({'error': 'Service busy, please retry shortly'}), 503
 
         logging.info(f"generating secure otp")
         otp = generate_secure_otp(length=16)
 
-        logging.info(f"normalizing phone number")
-        phone = normalize_phone_number(phone)
-
-        logging.info("Sending OTP via email")
-        _ = send_otp_email(to_email=email, otp=otp)
-
+        # create_seller does an INSERT ... ON CONFLICT DO NOTHING, so the existence
+        # check on email/phone happens in the same round-trip as the insert
         logging.info(f"Creating user using SellerService")
-        new_user = SellerService.create_seller(
-            email=email, 
-            password=otp, 
-            agency_id=agency_id, 
-            phone=phone, 
-            role=role, 
-            name=name
-        )
+        try:
+            new_user = SellerService.create_seller(
+                email=email, 
+                password=otp, 
+                agency_id=agency_id, 
+                phone=phone, 
+                role=role, 
+                name=name,
+                is_otp=True
+            )
+        except ValueError:
+            logging.error({'error': 'Seller already exists'})
+            return jsonify({'error': 'Seller already exists'}), 400
+
+        # Seller is committed at this point; the email worker sends the OTP
+        logging.info("Queueing OTP email")
+        if not queue_otp_email(email, otp):
+            logging.error(f"Failed to queue OTP email to {email}")
 
         logging.info(f"Created new user successfully with email={email}, name={name}")
         return jsonify({'message': 'Seller created successfully', 'name': name, 'user_id': str(new_user.id)}), 201
-    except Exception as e:
-        logging.error(f"Failed to complete signup with error {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to complete signup")
         return jsonify({'error': 'Signup Failed'}), 500
 
 
@@ -108,9 +155,8 @@ def login():
             'user_id': auth_result['user']['id']
         }), 200
         
-    except Exception as e:
-        logging.error(f"Failed to login with error: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to login")
         return jsonify({'error': 'Login Failed'}), 500
 
 
@@ -120,8 +166,11 @@ def refresh():
     try:
         user_id = get_jwt_identity()  # Get user ID from refresh token
         
-        # Use AuthService for token refresh
-        tokens = AuthService.refresh_user_tokens(user_id)
+        # Mint from the refresh token's own claims; only older tokens without
+        # embedded claims fall back to loading the seller
+        tokens = AuthService.mint_tokens_from_claims(get_jwt())
+        if not tokens:
+            tokens = AuthService.refresh_user_tokens(user_id)
         if not tokens:
             return jsonify({'error': 'Failed to refresh tokens'}), 401
 
@@ -130,9 +179,8 @@ def refresh():
             'refresh_token': tokens['refresh_token']
         }), 200
         
-    except Exception as e:
-        logging.error(f"Token refresh error: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Token refresh error")
         return jsonify({'error': 'Token refresh failed'}), 500
 
 
@@ -147,9 +195,8 @@ def logout():
 
         return jsonify({"message": "Successfully logged out"}), 200
         
-    except Exception as e:
-        logging.error(f"Logout error: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Logout error")
         return jsonify({"error": "Logout failed"}), 500
 
 
@@ -170,7 +217,7 @@ def reset_password():
             return jsonify({"error": "Missing required fields: email, old_password and new_password"}), 400
 
         # Validate email format (basic validation)
-        if '@' not in email or '.' not in email:
+        if not _EMAIL_RE.match(email):
             return jsonify({"error": "Invalid email format"}), 400
 
         # Validate password strength (basic validation)
@@ -195,9 +242,8 @@ def reset_password():
             "user_id": str(user.id)
         }), 200
         
-    except Exception as e:
-        logging.error(f"Failed to reset password: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to reset password")
         return jsonify({"error": "Password reset failed"}), 500
 
 
@@ -282,7 +328,6 @@ def generate_test_token():
         logging.info(f"Test token generated successfully for user: {email}")
         return jsonify(response_data), 200
         
-    except Exception as e:
-        logging.error(f"Failed to generate test token: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to generate test token")
         return jsonify({"error": "Test token generation failed"}), 500
@@ -1,15 +1,70 @@
 import logging
-import traceback
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, Response, current_app, request, jsonify, make_response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
-from app.services import BuyerService, BuyerSearchService, SellerService, MeetingService, ActionService
-from app.utils.call_recording_utils import denormalize_phone_number
+from app.services import BuyerService, BuyerCacheService, BuyerSearchService, SellerService, MeetingService, ActionService
+from app.serializers import BuyerProductsResponse, BuyerProfileResponse, BuyerUpdateRequest, CreatedBuyerResponse
+from app.utils.call_recording_utils import normalize_phone_number
 
 buyers_bp = Blueprint("buyers", __name__)
 
 logging = logging.getLogger(__name__)
 
+# Upper bound on buyers accepted by one POST /create_bulk request
+MAX_BULK_CREATE_BUYERS = 1000
+
+
+def _buyer_etag(buyer_id, state=None):
+    """
+    Weak ETag for a buyer's read endpoints, derived from buyers.updated_at and
+    the trigger-maintained buyers.pending_actions_count.
+
+    Args:
+        buyer_id: Buyer UUID
+        state: (agency_id, updated_at, pending_actions_count) from BuyerService.get_version_state,
+            if already loaded; fetched otherwise
+
+    Returns:
+        ETag value, or None if the buyer doesn't exist
+    """
+    if state is None:
+        state = BuyerService.get_version_state(buyer_id)
+        if not state:
+            return None
+    _, updated_at, pending_actions_count = state
+    return f"{buyer_id}-{updated_at.timestamp()}-{pending_actions_count}"
+
+
+def _get_buyer_state_for_current_agency(buyer_id):
+    """
+    Load a buyer's version state and check it belongs to the authenticated seller's agency.
+
+    Returns:
+        (state, None) on success, or (None, (error body, status)) if the buyer
+        doesn't exist or belongs to another agency
+    """
+    state = BuyerService.get_version_state(buyer_id)
+    if not state:
+        return None, ({"error": "Buyer not found"}, 404)
+    if str(state[0]) != str(_get_current_agency_id()):
+        return None, ({"error": "Unauthorized access to buyer data"}, 403)
+    return state, None
+
+
+def _get_current_agency_id():
+    """
+    Agency of the authenticated seller, read from the access token's claims so
+    no seller lookup is needed. Tokens issued without the claim fall back to
+    the cached seller agency lookup.
+
+    Returns:
+        Agency id string, or None if the seller no longer exists
+    """
+    agency_id = get_jwt().get("agency_id")
+    if agency_id:
+        return agency_id
+    return SellerService.get_agency_id(get_jwt_identity())
+
 
 @buyers_bp.route("/all", methods=["GET"])
 @jwt_required()
@@ -17,14 +72,16 @@ def get_agency_buyers():
     """
     Get all buyers from the current seller's agency.
     Returns buyers sorted by last contacted date with contact information.
+    Paginate with ?cursor=<pagination.next_cursor> (or the older ?page=).
     """
     try:
         user_id = get_jwt_identity()
         logging.info(f"Fetching agency buyers for user {user_id}")
 
-        # Parse pagination parameters
+        # Parse pagination parameters; cursor (from pagination.next_cursor) takes precedence over page
         page = request.args.get("page", type=int, default=1)
         limit = request.args.get("limit", type=int, default=50)
+        cursor = request.args.get("cursor")
         
         # Validate pagination parameters
         if page < 1:
@@ -32,34 +89,116 @@ def get_agency_buyers():
         if limit < 1 or limit > 100:
             return jsonify({"error": "Limit must be between 1 and 100"}), 400
 
-        # Get current seller to determine agency
-        seller = SellerService.get_by_id(user_id)
-        if not seller:
+        # Agency comes from the JWT claims; no seller lookup
+        agency_id = _get_current_agency_id()
+        if not agency_id:
             return jsonify({"error": "User not found"}), 404
 
+        # Serve the already-denormalized page from Redis when the agency's buyers haven't changed
+        cache_key = BuyerCacheService.build_agency_list_key(agency_id, page, limit, cursor)
+        cached_body = BuyerCacheService.get_cached_body(cache_key)
+        if cached_body:
+            return current_app.response_class(cached_body, mimetype=current_app.json.mimetype), 200
+
         # Get buyers with last contact information for the seller's agency with pagination
-        buyers_response = BuyerService.get_buyers_with_last_contact(str(seller.agency_id), page, limit)
-        
-        # Denormalize phone numbers for display
-        for buyer in buyers_response["data"]:
-            if buyer['phone']:
-                buyer['phone'] = denormalize_phone_number(buyer['phone'])
+        try:
+            buyers_response = BuyerService.get_buyers_with_last_contact(agency_id, page, limit, cursor=cursor)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
 
         # Update response structure to match existing API format
         response = {
             "buyers": buyers_response["data"],
             "pagination": buyers_response["pagination"],
-            "agency_id": str(seller.agency_id)
+            "agency_id": agency_id
         }
+        BuyerCacheService.cache_response(cache_key, response)
 
         return jsonify(response), 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch agency buyers for user {user_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch agency buyers for user %s", user_id)
         return jsonify({"error": f"Failed to fetch agency buyers: {str(e)}"}), 500
 
 
+@buyers_bp.route("/export", methods=["GET"])
+@jwt_required()
+def export_agency_buyers():
+    """
+    Stream every buyer in the current seller's agency as one JSON document,
+    {"buyers": [...], "total_count": N}, encoding rows as they are read so
+    memory stays flat for large agencies.
+    """
+    user_id = get_jwt_identity()
+    agency_id = _get_current_agency_id()
+    if not agency_id:
+        return jsonify({"error": "User not found"}), 404
+
+    dumps = current_app.json.dumps
+
+    def generate():
+        total_count = 0
+        yield '{"buyers":['
+        try:
+            for buyer in BuyerService.iter_agency_buyers(agency_id):
+                yield (',' if total_count else '') + dumps(buyer)
+                total_count += 1
+        except Exception:
+            # Headers are already sent, so the client sees a truncated document
+            logging.exception("Failed to stream agency buyers for user %s", user_id)
+            raise
+        yield f'],"total_count":{total_count},"agency_id":{dumps(agency_id)}}}'
+
+    logging.info("Exporting agency buyers for user %s", user_id)
+    return Response(stream_with_context(generate()), mimetype=current_app.json.mimetype)
+
+
+@buyers_bp.route("/<uuid:buyer_id>", methods=["GET"])
+@jwt_required()
+def get_buyer_details(buyer_id):
+    """
+    Fetch several buyer detail sections in one request.
+    
+    Query Parameters:
+        - fields (string, optional): Comma-separated subset of profile, products,
+          actions_count (default: all)
+    """
+    try:
+        logging.info("Fetching buyer details for buyer_id %s", buyer_id)
+
+        fields_param = request.args.get("fields")
+        if fields_param:
+            fields = frozenset(f.strip() for f in fields_param.split(",") if f.strip())
+        else:
+            fields = BuyerService.BUNDLE_FIELDS
+        if not fields or not fields <= BuyerService.BUNDLE_FIELDS:
+            return jsonify({
+                "error": f"Invalid fields. Allowed: {', '.join(sorted(BuyerService.BUNDLE_FIELDS))}"
+            }), 400
+
+        # Conditional GET: answer from the version columns alone if the client copy is current
+        state, error_response = _get_buyer_state_for_current_agency(buyer_id)
+        if error_response:
+            return jsonify(error_response[0]), error_response[1]
+        etag = _buyer_etag(buyer_id, state)
+        if request.if_none_match.contains_weak(etag):
+            response = make_response("", 304)
+            response.set_etag(etag, weak=True)
+            return response
+
+        bundle = BuyerService.get_buyer_bundle(str(buyer_id), fields)
+        if bundle is None:
+            return jsonify({"error": "Buyer not found"}), 404
+
+        response = jsonify({"id": str(buyer_id), **bundle})
+        response.set_etag(etag, weak=True)
+        return response, 200
+
+    except Exception as e:
+        logging.exception("Failed to fetch buyer details for buyer_id %s", buyer_id)
+        return jsonify({"error": f"Failed to fetch buyer details: {str(e)}"}), 500
+
+
 @buyers_bp.route("/profile/<uuid:buyer_id>", methods=["GET"])
 def get_buyer_profile(buyer_id):
     """
@@ -69,20 +208,25 @@ def get_buyer_profile(buyer_id):
     try:
         logging.info(f"Fetching buyer profile for buyer_id {buyer_id}")
 
+        # Conditional GET: answer from the version columns alone if the client copy is current
+        etag = _buyer_etag(buyer_id)
+        if etag and request.if_none_match.contains_weak(etag):
+            response = make_response("", 304)
+            response.set_etag(etag, weak=True)
+            return response
+
         # Get buyer with last contact information
         buyer_data = BuyerService.get_buyer_with_last_contact(str(buyer_id))
         if not buyer_data:
             return jsonify({"error": "Buyer not found"}), 404
 
-        # Denormalize phone number for display
-        if buyer_data['phone']:
-            buyer_data['phone'] = denormalize_phone_number(buyer_data['phone'])
-
-        return jsonify(buyer_data), 200
+        response = jsonify(buyer_data)
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response, 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch buyer profile for buyer_id {buyer_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch buyer profile for buyer_id %s", buyer_id)
         return jsonify({"error": f"Failed to fetch buyer profile: {str(e)}"}), 500
 
 
@@ -106,8 +250,7 @@ def get_buyer_call_history(buyer_id):
         return jsonify(call_history), 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch call history for buyer_id {buyer_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch call history for buyer_id %s", buyer_id)
         return jsonify({"error": f"Failed to fetch call history: {str(e)}"}), 500
 
 
@@ -118,64 +261,39 @@ def update_buyer_profile(buyer_id):
     Accepts JSON with optional fields: risks, products_discussed, and key_highlights.
     """
     try:
-        logging.info(f"Updating buyer profile for buyer_id {buyer_id}")
+        logging.info("Updating buyer profile for buyer_id %s", buyer_id)
 
         # Get request data
         data = request.get_json()
         if not data:
             return jsonify({"error": "No data provided"}), 400
-        
-        # Log raw data being sent for processing
-        logging.info(f"[BUYER_UPDATE] Raw data received for buyer_id {buyer_id}: {data}")
-        logging.info(f"[BUYER_UPDATE] Data keys: {list(data.keys())}")
-        logging.info(f"[BUYER_UPDATE] Data types: {[(key, type(value).__name__) for key, value in data.items()]}")
 
-        # Validate allowed fields
-        allowed_fields = {'risks', 'products_discussed', 'key_highlights'}
-        
-        invalid_fields = set(data.keys()) - allowed_fields
-        if invalid_fields:
-            logging.warning(f"[BUYER_UPDATE] Invalid fields rejected for buyer_id {buyer_id}: {list(invalid_fields)}")
-            return jsonify({"error": f"Invalid fields: {', '.join(invalid_fields)}"}), 400
+        # Validate field names and types
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        try:
+            update_request = BuyerUpdateRequest.from_json(data)
+        except ValueError as ve:
+            logging.warning("[BUYER_UPDATE] Invalid update rejected for buyer_id %s: %s", buyer_id, ve)
+            return jsonify({"error": str(ve)}), 400
 
-        # Log validated data being processed
-        logging.info(f"[BUYER_UPDATE] Validated data for buyer_id {buyer_id}: {data}")
-        logging.info(f"[BUYER_UPDATE] Fields being updated: {list(data.keys())}")
+        # Field names only; the payload itself may contain PII
+        logging.debug("[BUYER_UPDATE] Fields being updated for buyer_id %s: %s", buyer_id, list(data.keys()))
 
-        # Get buyer by ID and verify access
-        buyer = BuyerService.get_by_id(buyer_id)
-        if not buyer:
-            logging.error(f"[BUYER_UPDATE] Buyer not found: {buyer_id}")
+        # Update buyer profile using BuyerService; it loads the buyer itself, so no separate existence check
+        updated_buyer = BuyerService.update_buyer_info(buyer_id, **update_request.to_update_kwargs())
+        if not updated_buyer:
+            logging.error("[BUYER_UPDATE] Buyer not found: %s", buyer_id)
             return jsonify({"error": "Buyer not found"}), 404
 
-        # Update buyer profile using BuyerService
-        logging.info(f"[BUYER_UPDATE] Calling BuyerService.update_buyer_info with data: {data}")
-        updated_buyer = BuyerService.update_buyer_info(buyer_id, **data)
-        if not updated_buyer:
-            logging.error(f"[BUYER_UPDATE] Failed to update buyer profile for buyer_id {buyer_id}")
-            return jsonify({"error": "Failed to update buyer profile"}), 500
-
-        logging.info(f"[BUYER_UPDATE] Successfully updated buyer profile for buyer_id {buyer_id}")
-
-        # Calculate averaged interest levels from all meetings for response
-        processed_products_discussed = BuyerService._calculate_averaged_products_discussed(buyer_id)
-
-        # Return updated profile with averaged interest levels
-        result = {
-            "id": str(updated_buyer.id),
-            "phone": denormalize_phone_number(updated_buyer.phone),
-            "name": updated_buyer.name,
-            "email": updated_buyer.email,
-            "risks": updated_buyer.risks,
-            "products_discussed": processed_products_discussed,  # Use averaged data
-            "key_highlights": updated_buyer.key_highlights
-        }
+        # Products discussed across all meetings, read from the materialized column
+        processed_products_discussed = BuyerService.get_products_discussed_summary(buyer_id)
 
-        return jsonify(result), 200
+        # Return updated profile with the meeting-derived products
+        return jsonify(BuyerProfileResponse.from_buyer(updated_buyer, processed_products_discussed)), 200
 
     except Exception as e:
-        logging.error(f"Failed to update buyer profile for buyer_id {buyer_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to update buyer profile for buyer_id %s", buyer_id)
         return jsonify({"error": f"Failed to update buyer profile: {str(e)}"}), 500
 
 
@@ -188,25 +306,25 @@ def get_buyer_products_catalogue(buyer_id):
     try:
         logging.info(f"Fetching products catalogue for buyer_id {buyer_id}")
 
-        # Get buyer by ID
-        buyer = BuyerService.get_by_id(buyer_id)
-        if not buyer:
-            return jsonify({"error": "Buyer not found"}), 404
+        # Conditional GET: the materialized products summary bumps updated_at when it changes
+        etag = _buyer_etag(buyer_id)
+        if etag and request.if_none_match.contains_weak(etag):
+            response = make_response("", 304)
+            response.set_etag(etag, weak=True)
+            return response
 
-        # Calculate averaged interest levels from all meetings instead of using stored data
-        processed_products_discussed = BuyerService._calculate_averaged_products_discussed(buyer_id)
+        # Products discussed across all meetings, read from the materialized column
+        bundle = BuyerService.get_buyer_bundle(buyer_id, frozenset({'products'}))
+        if bundle is None:
+            return jsonify({"error": "Buyer not found"}), 404
         
-        # Return processed products_discussed data with interest_level
-        result = {
-            "id": str(buyer.id),
-            "products_discussed": processed_products_discussed
-        }
-
-        return jsonify(result), 200
+        response = jsonify(BuyerProductsResponse(buyer_id, bundle['products']))
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response, 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch products catalogue for buyer_id {buyer_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch products catalogue for buyer_id %s", buyer_id)
         return jsonify({"error": f"Failed to fetch products catalogue: {str(e)}"}), 500
 
 
@@ -219,22 +337,19 @@ def get_buyer_pending_actions_count(buyer_id):
     try:
         logging.info(f"Fetching pending actions count for buyer_id {buyer_id}")
 
-        # Verify buyer exists
-        buyer = BuyerService.get_by_id(buyer_id)
-        if not buyer:
+        # Verify buyer exists and get pending actions count
+        buyer_id_str = str(buyer_id)
+        bundle = BuyerService.get_buyer_bundle(buyer_id_str, frozenset({'actions_count'}))
+        if bundle is None:
             return jsonify({"error": "Buyer not found"}), 404
 
-        # Get pending actions count
-        pending_count = ActionService.get_pending_actions_count_for_buyer(str(buyer_id))
-
         return jsonify({
-            "buyer_id": str(buyer_id),
-            "pending_actions_count": pending_count
+            "buyer_id": buyer_id_str,
+            "pending_actions_count": bundle['actions_count']
         }), 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch pending actions count for buyer_id {buyer_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch pending actions count for buyer_id %s", buyer_id)
         return jsonify({"error": f"Failed to fetch pending actions count: {str(e)}"}), 500
 
 
@@ -248,23 +363,20 @@ def get_buyer_actions(buyer_id):
     try:
         logging.info(f"Fetching all actions for buyer_id {buyer_id}")
 
-        # Verify buyer exists
-        buyer = BuyerService.get_by_id(buyer_id)
-        if not buyer:
+        # Existence check and actions fetch in one query
+        buyer_id_str = str(buyer_id)
+        actions = ActionService.get_actions_for_existing_buyer(buyer_id_str)
+        if actions is None:
             return jsonify({"error": "Buyer not found"}), 404
 
-        # Get all actions for the buyer
-        actions = ActionService.get_all_actions_for_buyer(str(buyer_id))
-
         return jsonify({
-            "buyer_id": str(buyer_id),
+            "buyer_id": buyer_id_str,
             "actions": actions,
             "total_count": len(actions)
         }), 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch actions for buyer_id {buyer_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch actions for buyer_id %s", buyer_id)
         return jsonify({"error": f"Failed to fetch actions: {str(e)}"}), 500
 
 
@@ -288,9 +400,9 @@ def search_buyers():
         user_id = get_jwt_identity()
         logging.info(f"Buyer search request from user {user_id}")
 
-        # Get current seller to determine agency
-        seller = SellerService.get_by_id(user_id)
-        if not seller:
+        # Agency comes from the JWT claims; only the rate-limit check precedes the search
+        agency_id = _get_current_agency_id()
+        if not agency_id:
             return jsonify({"error": "User not found"}), 404
 
         # Get query parameters
@@ -323,7 +435,7 @@ def search_buyers():
         # Perform the search
         search_results = BuyerSearchService.search_buyers(
             query=query,
-            agency_id=str(seller.agency_id),
+            agency_id=agency_id,
             user_id=user_id,
             limit=limit,
             suggestion_limit=suggestion_limit
@@ -338,9 +450,8 @@ def search_buyers():
 
         return jsonify(search_results), 200
 
-    except Exception as e:
-        logging.error(f"Failed to search buyers for user {user_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Failed to search buyers for user %s", user_id)
         return jsonify({
             "error": "Search service temporarily unavailable",
             "code": "SEARCH_SERVICE_ERROR"
@@ -358,9 +469,9 @@ def create_buyer():
         user_id = get_jwt_identity()
         logging.info(f"Creating buyer for user {user_id}")
 
-        # Get current seller to determine agency
-        seller = SellerService.get_by_id(user_id)
-        if not seller:
+        # Agency comes from the JWT claims; no seller lookup
+        agency_id = _get_current_agency_id()
+        if not agency_id:
             return jsonify({"error": "User not found"}), 404
 
         # Get request data
@@ -376,6 +487,9 @@ def create_buyer():
         if not name or not phone:
             return jsonify({"error": "Missing required fields: name and phone are required"}), 400
 
+        # Normalize once at the edge so the (phone, agency_id) unique index sees the stored form
+        phone = normalize_phone_number(phone)
+
         # Extract optional fields
         email = data.get('email')
         company_name = data.get('company_name')
@@ -387,7 +501,7 @@ def create_buyer():
         # Create buyer using BuyerService
         new_buyer = BuyerService.create_buyer(
             phone=phone,
-            agency_id=str(seller.agency_id),
+            agency_id=agency_id,
             name=name,
             email=email,
             company_name=company_name,
@@ -396,27 +510,56 @@ def create_buyer():
             key_highlights=key_highlights
         )
 
-        logging.info(f"Created buyer successfully: {new_buyer.id} for agency: {seller.agency_id}")
+        logging.info(f"Created buyer successfully: {new_buyer.id} for agency: {agency_id}")
         
-        # Return created buyer data
-        result = {
-            "id": str(new_buyer.id),
-            "name": new_buyer.name,
-            "phone": denormalize_phone_number(new_buyer.phone),
-            "email": new_buyer.email,
-            "company_name": new_buyer.company_name,
-            "agency_id": str(seller.agency_id),
-            "risks": new_buyer.risks,
-            "products_discussed": new_buyer.products_discussed,
-            "key_highlights": new_buyer.key_highlights
-        }
-
         return jsonify({
             "message": "Buyer created successfully",
-            "buyer": result
+            "buyer": CreatedBuyerResponse.from_buyer(new_buyer, agency_id)
         }), 201
 
     except Exception as e:
-        logging.error(f"Failed to create buyer for user {user_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to create buyer for user %s", user_id)
         return jsonify({"error": f"Failed to create buyer: {str(e)}"}), 500
+
+
+@buyers_bp.route("/create_bulk", methods=["POST"])
+@jwt_required()
+def create_buyers_bulk():
+    """
+    Create many buyers for the current seller's agency in one request (CSV/import flows).
+    Accepts JSON {"buyers": [{"name": ..., "phone": ..., ...}, ...]}; buyers whose phone
+    already exists in the agency are skipped.
+    """
+    try:
+        user_id = get_jwt_identity()
+
+        agency_id = _get_current_agency_id()
+        if not agency_id:
+            return jsonify({"error": "User not found"}), 404
+
+        data = request.get_json()
+        buyers = data.get('buyers') if isinstance(data, dict) else None
+        if not buyers or not isinstance(buyers, list):
+            return jsonify({"error": "buyers must be a non-empty list"}), 400
+        if len(buyers) > MAX_BULK_CREATE_BUYERS:
+            return jsonify({"error": f"At most {MAX_BULK_CREATE_BUYERS} buyers can be created per request"}), 400
+
+        rows = []
+        for index, buyer in enumerate(buyers):
+            if not isinstance(buyer, dict) or not buyer.get('name') or not buyer.get('phone'):
+                return jsonify({"error": f"Buyer at index {index} is missing required fields: name and phone"}), 400
+            rows.append({**buyer, 'phone': normalize_phone_number(buyer['phone'])})
+
+        logging.info("Bulk creating %d buyers for user %s", len(rows), user_id)
+        created = BuyerService.create_buyers_bulk(agency_id, rows)
+
+        return jsonify({
+            "message": "Buyers created successfully",
+            "created_count": len(created),
+            "skipped_count": len(rows) - len(created),
+            "buyers": [CreatedBuyerResponse.from_buyer(buyer, agency_id) for buyer in created]
+        }), 201
+
+    except Exception as e:
+        logging.exception("Failed to bulk create buyers for user %s", user_id)
+        return jsonify({"error": f"Failed to create buyers: {str(e)}"}), 500
@@ -1,30 +1,99 @@
-import json
-import traceback
 from zoneinfo import ZoneInfo
 
 import logging
-import os
-import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-import requests
-from flask import Blueprint, request, jsonify
-from sqlalchemy import and_
+from flask import Blueprint, current_app, request, jsonify
 
 from app import db
-from app.services import JobService, SellerService
-from app.constants import AWSConstants, MeetingSource, MobileAppCallStatus, CallDirection
-from app.models.exotel_calls import ExotelCall
+from app.constants import AWSConstants, MobileAppCallStatus
 
-from app.external.aws.ecs_client import ECSClient
-from app.utils.call_recording_utils import upload_file_to_s3, download_exotel_file_from_url, get_audio_duration_seconds, \
-    normalize_phone_number, calculate_call_status, denormalize_phone_number, find_or_create_buyer
-from app.services import BuyerService, SellerService, CallService, MeetingService, JobService
+from app.external.aws.ecs_client import get_ecs_client
+from app.external.aws.s3_client import get_s3_client
+from app.tasks import enqueue_exotel_recording, enqueue_mobile_app_call_reconciliation, \
+    MIN_RECORDING_DURATION_SECONDS
+from app.utils.call_recording_utils import normalize_phone_number, calculate_call_status, phone_number_key
+from app.services import SellerService, CallService, JobService
 
 logging = logging.getLogger(__name__)
 
 call_record_bp = Blueprint("call_records", __name__)
 
+IST = ZoneInfo("Asia/Kolkata")
+
+# ECS task launches run off the request thread (see post_recording)
+_ecs_launch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ecs-launch")
+
+# A failed launch is retried with backoff (2s, 4s) before the job is marked failed
+ECS_LAUNCH_ATTEMPTS = 3
+ECS_LAUNCH_BACKOFF_SECONDS = 2
+
+
+def _start_speaker_diarization(app, job_id):
+    """
+    Launch the ECS speaker diarization task for a job, retrying with backoff.
+    If every attempt fails the job is marked failed, so its status tells the
+    caller the recording was never picked up and /post_recording can be retried.
+    """
+    for attempt in range(ECS_LAUNCH_ATTEMPTS):
+        try:
+            get_ecs_client().run_speaker_diarization_task(job_id=job_id)
+            return
+        except Exception:
+            if attempt == ECS_LAUNCH_ATTEMPTS - 1:
+                logging.exception("Failed to start speaker diarization task for job %s", job_id)
+                break
+            delay = ECS_LAUNCH_BACKOFF_SECONDS * (2 ** attempt)
+            logging.warning("Failed to start speaker diarization task for job %s, retrying in %ss",
+                            job_id, delay, exc_info=True)
+            time.sleep(delay)
+
+    try:
+        with app.app_context():
+            JobService.mark_failed(job_id, "ECS speaker diarization task could not be started")
+    except Exception:
+        logging.exception("Failed to mark job %s as failed", job_id)
+
+
+# Lifetime of the presigned upload URL handed to the recording app
+RECORDING_UPLOAD_URL_EXPIRY_SECONDS = 3600
+
+
+@call_record_bp.route('/presign_recording', methods=['POST'])
+def presign_recording():
+    """
+    Return a presigned S3 PUT URL for a job's recording, so the recording app
+    uploads straight to S3 instead of through this server. Once the upload is
+    done the app calls /post_recording with the returned s3_audio_url.
+    """
+    try:
+        data = request.get_json()
+        job_id = data.get("job_id")
+
+        if not job_id:
+            return jsonify({"error": "Missing required fields"}), 400
+
+        if not JobService.get_by_id(job_id):
+            return jsonify({"error": "Job not found"}), 404
+
+        bucket_name = AWSConstants.AUDIO_FILES_S3_BUCKET
+        s3_key = f"recordings/app/{job_id}.mp3"
+        upload_url = get_s3_client().generate_presigned_put_url(
+            bucket_name, s3_key, expires_in=RECORDING_UPLOAD_URL_EXPIRY_SECONDS
+        )
+
+        return jsonify({
+            "job_id": str(job_id),
+            "upload_url": upload_url,
+            "s3_audio_url": f"s3://{bucket_name}/{s3_key}",
+            "expires_in": RECORDING_UPLOAD_URL_EXPIRY_SECONDS
+        }), 200
+    except Exception as e:
+        logging.exception("Failed to presign recording upload")
+        return jsonify({"error": f"Failed to presign recording upload: {e}"}), 500
+
 
 @call_record_bp.route('/post_recording', methods=['POST'])
 def post_recording():
@@ -40,36 +109,31 @@ def post_recording():
         if not job_id or not recording_s3_url:
             return jsonify({"error": "Missing required fields"}), 400
 
-        job = JobService.get_by_id(job_id)
-        if not job:
+        # Existence check and write in one UPDATE ... RETURNING
+        if not JobService.set_s3_audio_url(job_id, recording_s3_url):
             return jsonify({"error": "Job not found"}), 404
 
-        # Update job with the recording URL
-        job.s3_audio_url = recording_s3_url
-        db.session.commit()
-
-        # Initialize ECS task for speaker diarization
-        ecs_client = ECSClient()
-        task_response = ecs_client.run_speaker_diarization_task(job_id=job_id)
+        # Launch the ECS speaker diarization task in the background; the caller
+        # doesn't wait on the AWS API round-trip
+        _ecs_launch_executor.submit(_start_speaker_diarization, current_app._get_current_object(), job_id)
 
         return jsonify({
-            "message": "Recording received and ECS speaker diarization task started",
-            "job_id": str(job.id),
-            "s3_audio_url": job.s3_audio_url,
-            "ecs_task_response": task_response
-        }), 200
+            "message": "Recording received and ECS speaker diarization task queued",
+            "job_id": str(job_id),
+            "s3_audio_url": recording_s3_url
+        }), 202
     except Exception as e:
-        logging.error(f"Failed to process recording: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
-        return {"error": f"failed to create account. Error - {e}"}
+        logging.exception("Failed to process recording")
+        return jsonify({"error": f"Failed to process recording: {e}"}), 500
 
 
 @call_record_bp.route("/post_exotel_recording", methods=["GET"])
 def post_exotel_recording():
     """
     Post method for exotel webhook to send recording details.
-    This method initializes an ECS task to start transcription for the recording.
-    Creates a meeting record, and a corresponding job record for tracking.
+    Validates the request and queues the recording for background processing,
+    which stores the call, reconciles it with the app call log and, on a match,
+    creates the meeting and job records and starts diarization.
     """
     try:
         logging.info("Processing request for exotel call recording")
@@ -97,7 +161,7 @@ def post_exotel_recording():
             "call_recording_url": call_recording_url
         }
 
-        logging.info(f"Received request to process exotel recording with details: {exotel_call_recording_details}")
+        logging.debug("Received request to process exotel recording with details: %r", exotel_call_recording_details)
 
         # Validate required parameters
         if not all([call_from, call_start_time, call_duration, call_recording_url]):
@@ -109,134 +173,43 @@ def post_exotel_recording():
         assert call_duration is not None
         assert call_recording_url is not None
 
+        # The recording can't outlast the dialed call, so a short DialCallDuration
+        # rejects the call without downloading anything
+        if call_duration.isdigit() and int(call_duration) < MIN_RECORDING_DURATION_SECONDS:
+            logging.error({"error": f"Call duration too low to process: {call_duration} seconds"})
+            return jsonify({"error": f"Call duration too low to process: {call_duration} seconds"}), 400
+
         call_from = normalize_phone_number(call_from)
-        call_start_time = datetime.strptime(call_start_time, '%Y-%m-%d %H:%M:%S').replace(tzinfo=ZoneInfo("Asia/Kolkata"))
+        call_start_time = _parse_exotel_time(call_start_time)
 
-        # create meeting record
-        # get user using SellerService
-        user = SellerService.get_by_phone(call_from)
-        if not user:
+        seller_id = SellerService.get_id_by_phone(call_from)
+        if not seller_id:
             logging.error({"error": f"No user found with phone number: {call_from}"})
             return jsonify({"error": f"No user found with phone number: {call_from}"}), 404
 
-        logging.info("Downloading exotel audio file")
-        temp_file_path = download_exotel_file_from_url(call_recording_url)
-
-        duration_seconds = get_audio_duration_seconds(temp_file_path)
-
-        if duration_seconds < 5:
-            logging.error({"error": f"Call duration too low to process: {duration_seconds} seconds"})
-            return jsonify({"error": f"Failed to process Exotel recording"}), 500
-
-        logging.info(f"duration of recorded audio file is {duration_seconds}")
-        call_end_time = call_start_time + timedelta(seconds=duration_seconds)
-
-        logging.info(f"Creating Exotel call record for user {user.email}")
-        # No matching AppCall — just store this Exotel call temporarily using CallService
-        exotel_call = CallService.create_exotel_call(
-            call_from=call_from,
-            start_time=call_start_time,
-            end_time=call_end_time,
-            duration=int(call_duration) if call_duration else 0,
-            call_recording_url=call_recording_url
-        )
-
-        logging.info("Searching for matching mobile app call")
-        # Search for a matching mobile app call using CallService
-        matching_app_call = CallService.find_matching_mobile_app_call(
-            seller_number=call_from,
-            start_time=call_start_time,
-            end_time=call_end_time
-        )
-
-        if matching_app_call:
-            logging.info(f"matching app call found with id: {matching_app_call.id}")
-            try:
-                logging.info("Saving audio file to S3 after matching app call log has been found")
-                s3_key = f"recordings/exotel/{call_from}/{matching_app_call.id or exotel_call.id}.mp3"
-                bucket_name = AWSConstants.AUDIO_FILES_S3_BUCKET
-                s3_url = upload_file_to_s3(temp_file_path, bucket_name, s3_key)
-                if temp_file_path and os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-            except Exception as e:
-                if 'temp_file_path' in locals() and temp_file_path and os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                logging.error(f"Failed to upload Exotel recording: {str(e)}")
-                logging.error(f"Traceback: {traceback.format_exc()}")
-                return jsonify({"error": f"Failed to upload Exotel recording: {str(e)}"}), 500
-
-            logging.info(f"Creating new meeting and job entry for reconciled call for user {user.email}")
-            
-            # Find or create buyer using BuyerService
-            buyer = BuyerService.find_or_create_buyer(matching_app_call.buyer_number, user.agency_id)
-            
-            # Convert call_type to CallDirection enum value
-            if matching_app_call.call_type == "incoming":
-                meeting_direction = CallDirection.INCOMING.value
-            elif matching_app_call.call_type == "outgoing":
-                meeting_direction = CallDirection.OUTGOING.value
-            elif matching_app_call.call_type == "missed":
-                meeting_direction = CallDirection.INCOMING.value  # Missed calls are incoming
-            elif matching_app_call.call_type == "rejected":
-                meeting_direction = CallDirection.INCOMING.value  # Rejected calls are incoming
-            else:
-                meeting_direction = None  # Fallback for unknown types
-            
-            # Create Meeting using MeetingService with corrected end_time (remove 3-second buffer)
-            # Calculate original end_time from start_time + duration to avoid the 3-second reconciliation buffer
-            corrected_end_time = matching_app_call.start_time + timedelta(seconds=matching_app_call.duration)
-            meeting = MeetingService.create_meeting(
-                buyer_id=buyer.id,
-                seller_id=user.id,
-                title=f"Meeting between {denormalize_phone_number(matching_app_call.buyer_number)} and {user.name}",
-                start_time=matching_app_call.start_time,
-                end_time=corrected_end_time,
-                source=MeetingSource.PHONE,
-                direction=meeting_direction
-            )
-            
-            # Create Job using JobService
-            job = JobService.create_job(
-                meeting_id=meeting.id,
-                s3_audio_url=s3_url,
-                start_time=call_start_time
-            )
-
-            # Delete only the Exotel call - keep mobile app call for sync purposes
-            CallService.delete_exotel_call(exotel_call)
-            CallService.delete_mobile_app_call(matching_app_call)
-
-            logging.info("Initializing task for diarization.")
-            # Initialize ECS task for speaker diarization
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer rpa_2BLBUZNNJ8ME90LK3OA517U24ZTT4EP4WQ9LPYLR13nqf3"
-            }
-            payload = {
-                "input": {
-                    "job_id": str(job.id),
-                }
-            }
-            runpod_diarization_url = os.getenv("RUNPOD_DIARIZATION_URL")
-            if not runpod_diarization_url:
-                logging.error("RUNPOD_DIARIZATION_URL environment variable not set")
-                return jsonify({"error": "Diarization service not configured"}), 500
-            
-            response = requests.post(
-                runpod_diarization_url, headers=headers, data=json.dumps(payload)
-            )
-            if response.status_code == 200:
-                result = response.json()
-                logging.info(f"Successfully started diarization: {str(result)}")
-            else:
-                logging.error(f"Error in starting diarization: {response.status_code}, {response.text}")
-        else:
-            logging.info(f"No matching app call found. Saving in Exotel call temp table with id {exotel_call.id}")
+        # Exotel redelivers webhooks it thinks timed out. A CallSid is recorded once its
+        # processing has finished, so a redelivery of a processed call stops here,
+        # before any download, while one whose processing failed is taken again
+        if call_id and CallService.exotel_call_delivery_exists(call_id):
+            logging.info(f"Exotel call {call_id} already received, skipping")
+            return jsonify({"message": "Exotel call record already received."}), 200
+
+        # Download, S3 upload, reconciliation and diarization run in the background
+        # so the webhook is answered well inside Exotel's timeout
+        enqueue_exotel_recording({
+            "call_sid": call_id,
+            "seller_id": seller_id,
+            "call_from": call_from,
+            "call_start_time": call_start_time,
+            "call_duration": call_duration,
+            "call_recording_url": call_recording_url
+        })
+        logging.info(f"Queued exotel recording for user {seller_id}")
 
-        return jsonify({"message": f"Exotel call record processed successfully."}), 200
+        return jsonify({"message": f"Exotel call record queued for processing."}), 200
 
     except Exception as e:
-        logging.error(f"Failed to process Exotel recording: %s", traceback.format_exc())
+        logging.exception("Failed to process Exotel recording")
         db.session.rollback()  # Rollback in case of any error
         return jsonify({"error": f"Failed to process Exotel recording: {str(e)}"}), 500
 
@@ -245,169 +218,119 @@ def post_exotel_recording():
 def post_app_call_record():
     try:
         data = request.get_json()
-        logging.info(f"Received POST request for processing app call logs with data: {data}")
+        logging.info(f"Received POST request for processing {len(data) if data else 0} app call logs")
+        logging.debug("App call log payload: %r", data)
+
+        # Validate the whole payload first, then resolve every seller in one query
         for item in data:
-            seller_number = item.get("sellerNumber")
-            call_id = item.get("appCallId")  # Not stored directly; kept here if needed later
-            buyer_number = item.get("buyerNumber")
-            call_type_str = item.get("callType")
-            start_time_str = item.get("startTime")
-            end_time_str = item.get("endTime")
-            duration = item.get("duration")
-
-            if not all([buyer_number, seller_number, call_type_str, start_time_str, duration]):
+            if not all([item.get("buyerNumber"), item.get("sellerNumber"), item.get("callType"),
+                        item.get("startTime"), item.get("duration")]):
                 logging.error("all required fields were not sent in the request parameter")
                 return jsonify({"error": "Missing required fields"}), 400
 
-            user = SellerService.get_by_phone(seller_number)
-
-            if not user:
-                logging.info(f"No user with phone number {seller_number} found")
-                return jsonify({"message": f"No user with phone number {seller_number} found"}), 404
+        # Normalize and parse every field once, up front
+        parsed = [
+            (
+                item,
+                normalize_phone_number(item["sellerNumber"]),
+                normalize_phone_number(item["buyerNumber"]),
+                _parse_app_call_time(item["startTime"]),
+                _parse_app_call_time(item.get("endTime")),
+            )
+            for item in data
+        ]
+        seller_ids = SellerService.get_ids_by_phones([seller_number for _, seller_number, _, _, _ in parsed])
 
-            buyer_number = normalize_phone_number(buyer_number)
-            seller_number = normalize_phone_number(seller_number)
+        calls = []
+        for item, seller_number, buyer_number, start_time, end_time in parsed:
+            call_type_str = item["callType"]
+            duration = item["duration"]
 
-            # call_type = CallDirection[call_type_str.upper()]  # e.g., 'incoming' → CallDirection.INCOMING
-            start_time_str = datetime.strptime(start_time_str.replace("Z", ""), "%Y-%m-%dT%H:%M:%S")
-            start_time = start_time_str.replace(tzinfo=ZoneInfo("Asia/Kolkata"))
-            end_time_str = datetime.strptime(end_time_str.replace("Z", ""), "%Y-%m-%dT%H:%M:%S")
-            end_time = end_time_str.replace(tzinfo=ZoneInfo("Asia/Kolkata"))
+            seller_id = seller_ids.get(phone_number_key(seller_number))
 
-            # Check for duplicate based on seller_number, buyer_number, and start_time
-            existing_record = CallService.get_mobile_app_call_by_details(seller_number, buyer_number, start_time)
-            if existing_record:
-                logging.info(f"Duplicate call found: seller={seller_number}, buyer={buyer_number}, "
-                           f"start_time={start_time}, existing_call_id={existing_record.id}. Skipping processing.")
-                continue
+            if not seller_id:
+                logging.info(f"No user with phone number {item['sellerNumber']} found")
+                return jsonify({"message": f"No user with phone number {item['sellerNumber']} found"}), 404
 
             call_status = calculate_call_status(call_type_str, duration)
 
-            # Store original end_time for meeting creation
-            original_end_time = end_time
-            
             if call_status == MobileAppCallStatus.PROCESSING.value and duration != '0':
                 # adding this time to enlarge the window for exotel call reconciliation
                 end_time = end_time + timedelta(seconds=3)
 
-            logging.info(f"Creating app call record for user {user.email}")
-            # 1. Create the mobile app call record
-            mobile_call = CallService.create_mobile_app_call(
-                mobile_app_call_id=call_id,
-                buyer_number=buyer_number,
-                seller_number=seller_number,
-                call_type=call_type_str,
-                start_time=start_time,
-                end_time=end_time,
-                duration=int(duration) if duration else 0,
-                user_id=user.id
-            )
-
-            logging.info("Searching for matching exotel call")
-            # 2. Search for a matching Exotel call
-            matching_exotel_call = (
-                ExotelCall.query
-                .filter(and_(
-                    ExotelCall.call_from == seller_number,
-                    ExotelCall.start_time >= start_time,
-                    ExotelCall.end_time <= end_time,
-                ))
-                .order_by(ExotelCall.start_time.asc())
-                .first()
-            )
-
-            if matching_exotel_call:
-                logging.info(f"matching exotel call found with id: {matching_exotel_call.id}")
-                try:
-                    logging.info("Downloading exotel file and saving to S3")
-                    temp_file_path = download_exotel_file_from_url(matching_exotel_call.call_recording_url)
-                    s3_key = f"recordings/exotel/{seller_number}/{call_id or uuid.uuid4()}.mp3"
-                    bucket_name = AWSConstants.AUDIO_FILES_S3_BUCKET
-                    s3_url = upload_file_to_s3(temp_file_path, bucket_name, s3_key)
-                    if temp_file_path and os.path.exists(temp_file_path):
-                        os.unlink(temp_file_path)
-                except Exception as e:
-                    if 'temp_file_path' in locals() and temp_file_path and os.path.exists(temp_file_path):
-                        os.unlink(temp_file_path)
-                    logging.error(f"Failed to upload Exotel recording: {str(e)}")
-                    logging.error(f"Traceback: {traceback.format_exc()}")
-                    return jsonify({"error": f"Failed to upload Exotel recording: {str(e)}"}), 500
-
-                logging.info("Creating new meeting and job entry for reconciled call.")
-                
-                # Find or create buyer
-                buyer = find_or_create_buyer(buyer_number, user.agency_id)
-                
-                # Convert call_type to CallDirection enum value
-                if mobile_call.call_type == "incoming":
-                    meeting_direction = CallDirection.INCOMING.value
-                elif mobile_call.call_type == "outgoing":
-                    meeting_direction = CallDirection.OUTGOING.value
-                elif mobile_call.call_type == "missed":
-                    meeting_direction = CallDirection.INCOMING.value  # Missed calls are incoming
-                elif mobile_call.call_type == "rejected":
-                    meeting_direction = CallDirection.INCOMING.value  # Rejected calls are incoming
-                else:
-                    meeting_direction = None  # Fallback for unknown types
-                
-                # Create Meeting using MeetingService with original end_time (without 3-second buffer)
-                meeting = MeetingService.create_meeting(
-                    buyer_id=buyer.id,
-                    seller_id=user.id,
-                    title=f"Meeting between {denormalize_phone_number(buyer_number)} and {user.name}",
-                    start_time=start_time,
-                    end_time=original_end_time,
-                    source=MeetingSource.PHONE,
-                    direction=meeting_direction
-                )
-
-                # Create Job using JobService  
-                job = JobService.create_job(
-                    meeting_id=meeting.id,
-                    s3_audio_url=s3_url
-                )
-
-                # Delete reconciled records using service methods
-                CallService.delete_exotel_call(matching_exotel_call)
-                CallService.delete_mobile_app_call(mobile_call)
-
-                logging.info("Initializing ECS task for diarization.")
-                # Initialize ECS task for speaker diarization
-                # ecs_client = ECSClient()
-                # task_response = ecs_client.run_speaker_diarization_task(job_id=job.id)
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer rpa_2BLBUZNNJ8ME90LK3OA517U24ZTT4EP4WQ9LPYLR13nqf3"
-                }
-                payload = {
-                    "input": {
-                        "job_id": str(job.id),
-                    }
-                }
-                runpod_diarization_url = os.getenv("RUNPOD_DIARIZATION_URL")
-                if runpod_diarization_url:
-                    response = requests.post(
-                        runpod_diarization_url, headers=headers, data=json.dumps(payload)
-                    )
-                    if response.status_code == 200:
-                        result = response.json()
-                        logging.info(f"Successfully started diarization: {str(result)}")
-                    else:
-                        logging.error(f"Error in starting diarization: {response.status_code}, {response.text}")
-                else:
-                    logging.error("RUNPOD_DIARIZATION_URL environment variable not set")
-
-                logging.info(f"Initialized task for diarization for meeting ID: {meeting.id}")
-            else:
-                logging.info(
-                    f"No matching Exotel call found. Mobile call saved for future reconciliation with id: {mobile_call.id}"
-                )
+            calls.append({
+                "mobile_app_call_id": item.get("appCallId"),
+                "buyer_number": buyer_number,
+                "seller_number": seller_number,
+                "call_type": call_type_str,
+                "status": call_status,
+                "start_time": start_time,
+                "end_time": end_time,
+                "duration": int(duration) if duration else 0,
+                "user_id": seller_id
+            })
+
+        new_calls = _drop_duplicate_app_calls(calls)
+        if not new_calls:
+            logging.info("No new app call logs to process")
+            return jsonify(
+                {"message": f"Mobile app call records processed successfully."}
+            ), 200
+
+        # 1. Create all mobile app call records in one transaction
+        logging.info(f"Creating {len(new_calls)} app call records")
+        mobile_calls = CallService.create_mobile_app_calls(new_calls)
+
+        # 2. Match them against pending Exotel calls off the request thread
+        enqueue_mobile_app_call_reconciliation([mobile_call.id for mobile_call in mobile_calls])
 
         logging.info("Successfully processed all app call logs")
         return jsonify(
             {"message": f"Mobile app call records processed successfully."}
         ), 200
     except Exception as e:
-        logging.error("Failed to process app call records %s", traceback.format_exc())
+        logging.exception("Failed to process app call records")
         db.session.rollback()  # Rollback in case of any error
         return jsonify({"error": f"Failed to process app call record: {str(e)}"}), 500
+
+
+def _parse_exotel_time(value):
+    """Parse an Exotel timestamp ('2024-05-01 10:15:00') as IST; fromisoformat avoids strptime's format parsing."""
+    return datetime.fromisoformat(value).replace(tzinfo=IST)
+
+
+def _parse_app_call_time(value):
+    """Parse an app call timestamp ('2024-05-01T10:15:00', optionally 'Z'-suffixed) as IST."""
+    return datetime.fromisoformat(value.replace("Z", "")).replace(tzinfo=IST)
+
+
+def _drop_duplicate_app_calls(calls):
+    """
+    Drop calls that duplicate a stored app call, or an earlier call in the same
+    payload: same seller and buyer, start times within CallService.DUPLICATE_CALL_WINDOW.
+    Stored calls for the whole payload are fetched with one query.
+    """
+    if not calls:
+        return []
+    window = CallService.DUPLICATE_CALL_WINDOW
+    existing = CallService.get_mobile_app_calls_in_window(
+        list({call["seller_number"] for call in calls}),
+        min(call["start_time"] for call in calls) - window,
+        max(call["start_time"] for call in calls) + window
+    )
+
+    seen = {}
+    for record in existing:
+        seen.setdefault((record.seller_number, record.buyer_number), []).append(record.start_time)
+
+    new_calls = []
+    for call in calls:
+        key = (call["seller_number"], call["buyer_number"])
+        start_time = call["start_time"]
+        if any(abs(start_time - seen_start) <= window for seen_start in seen.get(key, ())):
+            logging.info(f"Duplicate call found: seller={call['seller_number']}, buyer={call['buyer_number']}, "
+                         f"start_time={start_time}. Skipping processing.")
+            continue
+        seen.setdefault(key, []).append(start_time)
+        new_calls.append(call)
+    return new_calls
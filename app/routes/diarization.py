@@ -1,9 +1,8 @@
 import logging
-import traceback
 
 from flask import Blueprint, request, jsonify
 
-from app.external.aws.ecs_client import ECSClient
+from app.external.aws.ecs_client import get_ecs_client
 from app.services import JobService
 
 logging = logging.getLogger(__name__)
@@ -29,8 +28,7 @@ def retry_diarization():
             return jsonify({"error": "Job not found"}), 404
 
         # Initialize ECS task for speaker diarization
-        ecs_client = ECSClient()
-        task_response = ecs_client.run_speaker_diarization_task(job_id=job_id)
+        task_response = get_ecs_client().run_speaker_diarization_task(job_id=job_id)
 
         return jsonify({
             "message": "Recording received and ECS speaker diarization task started",
@@ -38,6 +36,5 @@ def retry_diarization():
             "ecs_task_response": task_response
         }), 200
     except Exception as e:
-        logging.error(f"Failed to retry diarization: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to retry diarization")
         return {"error": f"failed to create account. Error - {e}"}
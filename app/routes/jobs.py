@@ -1,5 +1,4 @@
 import logging
-import traceback
 from flask import Blueprint, jsonify, request
 
 from app.services import JobService
@@ -31,8 +30,7 @@ def get_job_by_meeting(meeting_id):
         }), 200
         
     except Exception as e:
-        logging.error(f"Failed to get job by meeting {meeting_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to get job by meeting %s", meeting_id)
         return jsonify({"error": f"Failed to get job: {str(e)}"}), 500
 
 
@@ -80,8 +78,7 @@ def update_job_status():
         }), 200
         
     except Exception as e:
-        logging.error(f"Failed to update job status: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to update job status")
         return jsonify({"error": f"Failed to update job status: {str(e)}"}), 500
 
 
@@ -105,8 +102,7 @@ def get_job_status(job_id):
         }), 200
         
     except Exception as e:
-        logging.error(f"Failed to get job status: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to get job status")
         return jsonify({"error": f"Failed to get job status: {str(e)}"}), 500
 
 
@@ -130,8 +126,7 @@ def get_job_audio_url(job_id):
         }), 200
         
     except Exception as e:
-        logging.error(f"Failed to get audio URL for job {job_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to get audio URL for job %s", job_id)
         return jsonify({"error": f"Failed to get audio URL: {str(e)}"}), 500
 
 
@@ -174,8 +169,7 @@ def update_meeting_transcription(job_id):
         }), 200
         
     except Exception as e:
-        logging.error(f"Failed to update meeting transcription for job {job_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to update meeting transcription for job %s", job_id)
         return jsonify({"error": f"Failed to update meeting transcription: {str(e)}"}), 500
 
 
@@ -262,6 +256,5 @@ def get_job_context(job_id):
         return jsonify(context), 200
         
     except Exception as e:
-        logging.error(f"Failed to get context for job {job_id}: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to get context for job %s", job_id)
         return jsonify({"error": f"Failed to get context: {str(e)}"}), 500
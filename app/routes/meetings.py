@@ -1,4 +1,3 @@
-import traceback
 from typing import Union
 
 import logging
@@ -31,8 +30,7 @@ def get_upcoming_meetings(user_id):
         # schedule_jobs(events)
         return jsonify([])
     except Exception as e:
-        logging.error(f"Failed to get upcoming meetings: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to get upcoming meetings")
         return jsonify({"error": f"failed to create account. Error - {e}"})
 
 
@@ -78,7 +76,7 @@ def get_meeting_history():
         return jsonify(call_history), 200
 
     except Exception as e:
-        logging.error("Failed to fetch call history: %s", traceback.format_exc())
+        logging.exception("Failed to fetch call history")
         return jsonify({"error": f"Failed to fetch call history: {str(e)}"}), 500
 
 
@@ -136,8 +134,7 @@ def get_meeting_by_id(meeting_id):
         return jsonify(meeting_dict), 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch call data: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch call data")
         return jsonify({"error": f"Failed to fetch meeting: {str(e)}"}), 500
 
 
@@ -160,8 +157,7 @@ def get_meeting_feedback_by_id(meeting_id):
         return jsonify(result), 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch meeting feedback: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch meeting feedback")
         return jsonify({"error": f"Failed to fetch meeting: {str(e)}"}), 500
 
 
@@ -183,8 +179,7 @@ def get_meeting_transcription_by_id(meeting_id):
         return jsonify(result), 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch meeting transcription data: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch meeting transcription data")
         return jsonify({"error": f"Failed to fetch meeting transcription: {str(e)}"}), 500
 
 
@@ -257,8 +252,7 @@ def get_last_synced_call_timestamp():
             return jsonify({"message": "No synced calls found", "last_synced_call_timestamp": None}), 200
 
     except Exception as e:
-        logging.error(f"Failed to fetch last synced call timestamp: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Failed to fetch last synced call timestamp")
         return jsonify({"error": f"Failed to fetch last synced call timestamp: {str(e)}"}), 500
 
 
@@ -418,9 +412,8 @@ def update_meeting_summary(meeting_id):
             else:
                 logging.info(f"[UPDATE_SUMMARY] No actions to create for meeting {meeting_id}")
 
-        except Exception as update_error:
-            logging.error(f"[UPDATE_SUMMARY] Transaction failed for meeting {meeting_id}: {update_error}")
-            logging.error(f"[UPDATE_SUMMARY] Transaction error traceback: {traceback.format_exc()}")
+        except Exception:
+            logging.exception("[UPDATE_SUMMARY] Transaction failed for meeting %s", meeting_id)
             # If we had a partial success (meeting updated but actions failed), 
             # this could lead to inconsistent state. The BaseService handles rollback.
             raise
@@ -439,6 +432,5 @@ def update_meeting_summary(meeting_id):
         return jsonify(response), 200
 
     except Exception as e:
-        logging.error(f"[UPDATE_SUMMARY] Fatal error for meeting_id {meeting_id}: {e}")
-        logging.error(f"[UPDATE_SUMMARY] Full traceback: {traceback.format_exc()}")
+        logging.exception("[UPDATE_SUMMARY] Fatal error for meeting_id %s", meeting_id)
         return jsonify({"error": f"Failed to update meeting analysis: {str(e)}"}), 500
@@ -1,4 +1,3 @@
-import traceback
 import logging
 
 from flask import Blueprint, request, jsonify
@@ -75,9 +74,8 @@ def create_call_performance_metrics(meeting_id):
     except ValueError as e:
         logging.error(f"Validation error in create_call_performance_metrics: {str(e)}")
         return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        logging.error(f"Unexpected error in create_call_performance_metrics: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Unexpected error in create_call_performance_metrics")
         return jsonify({"error": "Internal server error occurred"}), 500
 
 
@@ -118,9 +116,8 @@ def get_call_performance_metrics(meeting_id):
             "performance": performance_summary
         }), 200
         
-    except Exception as e:
-        logging.error(f"Error in get_call_performance_metrics: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Error in get_call_performance_metrics")
         return jsonify({"error": "Internal server error occurred"}), 500
 
 
@@ -158,9 +155,8 @@ def delete_call_performance_metrics(meeting_id):
         else:
             return jsonify({"message": "No performance data found for this meeting"}), 404
         
-    except Exception as e:
-        logging.error(f"Error in delete_call_performance_metrics: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Error in delete_call_performance_metrics")
         return jsonify({"error": "Internal server error occurred"}), 500
 
 
@@ -257,9 +253,8 @@ def get_user_performance_metrics(user_id):
     except ValueError as e:
         logging.error(f"Validation error in get_user_performance_metrics: {str(e)}")
         return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        logging.error(f"Unexpected error in get_user_performance_metrics: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Unexpected error in get_user_performance_metrics")
         return jsonify({"error": "Internal server error occurred"}), 500
 
 
@@ -348,7 +343,6 @@ def get_user_performance_calls(user_id):
     except ValueError as e:
         logging.error(f"Validation error in get_user_performance_calls: {str(e)}")
         return jsonify({"error": str(e)}), 400
-    except Exception as e:
-        logging.error(f"Unexpected error in get_user_performance_calls: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logging.exception("Unexpected error in get_user_performance_calls")
         return jsonify({"error": "Internal server error occurred"}), 500
@@ -1,5 +1,4 @@
 import logging
-import traceback
 
 from flask import Blueprint, jsonify, request
 
@@ -0,0 +1 @@
+from .buyer import BuyerProductsResponse, BuyerProfileResponse, BuyerUpdateRequest, CreatedBuyerResponse
@@ -0,0 +1,97 @@
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.models.buyer import Buyer
+
+
+# Slotted dataclasses are encoded natively by the orjson JSON provider (UUIDs
+# included), so routes return them from jsonify() without building dicts.
+
+@dataclass(slots=True)
+class BuyerProfileResponse:
+    id: uuid.UUID
+    phone: Optional[str]
+    name: Optional[str]
+    email: Optional[str]
+    risks: Any
+    products_discussed: Any
+    key_highlights: Any
+
+    @classmethod
+    def from_buyer(cls, buyer: Buyer, products_discussed: Any) -> "BuyerProfileResponse":
+        return cls(
+            buyer.id,
+            buyer.phone_display,
+            buyer.name,
+            buyer.email,
+            buyer.risks,
+            products_discussed,
+            buyer.key_highlights,
+        )
+
+
+@dataclass(slots=True)
+class CreatedBuyerResponse:
+    id: uuid.UUID
+    name: Optional[str]
+    phone: Optional[str]
+    email: Optional[str]
+    company_name: Optional[str]
+    agency_id: str
+    risks: Any
+    products_discussed: Any
+    key_highlights: Any
+
+    @classmethod
+    def from_buyer(cls, buyer: Buyer, agency_id: str) -> "CreatedBuyerResponse":
+        return cls(
+            buyer.id,
+            buyer.name,
+            buyer.phone_display,
+            buyer.email,
+            buyer.company_name,
+            agency_id,
+            buyer.risks,
+            buyer.products_discussed,
+            buyer.key_highlights,
+        )
+
+
+@dataclass(slots=True)
+class BuyerProductsResponse:
+    id: uuid.UUID
+    products_discussed: Any
+
+
+@dataclass(slots=True)
+class BuyerUpdateRequest:
+    """
+    Validated body of PUT /api/buyers/profile/<buyer_id>.
+
+    Every field is an optional JSON object or list; unknown fields are rejected.
+    """
+    risks: Any = None
+    products_discussed: Any = None
+    key_highlights: Any = None
+
+    ALLOWED_FIELDS = frozenset({'risks', 'products_discussed', 'key_highlights'})
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "BuyerUpdateRequest":
+        """
+        Build an update request from a decoded JSON body.
+
+        Raises:
+            ValueError: If the body has unknown fields or a field isn't a JSON object/list
+        """
+        if not data.keys() <= cls.ALLOWED_FIELDS:
+            raise ValueError(f"Invalid fields: {', '.join(sorted(data.keys() - cls.ALLOWED_FIELDS))}")
+        for field, value in data.items():
+            if value is not None and not isinstance(value, (dict, list)):
+                raise ValueError(f"Field '{field}' must be a JSON object or list")
+        return cls(**data)
+
+    def to_update_kwargs(self) -> Dict[str, Any]:
+        """Fields that were provided, as keyword arguments for BuyerService.update_buyer_info."""
+        return {field: getattr(self, field) for field in self.ALLOWED_FIELDS if getattr(self, field) is not None}
@@ -1,7 +1,6 @@
 import os
 import logging
 import runpod
-import traceback
 
 # Your diarization function
 from app.external.transcription.speaker_diarization_gemini import run_diarization
@@ -23,8 +22,7 @@ def handler(event):
         run_diarization(job_id)
         return {"status": "success", "job_id": job_id}
     except Exception as e:
-        logger.error("Exception occurred in handler:")
-        logger.error(traceback.format_exc())
+        logger.exception("Exception occurred in handler")
         return {"status": "error", "message": str(e)}
 
 
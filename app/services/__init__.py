@@ -14,6 +14,10 @@ from .product_service import ProductService
 from .token_service import TokenBlocklistService
 from .auth_service import AuthService
 from .call_performance_service import CallPerformanceService
+from .analytics_cache_service import AnalyticsCacheService
+from .buyer_cache_service import BuyerCacheService
+from .reconciliation_lock_service import ReconciliationLockService
+from .reconciliation_task_service import ReconciliationTaskService
 
 __all__ = [
     'BaseService',
@@ -28,5 +32,9 @@ __all__ = [
     'ProductService',
     'TokenBlocklistService',
     'AuthService',
-    'CallPerformanceService'
+    'CallPerformanceService',
+    'AnalyticsCacheService',
+    'BuyerCacheService',
+    'ReconciliationLockService',
+    'ReconciliationTaskService'
 ] 
\ No newline at end of file
@@ -3,10 +3,12 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import contains_eager, joinedload
 
 from app import db
 from app.models.action import Action, ActionStatus
+from app.models.buyer import Buyer
 from app.models.meeting import Meeting
 from app.models.seller import Seller
 from app.utils.call_recording_utils import denormalize_phone_number
@@ -114,12 +116,18 @@ class ActionService(BaseService):
                 seller_ids = [user_id]
                 logging.info(f"Fetching actions for user: {user_id}")
             
-            # Build base query
+            # Build base query; everything _format_action reads is loaded with the
+            # actions instead of lazily per row
             query = (
                 cls.model.query
                 .join(Meeting)
                 .join(Seller)
                 .filter(Seller.id.in_(seller_ids))
+                .options(
+                    contains_eager(cls.model.meeting).contains_eager(Meeting.seller),
+                    contains_eager(cls.model.meeting).joinedload(Meeting.buyer),
+                    joinedload(cls.model.buyer)
+                )
             )
             
             # Optional filter by meeting_id
@@ -169,7 +177,16 @@ class ActionService(BaseService):
             Formatted action dictionary or None if not found
         """
         try:
-            action = cls.model.query.filter_by(id=action_id).first()
+            action = (
+                cls.model.query
+                .filter_by(id=action_id)
+                .options(
+                    joinedload(cls.model.meeting).joinedload(Meeting.seller),
+                    joinedload(cls.model.meeting).joinedload(Meeting.buyer),
+                    joinedload(cls.model.buyer)
+                )
+                .first()
+            )
             
             if not action:
                 logging.warning(f"Action {action_id} not found")
@@ -201,6 +218,11 @@ class ActionService(BaseService):
                 .join(Meeting)
                 .join(Seller)
                 .filter(cls.model.id == action_id, Seller.id == user_id)
+                .options(
+                    contains_eager(cls.model.meeting).contains_eager(Meeting.seller),
+                    contains_eager(cls.model.meeting).joinedload(Meeting.buyer),
+                    joinedload(cls.model.buyer)
+                )
                 .first()
             )
             
@@ -279,6 +301,11 @@ class ActionService(BaseService):
                 .join(Meeting)
                 .join(Seller)
                 .filter(cls.model.id == action_id, Seller.id == user_id)
+                .options(
+                    contains_eager(cls.model.meeting).contains_eager(Meeting.seller),
+                    contains_eager(cls.model.meeting).joinedload(Meeting.buyer),
+                    joinedload(cls.model.buyer)
+                )
                 .first()
             )
             
@@ -454,7 +481,18 @@ class ActionService(BaseService):
             Dictionary with action statistics
         """
         try:
-            query = cls.model.query
+            current_time = datetime.now(ZoneInfo("Asia/Kolkata"))
+            is_pending = cls.model.status == ActionStatus.PENDING
+
+            # Counted in one aggregate row instead of loading every action
+            query = db.session.query(
+                func.count(cls.model.id).label('total'),
+                func.count(cls.model.id).filter(is_pending).label('pending'),
+                func.count(cls.model.id).filter(cls.model.status == ActionStatus.COMPLETED).label('completed'),
+                func.count(cls.model.id).filter(
+                    and_(is_pending, cls.model.due_date < current_time)
+                ).label('overdue')
+            ).select_from(cls.model)
             
             if user_id:
                 query = (
@@ -472,18 +510,12 @@ class ActionService(BaseService):
                     )
                 )
             
-            actions = query.all()
+            counts = query.one()
             
-            # Calculate statistics
-            total_actions = len(actions)
-            pending_actions = len([a for a in actions if a.status == ActionStatus.PENDING])
-            completed_actions = len([a for a in actions if a.status == ActionStatus.COMPLETED])
-            
-            current_time = datetime.now(ZoneInfo("Asia/Kolkata"))
-            overdue_actions = len([
-                a for a in actions 
-                if a.status == ActionStatus.PENDING and a.due_date and a.due_date < current_time
-            ])
+            total_actions = counts.total
+            pending_actions = counts.pending
+            completed_actions = counts.completed
+            overdue_actions = counts.overdue
             
             statistics = {
                 'total_actions': total_actions,
@@ -505,6 +537,8 @@ class ActionService(BaseService):
         """
         Get the count of pending actions for a specific buyer.
         
+        Reads buyers.pending_actions_count, which a trigger on actions keeps current.
+        
         Args:
             buyer_id: Buyer UUID
             
@@ -513,15 +547,10 @@ class ActionService(BaseService):
         """
         try:
             count = (
-                cls.model.query
-                .filter(
-                    and_(
-                        cls.model.buyer_id == buyer_id,
-                        cls.model.status == ActionStatus.PENDING
-                    )
-                )
-                .count()
-            )
+                db.session.query(Buyer.pending_actions_count)
+                .filter(Buyer.id == buyer_id)
+                .scalar()
+            ) or 0
             
             logging.info(f"Found {count} pending actions for buyer {buyer_id}")
             return count
@@ -530,6 +559,47 @@ class ActionService(BaseService):
             logging.error(f"Failed to get pending actions count for buyer {buyer_id}: {str(e)}")
             raise
     
+    @classmethod
+    def get_actions_for_existing_buyer(cls, buyer_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get all actions for a buyer, sorted like get_all_actions_for_buyer, checking that
+        the buyer exists in the same query (buyers LEFT JOIN actions).
+        
+        Args:
+            buyer_id: Buyer UUID
+            
+        Returns:
+            List of formatted action dictionaries (possibly empty), or None if the buyer doesn't exist
+        """
+        try:
+            rows = db.session.execute(
+                select(Buyer, Action)
+                .outerjoin(Action, Action.buyer_id == Buyer.id)
+                .where(Buyer.id == buyer_id)
+                .options(
+                    joinedload(Action.meeting).joinedload(Meeting.seller),
+                    joinedload(Action.meeting).joinedload(Meeting.buyer)
+                )
+                .order_by(Action.status.asc(), Action.due_date.asc())
+            ).all()
+            if not rows:
+                return None
+            
+            result = []
+            for _, action in rows:
+                if action is None:
+                    continue
+                formatted_action = cls._format_action(action)
+                if formatted_action:
+                    result.append(formatted_action)
+            
+            logging.info(f"Retrieved {len(result)} actions for buyer {buyer_id}")
+            return result
+            
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to get actions for buyer {buyer_id}: {str(e)}")
+            raise
+    
     @classmethod
     def get_all_actions_for_buyer(cls, buyer_id: str) -> List[Dict[str, Any]]:
         """
@@ -547,6 +617,10 @@ class ActionService(BaseService):
             actions = (
                 cls.model.query
                 .filter(cls.model.buyer_id == buyer_id)
+                .options(
+                    joinedload(cls.model.meeting).joinedload(Meeting.seller),
+                    joinedload(cls.model.meeting).joinedload(Meeting.buyer)
+                )
                 .order_by(
                     cls.model.status.asc(),  # PENDING comes before COMPLETED
                     cls.model.due_date.asc()
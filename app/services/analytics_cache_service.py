@@ -0,0 +1,140 @@
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import redis
+
+logging = logging.getLogger(__name__)
+
+
+class AnalyticsCacheService:
+    """
+    Redis cache for analytics responses.
+
+    Keys embed a per-seller version counter (SELLER:<id>:v), so bumping the
+    version when a seller gets a new meeting or app call makes every cached
+    response for that seller unreachable without scanning for keys.
+    """
+    PAST_WINDOW_TTL_SECONDS = 24 * 60 * 60  # Windows entirely in the past are immutable
+    LIVE_WINDOW_TTL_SECONDS = 60  # Windows touching "now" can still change
+
+    _cache_client = None
+
+    @classmethod
+    def _get_cache_client(cls):
+        """Get Redis client for analytics caching with lazy initialization."""
+        if cls._cache_client is None:
+            try:
+                cls._cache_client = redis.Redis(
+                    host='localhost',
+                    port=6379,
+                    db=5,  # Separate database for analytics cache
+                    decode_responses=True,
+                    socket_timeout=2,
+                    socket_connect_timeout=2
+                )
+                cls._cache_client.ping()
+                logging.info("Redis cache client initialized for analytics")
+            except Exception as e:
+                logging.warning(f"Redis cache not available for analytics: {e}")
+                cls._cache_client = False  # Mark as unavailable
+        return cls._cache_client if cls._cache_client is not False else None
+
+    @staticmethod
+    def _seller_version_key(seller_id: str) -> str:
+        return f"SELLER:{seller_id}:v"
+
+    @classmethod
+    def get_seller_version(cls, seller_id: str) -> str:
+        """
+        Get the current cache version for a seller.
+
+        Args:
+            seller_id: Seller UUID
+
+        Returns:
+            Version string ("0" if never bumped or Redis is unavailable)
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return "0"
+
+        try:
+            return client.get(cls._seller_version_key(seller_id)) or "0"
+        except Exception as e:
+            logging.error(f"Analytics cache version lookup error: {e}")
+            return "0"
+
+    @classmethod
+    def bump_seller_version(cls, seller_id: str) -> None:
+        """
+        Invalidate all cached analytics for a seller by bumping its version.
+
+        Args:
+            seller_id: Seller UUID
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return
+
+        try:
+            client.incr(cls._seller_version_key(seller_id))
+        except Exception as e:
+            logging.error(f"Failed to bump analytics cache version for seller {seller_id}: {e}")
+
+    @classmethod
+    def build_seller_call_data_key(cls, seller_id: str, start_date: datetime, end_date: datetime) -> str:
+        """
+        Build the cache key for a seller's call data over a date range.
+
+        Args:
+            seller_id: Seller UUID
+            start_date: Range start
+            end_date: Range end
+
+        Returns:
+            Versioned cache key
+        """
+        version = cls.get_seller_version(seller_id)
+        return f"analytics:seller:{seller_id}:v{version}:{start_date.isoformat()}:{end_date.isoformat()}"
+
+    @classmethod
+    def get_cached_response(cls, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached analytics response."""
+        client = cls._get_cache_client()
+        if not client:
+            return None
+
+        try:
+            cached_data = client.get(cache_key)
+            if cached_data:
+                return json.loads(cached_data)
+        except Exception as e:
+            logging.error(f"Analytics cache retrieval error: {e}")
+
+        return None
+
+    @classmethod
+    def cache_response(cls, cache_key: str, data: Dict[str, Any], end_date: datetime) -> None:
+        """
+        Cache an analytics response, with a long TTL if the window is already over.
+
+        Args:
+            cache_key: Key from build_seller_call_data_key
+            data: JSON-serializable response body
+            end_date: Range end, used to pick the TTL
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return
+
+        if end_date < datetime.now(end_date.tzinfo):
+            ttl = cls.PAST_WINDOW_TTL_SECONDS
+        else:
+            ttl = cls.LIVE_WINDOW_TTL_SECONDS
+
+        try:
+            client.setex(cache_key, ttl, json.dumps(data, default=str))
+        except Exception as e:
+            logging.error(f"Analytics cache storage error: {e}")
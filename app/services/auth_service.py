@@ -1,11 +1,11 @@
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
-from flask_jwt_extended import get_jwt_identity, get_jwt
+from flask_jwt_extended import get_jwt_identity, get_jwt, create_access_token, create_refresh_token
 
 from app import db
 from app.models.seller import Seller
-from app.utils.auth_utils import generate_secure_otp, send_otp_email, generate_user_claims, send_password_reset_confirmation_email
+from app.utils.auth_utils import generate_secure_otp, queue_otp_email, generate_user_claims, queue_password_reset_confirmation_email, USER_CLAIM_KEYS
 from app.services.seller_service import SellerService
 from app.services.token_service import TokenBlocklistService
 
@@ -82,7 +82,8 @@ class AuthService:
                 expires_delta=timedelta(minutes=15), 
                 additional_claims=user_claims
             )
-            refresh_token = user.generate_refresh_token()
+            # Claims ride on the refresh token too, so /refresh can mint without a DB lookup
+            refresh_token = user.generate_refresh_token(additional_claims=user_claims)
             
             tokens = {
                 'access_token': access_token,
@@ -98,6 +99,56 @@ class AuthService:
             logging.error(f"Failed to generate tokens for user {user.email}: {str(e)}")
             return None
     
+    @classmethod
+    def mint_tokens_from_claims(cls, claims: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        Mint new tokens straight from verified refresh-token claims, without a DB lookup.
+        The new refresh token keeps the original token's expiry, so the seller is
+        loaded again (at login) at least once per refresh-token lifetime and a
+        deleted seller or changed role/agency can't be carried forward indefinitely.
+        
+        Args:
+            claims: Decoded refresh token (from get_jwt())
+            
+        Returns:
+            Dictionary with new tokens, or None if the token predates embedded user claims
+            or has no time left
+        """
+        try:
+            if any(key not in claims for key in USER_CLAIM_KEYS):
+                return None
+            
+            remaining = datetime.fromtimestamp(claims["exp"]) - datetime.now()
+            if remaining <= timedelta(0):
+                return None
+            
+            user_claims = {key: claims[key] for key in USER_CLAIM_KEYS}
+            access_expires = min(timedelta(minutes=15), remaining)
+            access_token = create_access_token(
+                identity=claims["sub"],
+                expires_delta=access_expires,
+                additional_claims=user_claims
+            )
+            refresh_token = create_refresh_token(
+                identity=claims["sub"],
+                expires_delta=remaining,
+                additional_claims=user_claims
+            )
+            
+            tokens = {
+                'access_token': access_token,
+                'refresh_token': refresh_token,
+                'token_type': 'Bearer',
+                'expires_in': int(access_expires.total_seconds())
+            }
+            
+            logging.info(f"Minted tokens from refresh claims for user: {claims['user_email']}")
+            return tokens
+            
+        except Exception as e:
+            logging.error(f"Failed to mint tokens from claims: {str(e)}")
+            return None
+    
     @classmethod
     def refresh_user_tokens(cls, user_id: str) -> Optional[Dict[str, str]]:
         """
@@ -141,11 +192,13 @@ class AuthService:
             True if logout successful, False otherwise
         """
         try:
+            expires_at = None
             # Get token ID if not provided
             if not jti:
                 try:
                     jwt_data = get_jwt()
                     jti = jwt_data.get("jti")
+                    expires_at = jwt_data.get("exp")
                     if not jti:
                         logging.error("No JTI found in JWT token")
                         return False
@@ -153,8 +206,9 @@ class AuthService:
                     logging.error(f"Failed to get JWT from request: {str(e)}")
                     return False
             
-            # Add token to blocklist
-            TokenBlocklistService.add_token_to_blocklist(jti)
+            # Queue the token for a batched blocklist insert; write it directly if Redis is down
+            if not TokenBlocklistService.enqueue_token_for_blocklist(jti, expires_at):
+                TokenBlocklistService.add_token_to_blocklist(jti)
             
             logging.info(f"User logged out successfully, token {jti} blocklisted")
             return True
@@ -221,10 +275,10 @@ class AuthService:
             # Generate OTP
             otp = generate_secure_otp()
             
-            # Send OTP email
-            email_sent = send_otp_email(email, otp)
+            # Queue OTP email on the shared email worker
+            email_sent = queue_otp_email(email, otp)
             if not email_sent:
-                logging.error(f"Failed to send OTP email to: {email}")
+                logging.error(f"Failed to queue OTP email to: {email}")
                 return None
             
             logging.info(f"OTP generated and sent to: {email}")
@@ -312,10 +366,10 @@ class AuthService:
                 logging.error(f"Failed to reset password for user: {email}")
                 return False
             
-            # Send confirmation email
-            email_sent = send_password_reset_confirmation_email(user.email, user.name)
+            # Queue confirmation email on the shared email worker
+            email_sent = queue_password_reset_confirmation_email(user.email, user.name)
             if not email_sent:
-                logging.warning(f"Password reset successful but confirmation email failed for: {email}")
+                logging.warning(f"Password reset successful but confirmation email could not be queued for: {email}")
                 # Still return True since password was reset successfully
                 
             logging.info(f"Password reset completed successfully for user: {email}")
@@ -357,10 +411,10 @@ class AuthService:
                 logging.error(f"Failed to reset password for user: {email}")
                 return False
             
-            # Send confirmation email
-            email_sent = send_password_reset_confirmation_email(user.email, user.name)
+            # Queue confirmation email on the shared email worker
+            email_sent = queue_password_reset_confirmation_email(user.email, user.name)
             if not email_sent:
-                logging.warning(f"Password reset successful but confirmation email failed for: {email}")
+                logging.warning(f"Password reset successful but confirmation email could not be queued for: {email}")
                 # Still return True since password was reset successfully
                 
             logging.info(f"Password reset completed successfully for user: {email}")
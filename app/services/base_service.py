@@ -57,7 +57,7 @@ class BaseService:
             raise NotImplementedError("Model not set in service class")
             
         try:
-            instance = cls.model.query.get(record_id)
+            instance = db.session.get(cls.model, record_id)
             if instance:
                 logging.info(f"Found {cls.model.__name__} with ID: {record_id}")
             else:
@@ -0,0 +1,179 @@
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+import redis
+
+logging = logging.getLogger(__name__)
+
+
+class BuyerCacheService:
+    """
+    Redis cache for buyer list and buyer detail responses.
+
+    List keys embed a per-agency version counter (AGENCY:<id>:buyers:v); bumping
+    it on any buyer write makes every cached page for that agency unreachable
+    without scanning for keys. Detail sections are cached per buyer under
+    buyer:<id>:<section> and deleted on that buyer's writes.
+    """
+    AGENCY_LIST_TTL_SECONDS = 60
+    BUYER_SECTION_TTL_SECONDS = 300
+
+    _cache_client = None
+
+    @classmethod
+    def _get_cache_client(cls):
+        """Get Redis client for buyer caching with lazy initialization."""
+        if cls._cache_client is None:
+            try:
+                cls._cache_client = redis.Redis(
+                    host='localhost',
+                    port=6379,
+                    db=6,  # Separate database for buyer cache
+                    socket_timeout=2,
+                    socket_connect_timeout=2
+                )
+                cls._cache_client.ping()
+                logging.info("Redis cache client initialized for buyers")
+            except Exception as e:
+                logging.warning(f"Redis cache not available for buyers: {e}")
+                cls._cache_client = False  # Mark as unavailable
+        return cls._cache_client if cls._cache_client is not False else None
+
+    @staticmethod
+    def _agency_version_key(agency_id: str) -> str:
+        return f"AGENCY:{agency_id}:buyers:v"
+
+    @classmethod
+    def bump_agency_version(cls, agency_id: str) -> None:
+        """
+        Invalidate all cached buyer lists for an agency by bumping its version.
+
+        Args:
+            agency_id: Agency UUID
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return
+
+        try:
+            client.incr(cls._agency_version_key(str(agency_id)))
+        except Exception as e:
+            logging.error(f"Failed to bump buyer cache version for agency {agency_id}: {e}")
+
+    @classmethod
+    def build_agency_list_key(cls, agency_id: str, page: int, limit: int, cursor: Optional[str]) -> Optional[str]:
+        """
+        Build the cache key for one page of an agency's buyer list.
+
+        Returns:
+            Versioned cache key, or None if Redis is unavailable
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return None
+
+        try:
+            version = (client.get(cls._agency_version_key(agency_id)) or b"0").decode()
+        except Exception as e:
+            logging.error(f"Buyer cache version lookup error: {e}")
+            return None
+        position = f"c:{cursor}" if cursor else f"p:{page}"
+        return f"buyers:agency:{agency_id}:v{version}:{position}:{limit}"
+
+    @classmethod
+    def get_cached_body(cls, cache_key: Optional[str]) -> Optional[bytes]:
+        """
+        Get a cached buyer list response as the orjson-encoded bytes it was
+        stored as, so hits can be sent without decoding and re-encoding.
+        """
+        client = cls._get_cache_client()
+        if not client or not cache_key:
+            return None
+
+        try:
+            return client.get(cache_key)
+        except Exception as e:
+            logging.error(f"Buyer cache retrieval error: {e}")
+
+        return None
+
+    @classmethod
+    def cache_response(cls, cache_key: Optional[str], data: Dict[str, Any],
+                       ttl: int = AGENCY_LIST_TTL_SECONDS) -> None:
+        """Cache a JSON-serializable buyer list response."""
+        client = cls._get_cache_client()
+        if not client or not cache_key:
+            return
+
+        try:
+            client.setex(cache_key, ttl, orjson.dumps(data))
+        except Exception as e:
+            logging.error(f"Buyer cache storage error: {e}")
+
+    @staticmethod
+    def _buyer_section_key(buyer_id: str, section: str) -> str:
+        return f"buyer:{buyer_id}:{section}"
+
+    @classmethod
+    def get_buyer_sections(cls, buyer_id: str, sections: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get cached detail sections for a buyer in one round-trip.
+
+        Args:
+            buyer_id: Buyer UUID
+            sections: Section names, e.g. "profile", "products"
+
+        Returns:
+            Dictionary of the sections that were cached
+        """
+        client = cls._get_cache_client()
+        sections = list(sections)
+        if not client or not sections:
+            return {}
+
+        try:
+            values = client.mget([cls._buyer_section_key(buyer_id, section) for section in sections])
+            return {section: orjson.loads(value) for section, value in zip(sections, values) if value is not None}
+        except Exception as e:
+            logging.error(f"Buyer section cache retrieval error: {e}")
+            return {}
+
+    @classmethod
+    def cache_buyer_sections(cls, buyer_id: str, sections: Dict[str, Any]) -> None:
+        """
+        Cache detail sections for a buyer.
+
+        Args:
+            buyer_id: Buyer UUID
+            sections: Section name to JSON-serializable value
+        """
+        client = cls._get_cache_client()
+        if not client or not sections:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for section, value in sections.items():
+                pipe.setex(cls._buyer_section_key(buyer_id, section), cls.BUYER_SECTION_TTL_SECONDS, orjson.dumps(value))
+            pipe.execute()
+        except Exception as e:
+            logging.error(f"Buyer section cache storage error: {e}")
+
+    @classmethod
+    def invalidate_buyer(cls, buyer_id: str, sections: Iterable[str] = ('profile', 'products')) -> None:
+        """
+        Drop a buyer's cached detail sections.
+
+        Args:
+            buyer_id: Buyer UUID
+            sections: Sections to drop (default: all cached sections)
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return
+
+        try:
+            client.delete(*[cls._buyer_section_key(buyer_id, section) for section in sections])
+        except Exception as e:
+            logging.error(f"Failed to invalidate buyer cache for {buyer_id}: {e}")
@@ -285,10 +285,11 @@ class BuyerSearchService(BaseService):
             # Get suggestions
             suggestions = cls.get_search_suggestions(query, agency_id, suggestion_limit)
             
-            # Format results
+            # Format results; last-contact sellers for the whole page are loaded in one query
+            last_contacted_by = cls._load_last_contacted_by([data['buyer'].id for data in search_results])
             formatted_results = []
             for buyer_data in search_results:
-                formatted_result = cls._format_search_result(buyer_data)
+                formatted_result = cls._format_search_result(buyer_data, last_contacted_by)
                 formatted_results.append(formatted_result)
             
             # Prepare response
@@ -430,9 +431,40 @@ class BuyerSearchService(BaseService):
         return 'name'
     
     @classmethod
-    def _format_search_result(cls, buyer_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _load_last_contacted_by(cls, buyer_ids: List[Any]) -> Dict[Any, str]:
+        """
+        Batch-load the seller name on each buyer's latest meeting.
+        
+        Args:
+            buyer_ids: Buyer UUIDs from one page of results
+            
+        Returns:
+            Mapping of buyer UUID to seller name (buyers without meetings are absent)
+        """
+        if not buyer_ids:
+            return {}
+        try:
+            rows = (
+                db.session.query(Meeting.buyer_id, Seller.name)
+                .join(Seller, Seller.id == Meeting.seller_id)
+                .filter(Meeting.buyer_id.in_(buyer_ids))
+                .distinct(Meeting.buyer_id)
+                .order_by(Meeting.buyer_id, Meeting.start_time.desc())
+                .all()
+            )
+            return {buyer_id: name for buyer_id, name in rows}
+        except SQLAlchemyError as e:
+            logging.error(f"Error loading last contact info for search results: {e}")
+            return {}
+
+    @classmethod
+    def _format_search_result(cls, buyer_data: Dict[str, Any], last_contacted_by: Dict[Any, str]) -> Dict[str, Any]:
         """
         Format a single search result with all required fields.
+        
+        Args:
+            buyer_data: Row from _execute_search_query
+            last_contacted_by: Mapping from _load_last_contacted_by
         """
         buyer = buyer_data['buyer']
         match_score = buyer_data['match_score']
@@ -442,41 +474,26 @@ class BuyerSearchService(BaseService):
         query = buyer_data.get('query', '')
         match_field = cls._determine_match_field(buyer, query)
         
-        # Get last contact information
-        last_contacted_at = None
-        last_contacted_by = None
-        
-        try:
-            # Get the most recent meeting for this buyer
-            latest_meeting = db.session.query(Meeting).filter(
-                Meeting.buyer_id == buyer.id
-            ).order_by(Meeting.start_time.desc()).first()
-            
-            if latest_meeting:
-                last_contacted_at = latest_meeting.start_time
-                if latest_meeting.seller_id:
-                    seller = db.session.query(Seller).get(latest_meeting.seller_id)
-                    last_contacted_by = seller.name if seller else None
-        except Exception as e:
-            logging.error(f"Error getting last contact info for buyer {buyer.id}: {e}")
+        # Last contact comes from the materialized column and the page-level seller lookup
+        last_contacted_at = buyer.last_contacted_at
         
         # Get products discussed with interest levels
         products_discussed = []
         try:
             from app.services.buyer_service import BuyerService
-            products_discussed = BuyerService._calculate_averaged_products_discussed(str(buyer.id))
+            products_discussed = BuyerService.get_products_discussed_summary(str(buyer.id))
         except Exception as e:
             logging.error(f"Error getting products discussed for buyer {buyer.id}: {e}")
         
         return {
             'id': str(buyer.id),
             'name': buyer.name,
-            'phone': denormalize_phone_number(buyer.phone) if buyer.phone else None,
+            'phone': buyer.phone_display,
             'email': buyer.email,
             'company_name': buyer.company_name,
             'products_discussed': products_discussed,
             'last_contacted_at': last_contacted_at.isoformat() if last_contacted_at else None,
-            'last_contacted_by': last_contacted_by,
+            'last_contacted_by': last_contacted_by.get(buyer.id),
             'match_score': round(match_score, 3),
             'match_field': match_field
         }
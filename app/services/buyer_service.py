@@ -1,11 +1,18 @@
+import base64
+import json
 import logging
-from typing import List, Optional, Dict, Any
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import func, or_, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import db
 from app.models.buyer import Buyer
 from app.utils.call_recording_utils import normalize_phone_number
 from .base_service import BaseService
+from .buyer_cache_service import BuyerCacheService
 from app.search.index_helpers import index_buyer
 
 logging = logging.getLogger(__name__)
@@ -17,6 +24,42 @@ class BuyerService(BaseService):
     """
     model = Buyer
     
+    @classmethod
+    def create(cls, **kwargs) -> Buyer:
+        """
+        Create a buyer and invalidate its agency's cached buyer lists.
+        """
+        buyer = super().create(**kwargs)
+        BuyerCacheService.bump_agency_version(buyer.agency_id)
+        return buyer
+
+    @classmethod
+    def update(cls, buyer_id: str, **kwargs) -> Optional[Buyer]:
+        """
+        Update a buyer with a single atomic UPDATE ... RETURNING (no separate
+        SELECT or read-modify-write window) and invalidate its cached detail
+        sections and its agency's cached buyer lists.
+        """
+        try:
+            buyer = db.session.scalars(
+                update(cls.model)
+                .where(cls.model.id == buyer_id)
+                .values(**kwargs)
+                .returning(cls.model)
+                .execution_options(populate_existing=True)
+            ).one_or_none()
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.error(f"Failed to update Buyer with ID {buyer_id}: {str(e)}")
+            raise
+
+        if buyer:
+            logging.info(f"Updated Buyer with ID: {buyer_id}")
+            BuyerCacheService.bump_agency_version(buyer.agency_id)
+            BuyerCacheService.invalidate_buyer(str(buyer_id))
+        return buyer
+
     @classmethod
     def get_by_phone_and_agency(cls, phone: str, agency_id: str) -> Optional[Buyer]:
         """
@@ -72,14 +115,24 @@ class BuyerService(BaseService):
                 logging.info(f"Found existing buyer with phone {normalized_phone} in agency {seller_agency_id}")
                 return buyer
             
-            # Create new buyer if not found
+            # Create new buyer if not found. ON CONFLICT DO NOTHING makes this safe
+            # against a concurrent reconciliation creating the same buyer; the loser
+            # reads the winner's row instead of failing on uq_buyer_phone_agency.
+            # name/email are populated later via LLM or manual entry
             logging.info(f"Creating new buyer with phone {normalized_phone} in agency {seller_agency_id}")
-            buyer = cls.create_buyer(
-                phone=normalized_phone,
-                agency_id=seller_agency_id,
-                name=None,  # Will be populated later via LLM or manual entry
-                email=None  # Will be populated later via LLM or manual entry
-            )
+            buyer = db.session.scalars(
+                pg_insert(Buyer)
+                .values(id=uuid.uuid4(), phone=normalized_phone, agency_id=seller_agency_id)
+                .on_conflict_do_nothing(constraint='uq_buyer_phone_agency')
+                .returning(Buyer)
+            ).first()
+            db.session.commit()
+
+            if not buyer:
+                logging.info(f"Buyer with phone {normalized_phone} in agency {seller_agency_id} created concurrently")
+                return cls.get_by_phone_and_agency(normalized_phone, seller_agency_id)
+
+            BuyerCacheService.bump_agency_version(seller_agency_id)
             try:
                 index_buyer(buyer)
             except Exception as ie:
@@ -88,6 +141,7 @@ class BuyerService(BaseService):
             return buyer
             
         except SQLAlchemyError as e:
+            db.session.rollback()
             logging.error(f"Failed to find or create buyer {buyer_phone}: {str(e)}")
             raise
     
@@ -138,6 +192,78 @@ class BuyerService(BaseService):
             logging.error(f"Failed to create buyer {phone}: {str(e)}")
             raise
     
+    @classmethod
+    def create_buyers_bulk(cls, agency_id: str, buyers: List[Dict[str, Any]]) -> List[Buyer]:
+        """
+        Create many buyers for an agency in one batched INSERT ... RETURNING and one commit.
+        Phones already registered for the agency are skipped (ON CONFLICT DO NOTHING).
+        
+        Args:
+            agency_id: Agency UUID
+            buyers: Dicts with phone (already normalized) and optional name, email,
+                    company_name, risks, products_discussed, key_highlights
+            
+        Returns:
+            List of the Buyer instances that were created
+        """
+        try:
+            rows = [
+                {
+                    'id': uuid.uuid4(),
+                    'phone': buyer['phone'],
+                    'agency_id': agency_id,
+                    'name': buyer.get('name'),
+                    'email': buyer.get('email'),
+                    'company_name': buyer.get('company_name'),
+                    'risks': buyer.get('risks'),
+                    'products_discussed': buyer.get('products_discussed'),
+                    'key_highlights': buyer.get('key_highlights'),
+                }
+                for buyer in buyers
+            ]
+            stmt = (
+                pg_insert(Buyer)
+                .on_conflict_do_nothing(constraint='uq_buyer_phone_agency')
+                .returning(Buyer)
+            )
+            created = db.session.scalars(stmt, rows).all()
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.error(f"Failed to bulk create {len(buyers)} buyers for agency {agency_id}: {str(e)}")
+            raise
+
+        logging.info("Bulk created %d of %d buyers for agency %s", len(created), len(buyers), agency_id)
+        if created:
+            BuyerCacheService.bump_agency_version(agency_id)
+        for buyer in created:
+            try:
+                index_buyer(buyer)
+            except Exception as ie:
+                logging.error(f"Failed to index buyer {buyer.id}: {ie}")
+        return created
+    
+    @classmethod
+    def get_version_state(cls, buyer_id: str) -> Optional[tuple]:
+        """
+        Get only a buyer's agency_id, updated_at and pending_actions_count, for cheap
+        access and conditional-GET checks.
+        pending_actions_count is maintained by a trigger that doesn't touch updated_at.
+        
+        Args:
+            buyer_id: Buyer UUID
+            
+        Returns:
+            (agency_id, updated_at, pending_actions_count), or None if the buyer doesn't exist
+        """
+        try:
+            return db.session.query(
+                cls.model.agency_id, cls.model.updated_at, cls.model.pending_actions_count
+            ).filter(cls.model.id == buyer_id).first()
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to get version state for buyer {buyer_id}: {str(e)}")
+            raise
+
     @classmethod
     def get_by_phone(cls, phone: str) -> Optional[Buyer]:
         """
@@ -171,6 +297,42 @@ class BuyerService(BaseService):
             logging.error(f"Failed to get buyers for agency {agency_id}: {str(e)}")
             raise
     
+    @classmethod
+    def iter_agency_buyers(cls, agency_id: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every buyer in an agency, most recently contacted first, without
+        loading the whole agency into memory (server-side cursor, batch_size rows at a time).
+        
+        Args:
+            agency_id: Agency UUID
+            batch_size: Rows fetched from the database per round-trip
+            
+        Yields:
+            Buyer dicts with display-form phones
+        """
+        stmt = (
+            select(
+                Buyer.id, Buyer.name, Buyer.email, Buyer.phone_display,
+                Buyer.company_name, Buyer.last_contacted_at
+            )
+            .where(Buyer.agency_id == agency_id)
+            .order_by(Buyer.last_contacted_at.desc().nulls_last(), Buyer.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            for row in db.session.execute(stmt):
+                yield {
+                    'id': str(row.id),
+                    'name': row.name,
+                    'email': row.email,
+                    'phone': row.phone_display,
+                    'company_name': row.company_name,
+                    'last_contacted_at': row.last_contacted_at.isoformat() if row.last_contacted_at else None
+                }
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to stream buyers for agency {agency_id}: {str(e)}")
+            raise
+
     @classmethod
     def update_buyer_info(cls, buyer_id: str, name: Optional[str] = None, email: Optional[str] = None,
                          risks: Optional[dict] = None, products_discussed: Optional[dict] = None, 
@@ -206,9 +368,19 @@ class BuyerService(BaseService):
                 logging.warning(f"No update data provided for buyer {buyer_id}")
                 return cls.get_by_id(buyer_id)
             
-            buyer = cls.update(buyer_id, **update_data)
+            buyer = cls.get_by_id(buyer_id)
+            if not buyer:
+                return None
+
+            # Idempotent PUTs skip the write, cache invalidation and re-indexing entirely
+            changes = {field: value for field, value in update_data.items() if getattr(buyer, field) != value}
+            if not changes:
+                logging.info("No changes for buyer %s; skipping update", buyer_id)
+                return buyer
+            
+            buyer = cls.update(buyer_id, **changes)
             if buyer:
-                logging.info(f"Updated buyer {buyer_id} info: {update_data}")
+                logging.info("Updated buyer %s fields: %s", buyer_id, list(changes))
                 try:
                     index_buyer(buyer)
                 except Exception as ie:
@@ -332,137 +504,356 @@ class BuyerService(BaseService):
             logging.error(f"Failed to get buyers with meetings: {str(e)}")
             raise
     
+    @staticmethod
+    def encode_buyer_list_cursor(last_contacted_at: Optional[datetime], buyer_id: Any) -> str:
+        """
+        Encode the position after a buyer in the last-contact ordering as an
+        opaque URL-safe cursor.
+        """
+        payload = {
+            't': last_contacted_at.isoformat() if last_contacted_at else None,
+            'id': str(buyer_id)
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def decode_buyer_list_cursor(cursor: str):
+        """
+        Decode a cursor from encode_buyer_list_cursor.
+        
+        Returns:
+            Tuple of (last_contacted_at or None, buyer UUID)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            last_contacted_at = datetime.fromisoformat(payload['t']) if payload['t'] else None
+            return last_contacted_at, uuid.UUID(payload['id'])
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
     @classmethod
-    def get_buyers_with_last_contact(cls, agency_id: str) -> List[dict]:
+    def record_contact(cls, buyer_id: str, contacted_at: datetime) -> None:
         """
-        Get buyers with their last contact information, sorted by last contacted date.
+        Move a buyer's last_contacted_at forward to contacted_at if it is newer.
+        
+        Args:
+            buyer_id: Buyer UUID
+            contacted_at: Start time of the new meeting
+        """
+        try:
+            agency_id = db.session.execute(
+                update(cls.model)
+                .where(cls.model.id == buyer_id)
+                .values(last_contacted_at=func.greatest(cls.model.last_contacted_at, contacted_at))
+                .returning(cls.model.agency_id)
+            ).scalar()
+            db.session.commit()
+            # The list is ordered by last contact, so the agency's cached pages are stale
+            if agency_id:
+                BuyerCacheService.bump_agency_version(agency_id)
+                BuyerCacheService.invalidate_buyer(str(buyer_id), sections=('profile',))
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to record contact for buyer {buyer_id}: {str(e)}")
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def get_buyers_with_last_contact(cls, agency_id: str, page: int = 1, limit: int = 50,
+                                     cursor: Optional[str] = None) -> dict:
+        """
+        Get a page of buyers with their last contact information, sorted by last
+        contacted date (never-contacted buyers last).
+        
+        Pages are keyset-paginated on (last_contacted_at DESC, id DESC) when a
+        cursor is given, so deep pages cost the same as the first one; page
+        numbers are still accepted for existing clients.
         
         Args:
             agency_id: Agency UUID to filter buyers
+            page: 1-based page number, used when no cursor is given
+            limit: Page size
+            cursor: Opaque cursor from a previous page's pagination.next_cursor
             
         Returns:
-            List of dictionaries with buyer info and last contact details
+            Dictionary with "data" (list of buyer dicts, phones in display form) and "pagination"
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
         try:
             from app.models.meeting import Meeting  # Local import to avoid circular imports
-            from sqlalchemy import func, desc
-            
-            # Subquery to get the latest meeting for each buyer
-            latest_meeting_subquery = db.session.query(
-                Meeting.buyer_id,
-                func.max(Meeting.start_time).label('last_contacted_at')
-            ).group_by(Meeting.buyer_id).subquery()
+            from app.models.seller import Seller
+
+            # Name of the seller on each buyer's latest meeting, resolved in the same
+            # statement (LATERAL ... LIMIT 1 per buyer, served by idx_meetings_buyer_start_time)
+            last_meeting = (
+                select(Seller.name.label('last_contacted_by'))
+                .select_from(Meeting)
+                .join(Seller, Seller.id == Meeting.seller_id)
+                .where(Meeting.buyer_id == cls.model.id)
+                .order_by(Meeting.start_time.desc())
+                .limit(1)
+                .lateral('last_meeting')
+            )
             
-            # Main query to get buyers with their last contact info
+            # Plain column rows, not Buyer entities: this read-only list skips ORM hydration
             query = db.session.query(
-                cls.model,
-                latest_meeting_subquery.c.last_contacted_at,
-                Meeting.seller_id,
-                Meeting.id.label('last_meeting_id')
-            ).outerjoin(
-                latest_meeting_subquery,
-                cls.model.id == latest_meeting_subquery.c.buyer_id
+                cls.model.id,
+                cls.model.name,
+                cls.model.email,
+                cls.model.phone_display,
+                cls.model.products_discussed,
+                cls.model.company_name,
+                cls.model.last_contacted_at,
+                last_meeting.c.last_contacted_by
             ).outerjoin(
-                Meeting,
-                (Meeting.buyer_id == cls.model.id) & 
-                (Meeting.start_time == latest_meeting_subquery.c.last_contacted_at)
+                last_meeting, true()
             ).filter(
                 cls.model.agency_id == agency_id
-            ).order_by(
-                latest_meeting_subquery.c.last_contacted_at.desc().nullslast()
             )
-            
-            results = query.all()
+
+            if cursor:
+                after_last_contacted_at, after_id = cls.decode_buyer_list_cursor(cursor)
+                if after_last_contacted_at is not None:
+                    query = query.filter(or_(
+                        tuple_(cls.model.last_contacted_at, cls.model.id) < (after_last_contacted_at, after_id),
+                        cls.model.last_contacted_at.is_(None)
+                    ))
+                else:
+                    query = query.filter(cls.model.last_contacted_at.is_(None), cls.model.id < after_id)
+
+            query = query.order_by(
+                cls.model.last_contacted_at.desc().nullslast(),
+                cls.model.id.desc()
+            )
+            if not cursor:
+                query = query.offset((page - 1) * limit)
+
+            # One extra row tells us whether there is a next page
+            results = query.limit(limit + 1).all()
+            has_more = len(results) > limit
+            results = results[:limit]
             
             buyers_with_contact = []
-            for buyer, last_contacted_at, seller_id, meeting_id in results:
-                # Get seller name for last contact
-                last_contacted_by = None
-                if seller_id:
-                    from app.models.seller import Seller
-                    seller = Seller.query.get(seller_id)
-                    last_contacted_by = seller.name if seller else None
-                
+            for row in results:
+                last_contacted_at = row.last_contacted_at
                 buyers_with_contact.append({
-                    'id': str(buyer.id),
-                    'name': buyer.name,
-                    'email': buyer.email,
-                    'phone': buyer.phone,
-                    'products_discussed': buyer.products_discussed,
-                    'last_contacted_by': last_contacted_by,
+                    'id': str(row.id),
+                    'name': row.name,
+                    'email': row.email,
+                    'phone': row.phone_display,
+                    'products_discussed': row.products_discussed,
+                    'last_contacted_by': row.last_contacted_by,
                     'last_contacted_at': last_contacted_at.isoformat() if last_contacted_at else None,
-                    'company_name': buyer.company_name
+                    'company_name': row.company_name
                 })
+
+            next_cursor = None
+            if has_more and results:
+                last_row = results[-1]
+                next_cursor = cls.encode_buyer_list_cursor(last_row.last_contacted_at, last_row.id)
             
             logging.info(f"Found {len(buyers_with_contact)} buyers with last contact info for agency {agency_id}")
-            return buyers_with_contact
+            return {
+                'data': buyers_with_contact,
+                'pagination': {
+                    'page': None if cursor else page,
+                    'limit': limit,
+                    'has_more': has_more,
+                    'next_cursor': next_cursor
+                }
+            }
             
         except SQLAlchemyError as e:
             logging.error(f"Failed to get buyers with last contact for agency {agency_id}: {str(e)}")
             raise
     
+    BUNDLE_FIELDS = frozenset({'profile', 'products', 'actions_count'})
+    # Sections cached in Redis; actions_count is a single-column read already
+    CACHED_BUNDLE_FIELDS = frozenset({'profile', 'products'})
+
     @classmethod
-    def get_buyer_with_last_contact(cls, buyer_id: str) -> Optional[dict]:
+    def get_buyer_bundle(cls, buyer_id: str, fields) -> Optional[dict]:
         """
-        Get a single buyer with their last contact information.
+        Load a buyer once and assemble the requested detail sections.
         
         Args:
             buyer_id: Buyer UUID
+            fields: Subset of BUNDLE_FIELDS: "profile" (buyer fields plus last
+                contact), "products" (products discussed across meetings) and
+                "actions_count" (pending actions)
             
         Returns:
-            Dictionary with buyer info and last contact details, or None if not found
+            Dictionary keyed by the requested fields, or None if the buyer doesn't exist
         """
         try:
-            from app.models.meeting import Meeting  # Local import to avoid circular imports
-            from sqlalchemy import func, desc
-            
-            # Get the buyer first
+            bundle = BuyerCacheService.get_buyer_sections(buyer_id, fields & cls.CACHED_BUNDLE_FIELDS)
+            missing = fields - bundle.keys()
+            if not missing:
+                return bundle
+
             buyer = cls.get_by_id(buyer_id)
             if not buyer:
                 return None
+
+            computed = {}
+            if 'profile' in missing:
+                computed['profile'] = cls._build_buyer_profile(buyer)
+            if 'products' in missing:
+                computed['products'] = cls.get_products_discussed_summary(buyer_id)
+            BuyerCacheService.cache_buyer_sections(buyer_id, computed)
+            if 'actions_count' in missing:
+                # Trigger-maintained counter on the already-loaded row
+                computed['actions_count'] = buyer.pending_actions_count
+
+            bundle.update(computed)
+            return bundle
+
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to get buyer bundle for {buyer_id}: {str(e)}")
+            raise
+
+    @classmethod
+    def get_buyer_with_last_contact(cls, buyer_id: str) -> Optional[dict]:
+        """
+        Get a single buyer with their last contact information.
+        
+        Args:
+            buyer_id: Buyer UUID
             
-            # Get the latest meeting for this buyer
-            latest_meeting = db.session.query(
-                Meeting
-            ).filter(
-                Meeting.buyer_id == buyer_id
-            ).order_by(
-                desc(Meeting.start_time)
-            ).first()
-            
-            # Get seller name for last contact
-            last_contacted_by = None
-            last_contacted_at = None
-            
-            if latest_meeting and latest_meeting.seller_id:
-                from app.models.seller import Seller
-                seller = Seller.query.get(latest_meeting.seller_id)
-                last_contacted_by = seller.name if seller else None
-                last_contacted_at = latest_meeting.start_time
-            
-            # Compute products_discussed from all meetings' detected_products for this buyer
-            computed_products_discussed: List[Dict[str, Any]] = cls._compute_products_discussed_from_buyer_meetings(buyer_id)
+        Returns:
+            Dictionary with buyer info and last contact details, or None if not found
+        """
+        bundle = cls.get_buyer_bundle(buyer_id, frozenset({'profile'}))
+        return bundle['profile'] if bundle else None
 
-            buyer_with_contact = {
-                'id': str(buyer.id),
-                'name': buyer.name,
-                'email': buyer.email,
-                'phone': buyer.phone,
-                'risks': buyer.risks,
-                # Use computed products discussed based on meetings rather than raw buyer field
-                'products_discussed': computed_products_discussed,
-                'key_highlights': buyer.key_highlights,
-                'last_contacted_by': last_contacted_by,
-                'last_contacted_at': last_contacted_at.isoformat() if last_contacted_at else None,
-                'company_name': buyer.company_name
-            }
+    @classmethod
+    def _build_buyer_profile(cls, buyer: Buyer) -> dict:
+        """
+        Build the profile dictionary (buyer fields plus last contact) for a loaded buyer.
+        """
+        from app.models.meeting import Meeting  # Local import to avoid circular imports
+        from sqlalchemy import desc
+
+        buyer_id = str(buyer.id)
+
+        # Get the latest meeting for this buyer
+        latest_meeting = db.session.query(
+            Meeting
+        ).filter(
+            Meeting.buyer_id == buyer.id
+        ).order_by(
+            desc(Meeting.start_time)
+        ).first()
+        
+        # Get seller name for last contact
+        last_contacted_by = None
+        last_contacted_at = None
+        
+        if latest_meeting and latest_meeting.seller_id:
+            from app.models.seller import Seller
+            seller = db.session.get(Seller, latest_meeting.seller_id)
+            last_contacted_by = seller.name if seller else None
+            last_contacted_at = latest_meeting.start_time
+        
+        # Products discussed across all meetings, read from the materialized column
+        computed_products_discussed: List[Dict[str, Any]] = cls.get_products_discussed_summary(buyer_id)
+
+        buyer_with_contact = {
+            'id': buyer_id,
+            'name': buyer.name,
+            'email': buyer.email,
+            'phone': buyer.phone_display,
+            'risks': buyer.risks,
+            # Use computed products discussed based on meetings rather than raw buyer field
+            'products_discussed': computed_products_discussed,
+            'key_highlights': buyer.key_highlights,
+            'last_contacted_by': last_contacted_by,
+            'last_contacted_at': last_contacted_at.isoformat() if last_contacted_at else None,
+            'company_name': buyer.company_name
+        }
+        
+        logging.info(f"Found buyer {buyer_id} with last contact info")
+        return buyer_with_contact
+
+    @classmethod
+    def get_products_discussed_summary(cls, buyer_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the products discussed across all of a buyer's meetings.
+        
+        Reads the materialized avg_products_discussed column. Buyers that
+        haven't been materialized yet (see `flask backfill-products-discussed`)
+        are computed from their meetings without storing the result, so reads
+        never write.
+        
+        Args:
+            buyer_id: Buyer UUID
             
-            logging.info(f"Found buyer {buyer_id} with last contact info")
-            return buyer_with_contact
+        Returns:
+            List of dictionaries with keys "product_name" and "product_id"
+        """
+        buyer = cls.get_by_id(buyer_id)
+        if not buyer:
+            return []
+        if buyer.avg_products_discussed is not None:
+            return buyer.avg_products_discussed
+        return cls._compute_products_discussed_from_buyer_meetings(buyer_id)
+
+    @classmethod
+    def refresh_products_discussed_summary(cls, buyer_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Recompute a buyer's products discussed from its meetings and store the
+        result in avg_products_discussed. If the recompute fails, the stored
+        value is left as it was.
+        
+        Args:
+            buyer_id: Buyer UUID
             
+        Returns:
+            The recomputed list of products, or None if it couldn't be recomputed or stored
+        """
+        try:
+            products = cls._compute_products_discussed_from_buyer_meetings(buyer_id)
+            cls.update(buyer_id, avg_products_discussed=products)
+            return products
         except SQLAlchemyError as e:
-            logging.error(f"Failed to get buyer with last contact for {buyer_id}: {str(e)}")
-            raise
+            db.session.rollback()
+            logging.error(f"Failed to refresh products_discussed summary for buyer {buyer_id}: {str(e)}")
+            return None
+
+    @classmethod
+    def backfill_products_discussed_summaries(cls, batch_size: int = 500) -> int:
+        """
+        Materialize avg_products_discussed for every buyer that doesn't have it yet.
+        Safe to re-run; buyers whose recompute fails stay NULL for the next run.
+        
+        Args:
+            batch_size: Buyers read per batch
+            
+        Returns:
+            Number of buyers filled in
+        """
+        filled = 0
+        failed_ids = set()
+        while True:
+            query = db.session.query(cls.model.id).filter(cls.model.avg_products_discussed.is_(None))
+            if failed_ids:
+                query = query.filter(cls.model.id.notin_(failed_ids))
+            try:
+                buyer_ids = [str(buyer_id) for (buyer_id,) in query.limit(batch_size)]
+            except SQLAlchemyError as e:
+                logging.error(f"Failed to list buyers for the products_discussed backfill: {str(e)}")
+                raise
+            if not buyer_ids:
+                return filled
+            for buyer_id in buyer_ids:
+                if cls.refresh_products_discussed_summary(buyer_id) is None:
+                    failed_ids.add(buyer_id)
+                else:
+                    filled += 1
 
     @classmethod
     def _compute_products_discussed_from_buyer_meetings(cls, buyer_id: str) -> List[Dict[str, Any]]:
@@ -546,6 +937,6 @@ class BuyerService(BaseService):
             return unique_products
 
         except SQLAlchemyError as e:
+            # Raised rather than returned as [], which would read as (and be stored as) no products
             logging.error(f"Failed to compute products_discussed from meetings for buyer {buyer_id}: {str(e)}")
-            # On error, fall back to empty list to avoid breaking the endpoint
-            return []
+            raise
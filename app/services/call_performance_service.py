@@ -40,7 +40,7 @@ class CallPerformanceService(BaseService):
         """
         try:
             # Validate that meeting exists
-            meeting = Meeting.query.get(meeting_id)
+            meeting = db.session.get(Meeting, meeting_id)
             if not meeting:
                 raise ValueError(f"Meeting with ID {meeting_id} not found")
             
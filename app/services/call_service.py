@@ -3,25 +3,64 @@ from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app import db
 from app.models.exotel_calls import ExotelCall
+from app.models.exotel_call_deliveries import ExotelCallDelivery
 from app.models.mobile_app_calls import MobileAppCall
 from app.utils.call_recording_utils import normalize_phone_number, calculate_call_status
 from app.constants import MobileAppCallStatus
 from .base_service import BaseService
+from .analytics_cache_service import AnalyticsCacheService
 from app.search.index_helpers import index_mobile_app_call
 
 logging = logging.getLogger(__name__)
 
 
+class ReconciliationClaimConflict(Exception):
+    """A matched call pair is locked by another worker; retry the reconciliation."""
+
+
 class CallService(BaseService):
     """
     Service class for call record management (both ExotelCall and MobileAppCall).
     This service doesn't inherit from BaseService for a single model since it manages two models.
     """
-    
+
+    # App calls from the same seller and buyer starting this close together are duplicates
+    DUPLICATE_CALL_WINDOW = timedelta(seconds=5)
+
+    # No phone call runs longer than this, so an app call covering a recording
+    # started at most this long before it. Bounds the reconciliation range scans
+    # (and lets Postgres prune app_calls partitions, which are by start_time)
+    MAX_CALL_DURATION = timedelta(hours=24)
+
+    # app_calls monthly partitions are kept this many months ahead of now
+    PARTITION_MONTHS_AHEAD = 3
+
+    @classmethod
+    def ensure_app_call_partitions(cls) -> None:
+        """
+        Create any missing app_calls monthly partitions from this month through
+        PARTITION_MONTHS_AHEAD months ahead (ensure_app_calls_partitions() in
+        Postgres). Rows that already landed in app_calls_default for a month are
+        moved into its new partition. Run by the `flask ensure-app-call-partitions`
+        command (app/commands.py), not by the serving processes.
+        """
+        try:
+            db.session.execute(
+                text("SELECT ensure_app_calls_partitions(:months_ahead)"),
+                {"months_ahead": cls.PARTITION_MONTHS_AHEAD}
+            )
+            db.session.commit()
+            logging.info("app_calls partitions are up to date")
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to ensure app_calls partitions: {str(e)}")
+            db.session.rollback()
+            raise
+
     @classmethod
     def create_exotel_call(cls, call_from: str, start_time: datetime, end_time: datetime,
                           duration: int, call_recording_url: str) -> ExotelCall:
@@ -59,6 +98,52 @@ class CallService(BaseService):
             db.session.rollback()
             raise
     
+    @classmethod
+    def exotel_call_delivery_exists(cls, call_sid: str) -> bool:
+        """
+        Check whether an Exotel recording webhook with this CallSid was already processed.
+
+        Args:
+            call_sid: Exotel CallSid
+
+        Returns:
+            True if the CallSid is recorded in exotel_call_deliveries
+        """
+        try:
+            return db.session.get(ExotelCallDelivery, call_sid) is not None
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to check Exotel delivery {call_sid}: {str(e)}")
+            raise
+
+    @classmethod
+    def record_exotel_call_delivery(cls, call_sid: str) -> bool:
+        """
+        Record a processed Exotel recording webhook by its CallSid with
+        INSERT ... ON CONFLICT DO NOTHING. Called only once processing has
+        finished, so a failed run doesn't turn Exotel's redelivery away.
+        Deliveries are kept after the call is reconciled, so a redelivered
+        webhook is recognised at any point.
+
+        Args:
+            call_sid: Exotel CallSid
+
+        Returns:
+            True if this is the first delivery of the CallSid, False if it was already recorded
+        """
+        try:
+            recorded = db.session.scalar(
+                pg_insert(ExotelCallDelivery)
+                .values(call_sid=call_sid)
+                .on_conflict_do_nothing(index_elements=['call_sid'])
+                .returning(ExotelCallDelivery.call_sid)
+            )
+            db.session.commit()
+            return recorded is not None
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to record Exotel delivery {call_sid}: {str(e)}")
+            db.session.rollback()
+            raise
+
     @classmethod
     def create_mobile_app_call(cls, mobile_app_call_id: int, buyer_number: str, seller_number: str,
                               call_type: str, start_time: datetime, end_time: datetime,
@@ -101,6 +186,7 @@ class CallService(BaseService):
             db.session.commit()  # Commit the transaction
             
             logging.info(f"Created MobileAppCall with ID: {mobile_call.id}")
+            AnalyticsCacheService.bump_seller_version(str(user_id))
             try:
                 index_mobile_app_call(mobile_call)
             except Exception as ie:
@@ -111,7 +197,112 @@ class CallService(BaseService):
             logging.error(f"Failed to create MobileAppCall: {str(e)}")
             db.session.rollback()
             raise
-    
+
+    @classmethod
+    def create_mobile_app_calls(cls, calls: List[Dict[str, Any]]) -> List[MobileAppCall]:
+        """
+        Create many MobileAppCall records in one transaction.
+
+        Args:
+            calls: Dicts with the create_mobile_app_call arguments; phone numbers
+                are normalized here and duration must be an int. An
+                already computed 'status' is used as is
+
+        Returns:
+            Created MobileAppCall instances, in input order
+        """
+        if not calls:
+            return []
+        try:
+            rows = [
+                {
+                    'mobile_app_call_id': call['mobile_app_call_id'],
+                    'buyer_number': normalize_phone_number(call['buyer_number']),
+                    'seller_number': normalize_phone_number(call['seller_number']),
+                    'call_type': call['call_type'],
+                    'start_time': call['start_time'],
+                    'end_time': call['end_time'],
+                    'duration': call['duration'],
+                    'user_id': call['user_id'],
+                    'status': call.get('status') or calculate_call_status(call['call_type'], str(call['duration']))
+                }
+                for call in calls
+            ]
+
+            # ORM bulk INSERT: rows go out as batched multi-row INSERT ... RETURNING
+            # statements, skipping per-object unit-of-work bookkeeping
+            mobile_calls = db.session.scalars(
+                insert(MobileAppCall).returning(MobileAppCall, sort_by_parameter_order=True),
+                rows
+            ).all()
+            db.session.commit()
+
+            logging.info(f"Created {len(mobile_calls)} MobileAppCall records")
+            for user_id in {str(mobile_call.user_id) for mobile_call in mobile_calls}:
+                AnalyticsCacheService.bump_seller_version(user_id)
+            for mobile_call in mobile_calls:
+                try:
+                    index_mobile_app_call(mobile_call)
+                except Exception as ie:
+                    logging.error(f"Failed to index mobile app call {mobile_call.id}: {ie}")
+            return mobile_calls
+
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to create MobileAppCalls: {str(e)}")
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def find_matching_exotel_calls(cls, mobile_calls: List[MobileAppCall]) -> Dict[Any, ExotelCall]:
+        """
+        Batch version of find_matching_exotel_call: fetch candidate ExotelCalls
+        for all sellers and the overall time window in one query, then pair in
+        Python. Each ExotelCall is paired with at most one MobileAppCall.
+
+        Args:
+            mobile_calls: MobileAppCall instances to reconcile
+
+        Returns:
+            Dict of MobileAppCall id to its matching ExotelCall
+        """
+        if not mobile_calls:
+            return {}
+        try:
+            candidates = (
+                ExotelCall.query
+                .filter(and_(
+                    ExotelCall.call_from.in_({call.seller_number for call in mobile_calls}),
+                    ExotelCall.start_time >= min(call.start_time for call in mobile_calls),
+                    # Implied by the end_time bound, but gives the index scan an upper bound
+                    ExotelCall.start_time <= max(call.end_time for call in mobile_calls),
+                    ExotelCall.end_time <= max(call.end_time for call in mobile_calls),
+                ))
+                .order_by(ExotelCall.start_time.asc())
+                .all()
+            )
+
+            candidates_by_seller = {}
+            for exotel_call in candidates:
+                candidates_by_seller.setdefault(exotel_call.call_from, []).append(exotel_call)
+
+            matches = {}
+            claimed = set()
+            for mobile_call in sorted(mobile_calls, key=lambda call: call.start_time):
+                for exotel_call in candidates_by_seller.get(mobile_call.seller_number, ()):
+                    if (exotel_call.id not in claimed
+                            and exotel_call.start_time >= mobile_call.start_time
+                            and exotel_call.end_time <= mobile_call.end_time):
+                        matches[mobile_call.id] = exotel_call
+                        claimed.add(exotel_call.id)
+                        break
+
+            logging.info(f"Matched {len(matches)} of {len(mobile_calls)} MobileAppCalls to ExotelCalls")
+            return matches
+
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to find matching ExotelCalls: {str(e)}")
+            raise
+
     @classmethod
     def find_matching_exotel_call(cls, seller_number: str, start_time: datetime, end_time: datetime) -> Optional[ExotelCall]:
         """
@@ -133,6 +324,8 @@ class CallService(BaseService):
                 .filter(and_(
                     ExotelCall.call_from == normalized_seller,
                     ExotelCall.start_time >= start_time,
+                    # Implied by end_time <= end_time, but gives the index scan an upper bound
+                    ExotelCall.start_time <= end_time,
                     ExotelCall.end_time <= end_time,
                 ))
                 .order_by(ExotelCall.start_time.asc())
@@ -170,6 +363,7 @@ class CallService(BaseService):
                 MobileAppCall.query
                 .filter(and_(
                     MobileAppCall.seller_number == normalized_seller,
+                    MobileAppCall.start_time >= start_time - cls.MAX_CALL_DURATION,
                     MobileAppCall.start_time <= start_time,
                     MobileAppCall.end_time >= end_time,
                 ))
@@ -188,6 +382,67 @@ class CallService(BaseService):
             logging.error(f"Failed to find matching MobileAppCall: {str(e)}")
             raise
     
+    @classmethod
+    def claim_for_reconciliation(cls, mobile_call: MobileAppCall, exotel_call: ExotelCall) -> bool:
+        """
+        Claim a matched MobileAppCall/ExotelCall pair for this worker. This is the
+        only place reconciliation takes row locks: both rows are locked with
+        FOR UPDATE SKIP LOCKED and staged for deletion without committing, so the
+        caller's next commit (the one that creates the Meeting) removes them
+        atomically.
+
+        Args:
+            mobile_call: Matched MobileAppCall
+            exotel_call: Matched ExotelCall
+
+        Returns:
+            True if both rows were claimed, False if another worker already
+            reconciled (and deleted) either of them
+
+        Raises:
+            ReconciliationClaimConflict: Both rows still exist but another worker
+                holds a lock on one of them; the caller's task should be retried
+        """
+        mobile_call_id = mobile_call.id
+        exotel_call_id = exotel_call.id
+        try:
+            locked_mobile_call_id = db.session.execute(
+                select(MobileAppCall.id)
+                .where(MobileAppCall.id == mobile_call_id)
+                .with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            locked_exotel_call_id = db.session.execute(
+                select(ExotelCall.id)
+                .where(ExotelCall.id == exotel_call_id)
+                .with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            if not locked_mobile_call_id or not locked_exotel_call_id:
+                db.session.rollback()
+                # A skipped row is either locked by another worker or gone; only a
+                # gone row means the pair has been reconciled
+                mobile_call_exists = db.session.scalar(
+                    select(select(MobileAppCall.id).where(MobileAppCall.id == mobile_call_id).exists())
+                )
+                exotel_call_exists = db.session.scalar(
+                    select(select(ExotelCall.id).where(ExotelCall.id == exotel_call_id).exists())
+                )
+                db.session.rollback()
+                if mobile_call_exists and exotel_call_exists:
+                    raise ReconciliationClaimConflict(
+                        f"MobileAppCall {mobile_call_id} / ExotelCall {exotel_call_id} is locked by another worker"
+                    )
+                logging.info(f"MobileAppCall {mobile_call_id} / ExotelCall {exotel_call_id} "
+                             f"already reconciled by another worker")
+                return False
+
+            db.session.delete(exotel_call)
+            db.session.delete(mobile_call)
+            return True
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to claim MobileAppCall {mobile_call_id} / ExotelCall {exotel_call_id}: {str(e)}")
+            db.session.rollback()
+            raise
+
     @classmethod
     def delete_exotel_call(cls, exotel_call: ExotelCall) -> bool:
         """
@@ -224,6 +479,7 @@ class CallService(BaseService):
             db.session.delete(mobile_call)
             db.session.commit()  # Commit the transaction
             logging.info(f"Deleted MobileAppCall: {mobile_call.id}")
+            AnalyticsCacheService.bump_seller_version(str(mobile_call.user_id))
             return True
         except SQLAlchemyError as e:
             logging.error(f"Failed to delete MobileAppCall {mobile_call.id}: {str(e)}")
@@ -387,7 +643,83 @@ class CallService(BaseService):
         except SQLAlchemyError as e:
             logging.error(f"Failed to get MobileAppCall by app_call_id {mobile_app_call_id}: {str(e)}")
             raise
-    
+
+    @classmethod
+    def get_mobile_app_calls_by_ids(cls, mobile_call_ids: List[str]) -> List[MobileAppCall]:
+        """
+        Get MobileAppCalls by primary key in one query; ids that no longer exist are skipped.
+
+        Args:
+            mobile_call_ids: MobileAppCall UUIDs
+
+        Returns:
+            List of MobileAppCall instances
+        """
+        if not mobile_call_ids:
+            return []
+        try:
+            return MobileAppCall.query.filter(MobileAppCall.id.in_(mobile_call_ids)).all()
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to get MobileAppCalls by id: {str(e)}")
+            raise
+
+    @classmethod
+    def get_mobile_app_calls_in_window(cls, seller_numbers: List[str], window_start: datetime,
+                                       window_end: datetime) -> List[MobileAppCall]:
+        """
+        Get MobileAppCalls for any of the given sellers starting inside a time window.
+        Used to check a whole batch of incoming app calls for duplicates at once.
+
+        Args:
+            seller_numbers: Normalized seller phone numbers
+            window_start: Earliest start time (inclusive)
+            window_end: Latest start time (inclusive)
+
+        Returns:
+            List of MobileAppCall instances
+        """
+        if not seller_numbers:
+            return []
+        try:
+            return (
+                MobileAppCall.query
+                .filter(and_(
+                    MobileAppCall.seller_number.in_(seller_numbers),
+                    MobileAppCall.start_time >= window_start,
+                    MobileAppCall.start_time <= window_end,
+                ))
+                .all()
+            )
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to get MobileAppCalls in window: {str(e)}")
+            raise
+
+    @classmethod
+    def get_exotel_call_by_details(cls, call_from: str, start_time: datetime) -> Optional[ExotelCall]:
+        """
+        Get an ExotelCall by caller and exact start time, so a redelivered or
+        retried recording webhook reuses the row it already stored.
+
+        Args:
+            call_from: Normalized caller phone number
+            start_time: Call start time
+
+        Returns:
+            ExotelCall instance or None if not found
+        """
+        try:
+            return (
+                ExotelCall.query
+                .filter(and_(
+                    ExotelCall.call_from == call_from,
+                    ExotelCall.start_time == start_time,
+                ))
+                .first()
+            )
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to get ExotelCall: call_from={call_from}, start_time={start_time}, error={str(e)}")
+            raise
+
     @classmethod
     def get_mobile_app_call_by_details(cls, seller_number: str, buyer_number: str, start_time: datetime) -> Optional[MobileAppCall]:
         """
@@ -404,7 +736,7 @@ class CallService(BaseService):
         """
         try:
             # Define a time window of ±5 seconds to account for minor timing differences
-            time_window = timedelta(seconds=5)
+            time_window = cls.DUPLICATE_CALL_WINDOW
             start_window = start_time - time_window
             end_window = start_time + time_window
             
@@ -488,13 +820,17 @@ class CallService(BaseService):
             Updated MobileAppCall instance or None if not found
         """
         try:
-            mobile_call = MobileAppCall.query.get(mobile_call_id)
+            # Looked up by id alone: the primary key is (id, start_time)
+            mobile_call = db.session.scalars(
+                select(MobileAppCall).where(MobileAppCall.id == mobile_call_id)
+            ).first()
             if not mobile_call:
                 logging.warning(f"MobileAppCall not found: {mobile_call_id}")
                 return None
             
             mobile_call.status = status
             db.session.commit()  # Commit the transaction
+            AnalyticsCacheService.bump_seller_version(str(mobile_call.user_id))
             
             logging.info(f"Updated MobileAppCall {mobile_call_id} status to {status}")
             return mobile_call
@@ -2,6 +2,7 @@ import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
+from sqlalchemy import update
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import db
@@ -246,6 +247,36 @@ class JobService(BaseService):
             logging.error(f"Failed to update job {job_id} status: {str(e)}")
             raise
     
+    @classmethod
+    def set_s3_audio_url(cls, job_id: str, s3_audio_url: str) -> bool:
+        """
+        Set a job's recording URL with a single UPDATE ... RETURNING, without loading the job.
+        
+        Args:
+            job_id: Job UUID
+            s3_audio_url: S3 URL of the uploaded recording
+            
+        Returns:
+            True if the job exists and was updated, False otherwise
+        """
+        try:
+            updated_id = db.session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(s3_audio_url=s3_audio_url)
+                .returning(Job.id)
+            ).scalar_one_or_none()
+            if updated_id is None:
+                db.session.rollback()
+                return False
+            db.session.commit()
+            logging.info(f"Set recording URL for job {job_id}")
+            return True
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.error(f"Failed to set recording URL for job {job_id}: {str(e)}")
+            raise
+    
     @classmethod
     def get_job_with_meeting(cls, job_id: str) -> Optional[Job]:
         """
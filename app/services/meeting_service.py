@@ -1,24 +1,33 @@
+import heapq
 import logging
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import and_
+from sqlalchemy.orm import contains_eager, joinedload
 
+from app import db
 from app.models.meeting import Meeting
 from app.models.seller import Seller
 from app.models.buyer import Buyer
 from app.models.mobile_app_calls import MobileAppCall
-from app.models.job import JobStatus
+from app.models.job import Job, JobStatus
 from app.constants import CallDirection, MeetingSource, MobileAppCallStatus
 from app.utils.call_recording_utils import denormalize_phone_number, normalize_phone_number
 from .base_service import BaseService
+from .analytics_cache_service import AnalyticsCacheService
+from .buyer_service import BuyerService
 from app.models.action import Action
 from app.models.call_performance import CallPerformance
 from app.search.index_helpers import index_meeting_transcript
 
 logging = logging.getLogger(__name__)
 
+IST = ZoneInfo("Asia/Kolkata")
+# Sort key for call records without a start time
+_MIN_START_TIME = datetime.min.replace(tzinfo=timezone.utc)
+
 
 def human_readable_duration(end_time: datetime, start_time: datetime) -> str:
     """Helper function to calculate human readable duration from start and end times"""
@@ -74,6 +83,9 @@ class MeetingService(BaseService):
             
             meeting = cls.create(**meeting_data)
             logging.info(f"Created meeting: {title} with ID: {meeting.id}")
+            AnalyticsCacheService.bump_seller_version(str(seller_id))
+            if start_time:
+                BuyerService.record_contact(buyer_id, start_time)
             # Index minimal structured meeting doc (fields may be sparse initially)
             try:
                 cls._index_meeting_structured(meeting)
@@ -84,7 +96,60 @@ class MeetingService(BaseService):
         except SQLAlchemyError as e:
             logging.error(f"Failed to create meeting {title}: {str(e)}")
             raise
-    
+
+    @classmethod
+    def create_meeting_with_job(cls, buyer_id: str, seller_id: str, title: str, start_time: datetime,
+                                s3_audio_url: str, job_start_time: Optional[datetime] = None,
+                                **kwargs) -> Meeting:
+        """
+        Create a meeting and its processing job in one commit. The Job is
+        attached through the Meeting.job relationship, so the unit of work
+        orders both inserts; anything else already staged on the session (e.g.
+        reconciled call rows to delete) goes out in the same transaction.
+
+        Args:
+            buyer_id: Buyer UUID
+            seller_id: Seller UUID
+            title: Meeting title
+            start_time: Meeting start time
+            s3_audio_url: S3 URL of the audio file for the job
+            job_start_time: Job start time (defaults to now)
+            **kwargs: Additional meeting fields
+
+        Returns:
+            Created Meeting instance; the job is meeting.job
+        """
+        try:
+            meeting = Meeting(
+                buyer_id=buyer_id,
+                seller_id=seller_id,
+                title=title,
+                start_time=start_time,
+                **{'source': MeetingSource.PHONE, **kwargs}
+            )
+            meeting.job = Job(
+                s3_audio_url=s3_audio_url,
+                status=JobStatus.INIT,
+                start_time=job_start_time or datetime.now(IST)
+            )
+            db.session.add(meeting)
+            db.session.commit()
+            logging.info(f"Created meeting: {title} with ID: {meeting.id} and job ID: {meeting.job.id}")
+
+            AnalyticsCacheService.bump_seller_version(str(seller_id))
+            if start_time:
+                BuyerService.record_contact(buyer_id, start_time)
+            try:
+                cls._index_meeting_structured(meeting)
+            except Exception as ie:
+                logging.error(f"Failed to index meeting {meeting.id}: {ie}")
+            return meeting
+
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to create meeting {title}: {str(e)}")
+            db.session.rollback()
+            raise
+
     @classmethod
     def get_meeting_with_job(cls, meeting_id: str) -> Optional[Meeting]:
         """
@@ -205,6 +270,11 @@ class MeetingService(BaseService):
                 .join(Seller)
                 .join(Buyer)  # Join Buyer table to get buyer information
                 .filter(Seller.id.in_(seller_ids))
+                .options(
+                    contains_eager(cls.model.seller),
+                    contains_eager(cls.model.buyer),
+                    joinedload(cls.model.job)
+                )
             )
             
             # Add date filtering for meetings if provided
@@ -213,7 +283,7 @@ class MeetingService(BaseService):
             if end_date:
                 meetings_query = meetings_query.filter(cls.model.start_time <= end_date)
             
-            meetings_query = meetings_query.order_by(cls.model.start_time.desc())
+            meetings_query = meetings_query.order_by(cls.model.start_time.desc().nulls_last())
             
             # Get mobile app calls for specified sellers
             mobile_app_calls_query = (
@@ -232,28 +302,19 @@ class MeetingService(BaseService):
             meetings = meetings_query.all()
             mobile_app_calls = mobile_app_calls_query.all()
             
-            # Combine all call records
-            all_calls = []
-            all_calls.extend(meetings)
-            all_calls.extend(mobile_app_calls)
+            # Both lists come back newest first from SQL, so a linear merge orders them
+            all_calls = list(heapq.merge(meetings, mobile_app_calls, key=cls._call_start_sort_key, reverse=True))
             
             # Deduplicate records (prioritize meetings over mobile app calls)
             deduplicated_calls = cls._deduplicate_call_records(all_calls)
             
-            # Sort by start time
-            deduplicated_calls.sort(
-                key=lambda x: x.start_time.replace(
-                    tzinfo=ZoneInfo("Asia/Kolkata")
-                ) if x.start_time and x.start_time.tzinfo is None else x.start_time,
-                reverse=True
-            )
-            
-            # Format call history
-            local_now = datetime.now(ZoneInfo("Asia/Kolkata"))
+            # Format call history; sellers/buyers behind app calls are looked up in bulk
+            local_now = datetime.now(IST)
+            sellers_by_phone, buyers_by_phone = cls._load_app_call_parties(deduplicated_calls)
             result = []
             
             for call_record in deduplicated_calls:
-                formatted_call = cls._format_call_record(call_record, local_now)
+                formatted_call = cls._format_call_record(call_record, local_now, sellers_by_phone, buyers_by_phone)
                 if formatted_call:
                     result.append(formatted_call)
             
@@ -265,13 +326,50 @@ class MeetingService(BaseService):
             raise
     
     @classmethod
-    def _format_call_record(cls, call_record, local_now: datetime) -> Optional[Dict[str, Any]]:
+    def _load_app_call_parties(cls, call_records: List[Any], buyers_by_phone: Optional[Dict[str, Buyer]] = None):
+        """
+        Look up the sellers and buyers behind a list of mobile app calls with one
+        IN query each, instead of one query per call in _format_call_record.
+        
+        Args:
+            call_records: Meeting and MobileAppCall instances; meetings are skipped
+            buyers_by_phone: Buyers already known, keyed by normalized phone
+            
+        Returns:
+            Tuple of (sellers by phone, buyers by normalized phone)
+        """
+        app_calls = [record for record in call_records if isinstance(record, MobileAppCall)]
+        buyers_by_phone = dict(buyers_by_phone or {})
+        if not app_calls:
+            return {}, buyers_by_phone
+
+        seller_numbers = {call.seller_number for call in app_calls if call.seller_number}
+        sellers_by_phone = {}
+        if seller_numbers:
+            for seller in Seller.query.filter(Seller.phone.in_(seller_numbers)):
+                sellers_by_phone.setdefault(seller.phone, seller)
+
+        buyer_phones = {
+            normalize_phone_number(call.buyer_number) for call in app_calls if call.buyer_number
+        } - buyers_by_phone.keys()
+        if buyer_phones:
+            for buyer in Buyer.query.filter(Buyer.phone.in_(buyer_phones)):
+                buyers_by_phone.setdefault(buyer.phone, buyer)
+
+        return sellers_by_phone, buyers_by_phone
+
+    @classmethod
+    def _format_call_record(cls, call_record, local_now: datetime,
+                            sellers_by_phone: Optional[Dict[str, Seller]] = None,
+                            buyers_by_phone: Optional[Dict[str, Buyer]] = None) -> Optional[Dict[str, Any]]:
         """
         Format a call record (Meeting or MobileAppCall) for API response.
         
         Args:
             call_record: Meeting or MobileAppCall instance
             local_now: Current local time for calculations
+            sellers_by_phone: Prefetched sellers from _load_app_call_parties (queried per call if omitted)
+            buyers_by_phone: Prefetched buyers from _load_app_call_parties (queried per call if omitted)
             
         Returns:
             Formatted call record dictionary or None if invalid
@@ -282,7 +380,10 @@ class MeetingService(BaseService):
                 seller_name = call_record.seller.name
                 seller_email = call_record.seller.email
             else:
-                seller = Seller.query.filter_by(phone=call_record.seller_number).first()
+                if sellers_by_phone is not None:
+                    seller = sellers_by_phone.get(call_record.seller_number)
+                else:
+                    seller = Seller.query.filter_by(phone=call_record.seller_number).first()
                 seller_name = seller.name if seller else "Unknown"
                 seller_email = seller.email if seller else None
             
@@ -301,9 +402,11 @@ class MeetingService(BaseService):
                 seller_number = call_record.seller_number
                 
                 # Look up buyer by normalized phone number
-                from app.utils.call_recording_utils import normalize_phone_number
                 normalized_buyer_phone = normalize_phone_number(buyer_number)
-                buyer = Buyer.query.filter_by(phone=normalized_buyer_phone).first()
+                if buyers_by_phone is not None:
+                    buyer = buyers_by_phone.get(normalized_buyer_phone)
+                else:
+                    buyer = Buyer.query.filter_by(phone=normalized_buyer_phone).first()
                 if buyer:
                     buyer_name = buyer.name
                     buyer_email = buyer.email
@@ -312,16 +415,18 @@ class MeetingService(BaseService):
             analysis_status = 'Processing'
             direction = None
             
-            title = f"Meeting between {denormalize_phone_number(buyer_number)} and {seller_name}"
+            # Format each number once; the display form is reused in titles and fields below
+            buyer_number_display = denormalize_phone_number(buyer_number)
+            title = f"Meeting between {buyer_number_display} and {seller_name}"
 
             # Handle timezone for start/end times
             call_record_start_time = call_record.start_time
             if call_record_start_time and call_record_start_time.tzinfo is None:
-                call_record_start_time = call_record_start_time.replace(tzinfo=ZoneInfo("Asia/Kolkata"))
+                call_record_start_time = call_record_start_time.replace(tzinfo=IST)
                 
             call_record_end_time = call_record.end_time
             if call_record_end_time and call_record_end_time.tzinfo is None:
-                call_record_end_time = call_record_end_time.replace(tzinfo=ZoneInfo("Asia/Kolkata"))
+                call_record_end_time = call_record_end_time.replace(tzinfo=IST)
             
             if isinstance(call_record, Meeting):
                 # Meeting record
@@ -345,16 +450,16 @@ class MeetingService(BaseService):
                 analysis_status = call_record.status
                 
                 if call_record.status == MobileAppCallStatus.MISSED.value:
-                    title = f'Missed Call from {denormalize_phone_number(buyer_number)}'
+                    title = f'Missed Call from {buyer_number_display}'
                     direction = CallDirection.INCOMING.value
                     call_type = "Missed"
                 elif call_record.status == MobileAppCallStatus.REJECTED.value:
                     call_type = "Rejected"
-                    title = f'Rejected Call from {denormalize_phone_number(buyer_number)}'
+                    title = f'Rejected Call from {buyer_number_display}'
                     direction = CallDirection.INCOMING.value
                 elif call_record.status == MobileAppCallStatus.NOT_ANSWERED.value:
                     call_type = "Not Answered"
-                    title = f'{denormalize_phone_number(buyer_number)} did not answer'
+                    title = f'{buyer_number_display} did not answer'
                     direction = CallDirection.OUTGOING.value
                 elif call_record.status == MobileAppCallStatus.PROCESSING.value:
                     call_type = "Answered"
@@ -368,7 +473,7 @@ class MeetingService(BaseService):
                     
                     start_time_local = call_record.start_time
                     if start_time_local.tzinfo is None:
-                        start_time_local = start_time_local.replace(tzinfo=ZoneInfo("Asia/Kolkata"))
+                        start_time_local = start_time_local.replace(tzinfo=IST)
                     if local_now - start_time_local > timedelta(seconds=30):
                         analysis_status = 'Not Recorded'
                 
@@ -399,7 +504,7 @@ class MeetingService(BaseService):
                 "source": call_record.source.value if isinstance(call_record, Meeting) else MeetingSource.PHONE.value,
                 "start_time": call_record.start_time.isoformat() if call_record.start_time else None,
                 "end_time": call_record.end_time.isoformat() if call_record.end_time else None,
-                "buyer_number": denormalize_phone_number(buyer_number),
+                "buyer_number": buyer_number_display,
                 "buyer_name": buyer_name,
                 "buyer_email": buyer_email,
                 "seller_number": denormalize_phone_number(seller_number),
@@ -439,6 +544,9 @@ class MeetingService(BaseService):
                     cls._index_meeting_structured(meeting)
                 except Exception as ie:
                     logging.error(f"Failed to index meeting {meeting_id} after LLM analysis update: {ie}")
+                # Keep the buyer's materialized products summary in step with its meetings
+                if 'detected_products' in analysis_data and meeting.buyer_id:
+                    BuyerService.refresh_products_discussed_summary(str(meeting.buyer_id))
             return meeting
         except SQLAlchemyError as e:
             logging.error(f"Failed to update LLM analysis for meeting {meeting_id}: {str(e)}")
@@ -544,7 +652,7 @@ class MeetingService(BaseService):
         """
         try:
             # Get buyer to verify access
-            buyer = Buyer.query.get(buyer_id)
+            buyer = db.session.get(Buyer, buyer_id)
             if not buyer:
                 logging.error(f"Buyer not found: {buyer_id}")
                 return []
@@ -553,7 +661,8 @@ class MeetingService(BaseService):
             meetings_query = (
                 cls.model.query
                 .filter_by(buyer_id=buyer_id)
-                .order_by(cls.model.start_time.desc())
+                .options(joinedload(cls.model.seller), joinedload(cls.model.job))
+                .order_by(cls.model.start_time.desc().nulls_last())
             )
             
             # Get mobile app calls for the buyer (by phone number)
@@ -568,28 +677,21 @@ class MeetingService(BaseService):
             meetings = meetings_query.all()
             mobile_app_calls = mobile_app_calls_query.all()
             
-            # Combine all call records
-            all_calls = []
-            all_calls.extend(meetings)
-            all_calls.extend(mobile_app_calls)
+            # Both lists come back newest first from SQL, so a linear merge orders them
+            all_calls = list(heapq.merge(meetings, mobile_app_calls, key=cls._call_start_sort_key, reverse=True))
 
             # Deduplicate records (prioritize meetings over mobile app calls)
             deduplicated_calls = cls._deduplicate_call_records(all_calls)
 
-            # Sort by start time
-            deduplicated_calls.sort(
-                key=lambda x: x.start_time.replace(
-                    tzinfo=ZoneInfo("Asia/Kolkata")
-                ) if x.start_time and x.start_time.tzinfo is None else x.start_time,
-                reverse=True
+            # Format call history; every app call here is with this buyer, so only sellers need a lookup
+            local_now = datetime.now(IST)
+            sellers_by_phone, buyers_by_phone = cls._load_app_call_parties(
+                deduplicated_calls, {normalized_buyer_phone: buyer}
             )
-
-            # Format call history
-            local_now = datetime.now(ZoneInfo("Asia/Kolkata"))
             result = []
             
             for call_record in deduplicated_calls:
-                formatted_call = cls._format_call_record(call_record, local_now)
+                formatted_call = cls._format_call_record(call_record, local_now, sellers_by_phone, buyers_by_phone)
                 if formatted_call:
                     result.append(formatted_call)
             
@@ -647,6 +749,16 @@ class MeetingService(BaseService):
             logging.error(f"Failed to get meeting analytics for user {user_id}: {str(e)}")
             raise
     
+    @staticmethod
+    def _call_start_sort_key(call_record) -> datetime:
+        """Aware start time for ordering call records; a missing start time sorts as oldest."""
+        start_time = call_record.start_time
+        if start_time is None:
+            return _MIN_START_TIME
+        if start_time.tzinfo is None:
+            return start_time.replace(tzinfo=IST)
+        return start_time
+
     @classmethod
     def _deduplicate_call_records(cls, all_calls: List) -> List:
         """
@@ -719,11 +831,11 @@ class MeetingService(BaseService):
             # Ensure both times are timezone-aware for comparison
             meeting_time = meeting.start_time
             if meeting_time.tzinfo is None:
-                meeting_time = meeting_time.replace(tzinfo=ZoneInfo("Asia/Kolkata"))
+                meeting_time = meeting_time.replace(tzinfo=IST)
             
             mobile_time = mobile_call.start_time
             if mobile_time.tzinfo is None:
-                mobile_time = mobile_time.replace(tzinfo=ZoneInfo("Asia/Kolkata"))
+                mobile_time = mobile_time.replace(tzinfo=IST)
             
             time_diff = abs((meeting_time - mobile_time).total_seconds())
             if time_diff > 5:  # 5 seconds tolerance
@@ -0,0 +1,99 @@
+import logging
+import uuid
+from typing import Optional, Tuple
+
+import redis
+
+logging = logging.getLogger(__name__)
+
+
+class ReconciliationLockService:
+    """
+    Short-lived Redis locks around reconciling a matched call pair.
+
+    The Exotel webhook and the app call log task can match the same pair at
+    once. CallService.claim_for_reconciliation already guarantees only one of
+    them creates the meeting; this lock stops the loser from downloading and
+    uploading the recording first. Locks are keyed by the ExotelCall id, which
+    both paths know before any S3 work starts.
+    """
+    LOCK_TTL_SECONDS = 120  # Outlives an S3 upload; expires on its own if a worker dies
+
+    # Deletes the lock only if it still holds this worker's token
+    _RELEASE_SCRIPT = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('del', KEYS[1])
+        end
+        return 0
+    """
+
+    _lock_client = None
+
+    @classmethod
+    def _get_lock_client(cls):
+        """Get Redis client for reconciliation locks with lazy initialization."""
+        if cls._lock_client is None:
+            try:
+                cls._lock_client = redis.Redis(
+                    host='localhost',
+                    port=6379,
+                    db=7,  # Separate database for reconciliation locks
+                    decode_responses=True,
+                    socket_timeout=2,
+                    socket_connect_timeout=2
+                )
+                cls._lock_client.ping()
+                logging.info("Redis lock client initialized for call reconciliation")
+            except Exception as e:
+                logging.warning(f"Redis locks not available for call reconciliation: {e}")
+                cls._lock_client = False  # Mark as unavailable
+        return cls._lock_client if cls._lock_client is not False else None
+
+    @staticmethod
+    def _lock_key(exotel_call_id) -> str:
+        return f"reconcile:exotel_call:{exotel_call_id}"
+
+    @classmethod
+    def acquire(cls, exotel_call_id) -> Tuple[bool, Optional[str]]:
+        """
+        Try to take the reconciliation lock for an ExotelCall (SET NX EX).
+
+        Args:
+            exotel_call_id: ExotelCall UUID
+
+        Returns:
+            (acquired, token). Without Redis the lock is reported as acquired with
+            no token, and the row claim alone prevents double reconciliation.
+        """
+        client = cls._get_lock_client()
+        if not client:
+            return True, None
+
+        token = uuid.uuid4().hex
+        try:
+            acquired = client.set(cls._lock_key(exotel_call_id), token, nx=True, ex=cls.LOCK_TTL_SECONDS)
+            return bool(acquired), token if acquired else None
+        except Exception as e:
+            logging.error(f"Reconciliation lock error for ExotelCall {exotel_call_id}: {e}")
+            return True, None
+
+    @classmethod
+    def release(cls, exotel_call_id, token: Optional[str]) -> None:
+        """
+        Release a lock taken by acquire; a lock that expired and was taken by
+        another worker is left alone.
+
+        Args:
+            exotel_call_id: ExotelCall UUID
+            token: Token returned by acquire
+        """
+        if not token:
+            return
+        client = cls._get_lock_client()
+        if not client:
+            return
+
+        try:
+            client.eval(cls._RELEASE_SCRIPT, 1, cls._lock_key(exotel_call_id), token)
+        except Exception as e:
+            logging.error(f"Reconciliation lock release error for ExotelCall {exotel_call_id}: {e}")
@@ -0,0 +1,102 @@
+import logging
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models.reconciliation_tasks import ReconciliationTask
+from .base_service import BaseService
+
+logging = logging.getLogger(__name__)
+
+
+class ReconciliationTaskService(BaseService):
+    """
+    Durable markers for reconciliation work queued on the in-memory executors.
+
+    A task is stored before it is queued and deleted once it succeeds. Rows that
+    are left behind (the task gave up after its retries, or its worker died) are
+    picked up again by `flask retry-reconciliation-tasks`.
+    """
+    model = ReconciliationTask
+
+    # Untouched this long, a task is no longer running anywhere and can be retried
+    STALE_AFTER = timedelta(minutes=15)
+    # Runs (each with its own in-process retries) before a task is left for manual handling
+    MAX_ATTEMPTS = 5
+
+    @classmethod
+    def create_task(cls, task: str, payload: dict) -> ReconciliationTask:
+        """
+        Store a task before it is queued.
+
+        Args:
+            task: Task function name (a key of RECONCILIATION_TASKS)
+            payload: JSON-serializable task argument
+
+        Returns:
+            Created ReconciliationTask instance
+        """
+        return cls.create(task=task, payload=payload)
+
+    @classmethod
+    def complete_task(cls, task_id) -> None:
+        """
+        Delete a task once it has succeeded.
+
+        Args:
+            task_id: ReconciliationTask UUID
+        """
+        try:
+            db.session.query(cls.model).filter(cls.model.id == task_id).delete(synchronize_session=False)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to complete reconciliation task {task_id}: {str(e)}")
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def record_failure(cls, task_id, error: str) -> None:
+        """
+        Count a failed run and keep the task for the next sweep.
+
+        Args:
+            task_id: ReconciliationTask UUID
+            error: Description of the last failure
+        """
+        try:
+            db.session.execute(
+                update(cls.model)
+                .where(cls.model.id == task_id)
+                .values(attempts=cls.model.attempts + 1, last_error=error, updated_at=func.now())
+            )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to record failure of reconciliation task {task_id}: {str(e)}")
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def get_retryable_tasks(cls, limit: Optional[int] = 100) -> List[ReconciliationTask]:
+        """
+        Get tasks that are no longer running and still have attempts left, oldest first.
+
+        Args:
+            limit: Maximum number of tasks to return
+
+        Returns:
+            List of ReconciliationTask instances
+        """
+        try:
+            return list(db.session.scalars(
+                select(cls.model)
+                .where(cls.model.updated_at < func.now() - cls.STALE_AFTER)
+                .where(cls.model.attempts < cls.MAX_ATTEMPTS)
+                .order_by(cls.model.created_at.asc())
+                .limit(limit)
+            ))
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to get retryable reconciliation tasks: {str(e)}")
+            raise
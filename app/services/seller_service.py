@@ -1,13 +1,18 @@
 import logging
-from typing import List, Optional, Tuple
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
 from datetime import timedelta
+from cachetools import TTLCache
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from werkzeug.security import generate_password_hash
 
 from app import db
 from app.models.seller import Seller, SellerRole
 from app.utils.auth_utils import generate_user_claims
-from app.utils.call_recording_utils import normalize_phone_number
+from app.utils.call_recording_utils import normalize_phone_number, phone_number_key
 from .base_service import BaseService
 from app.search.index_helpers import index_seller
 
@@ -19,10 +24,21 @@ class SellerService(BaseService):
     Service class for all seller/user related database operations.
     """
     model = Seller
+
+    # agency_id per seller id; agencies practically never change, so a short TTL is safe
+    AGENCY_ID_CACHE_TTL_SECONDS = 60
+    _agency_id_cache = TTLCache(maxsize=10_000, ttl=AGENCY_ID_CACHE_TTL_SECONDS)
+    _agency_id_cache_lock = threading.RLock()
+
+    # seller id per phone_number_key, for the call webhooks. Cleared whenever a seller changes,
+    # but only in this process, so the short TTL bounds staleness in the other workers
+    SELLER_ID_BY_PHONE_CACHE_TTL_SECONDS = 60
+    _seller_id_by_phone_cache = TTLCache(maxsize=10_000, ttl=SELLER_ID_BY_PHONE_CACHE_TTL_SECONDS)
+    _seller_id_by_phone_cache_lock = threading.RLock()
     
     @classmethod
     def create_seller(cls, email: str, phone: str, password: str, agency_id: str, 
-                     name: str, role: Optional[str] = None) -> Seller:
+                     name: str, role: Optional[str] = None, is_otp: bool = False) -> Seller:
         """
         Create a new seller with normalized data.
         
@@ -33,6 +49,7 @@ class SellerService(BaseService):
             agency_id: Agency UUID
             name: Seller's full name
             role: Seller's role (defaults to USER)
+            is_otp: True if password is a generated OTP (hashed with a lower work factor)
             
         Returns:
             Created Seller instance
@@ -42,25 +59,34 @@ class SellerService(BaseService):
             SQLAlchemyError: If database operation fails
         """
         try:
-            # Check if seller already exists
-            existing_seller = cls.get_by_email_or_phone(email, phone)
-            if existing_seller:
-                raise ValueError(f"Seller already exists with email {email} or phone {phone}")
-            
             # Normalize phone number
             normalized_phone = normalize_phone_number(phone)
-            
-            # Create seller using model constructor (handles password hashing)
-            seller = Seller(
-                email=email,
-                phone=normalized_phone,
-                password=password,
-                agency_id=agency_id,
-                name=name,
-                role=role
+            if is_otp:
+                password_hash = generate_password_hash(password, method=Seller.OTP_PASSWORD_HASH_METHOD)
+            else:
+                password_hash = generate_password_hash(password)
+
+            # Single round-trip: ON CONFLICT covers both the email and phone unique
+            # constraints, so no pre-check SELECTs are needed
+            stmt = (
+                insert(Seller)
+                .values(
+                    id=uuid.uuid4(),
+                    email=email,
+                    phone=normalized_phone,
+                    password_hash=password_hash,
+                    agency_id=agency_id,
+                    name=name,
+                    role=SellerRole(role) if role else SellerRole.USER
+                )
+                .on_conflict_do_nothing()
+                .returning(Seller)
             )
-            
-            db.session.add(seller)
+            seller = db.session.scalars(stmt).first()
+            if not seller:
+                db.session.rollback()
+                raise ValueError(f"Seller already exists with email {email} or phone {phone}")
+
             db.session.commit()
             
             logging.info(f"Created seller: {email} with ID: {seller.id}")
@@ -74,6 +100,65 @@ class SellerService(BaseService):
             logging.error(f"Failed to create seller {email}: {str(e)}")
             raise
     
+    @classmethod
+    def get_agency_id(cls, seller_id: str) -> Optional[str]:
+        """
+        Get a seller's agency ID, served from an in-process TTL cache so
+        authenticated routes don't need a seller query on every request.
+        
+        Args:
+            seller_id: Seller's UUID
+            
+        Returns:
+            Agency ID string, or None if the seller doesn't exist
+        """
+        key = str(seller_id)
+        with cls._agency_id_cache_lock:
+            agency_id = cls._agency_id_cache.get(key)
+        if agency_id:
+            return agency_id
+
+        seller = cls.get_by_id(seller_id)
+        if not seller:
+            return None
+
+        agency_id = str(seller.agency_id)
+        with cls._agency_id_cache_lock:
+            cls._agency_id_cache[key] = agency_id
+        return agency_id
+
+    @classmethod
+    def invalidate_cached_seller(cls, seller_id: str) -> None:
+        """
+        Drop a seller from the agency ID and seller-id-by-phone caches.
+        
+        Args:
+            seller_id: Seller's UUID
+        """
+        with cls._agency_id_cache_lock:
+            cls._agency_id_cache.pop(str(seller_id), None)
+        # Keyed by phone, so a changed or deleted seller can't be dropped by id alone
+        with cls._seller_id_by_phone_cache_lock:
+            cls._seller_id_by_phone_cache.clear()
+
+    @classmethod
+    def update(cls, seller_id: str, **kwargs) -> Optional[Seller]:
+        """
+        Update a seller and drop it from the agency ID cache.
+        """
+        seller = super().update(seller_id, **kwargs)
+        cls.invalidate_cached_seller(seller_id)
+        return seller
+
+    @classmethod
+    def delete(cls, seller_id: str) -> bool:
+        """
+        Delete a seller and drop it from the agency ID cache.
+        """
+        deleted = super().delete(seller_id)
+        cls.invalidate_cached_seller(seller_id)
+        return deleted
+    
     @classmethod
     def get_by_email(cls, email: str) -> Optional[Seller]:
         """
@@ -98,8 +183,83 @@ class SellerService(BaseService):
         Returns:
             Seller instance or None if not found
         """
-        normalized_phone = normalize_phone_number(phone)
-        return cls.get_by_field('phone', normalized_phone)
+        # Seek on the generated phone_normalized column so any input format matches
+        return cls.get_by_field('phone_normalized', phone_number_key(phone))
+
+    @classmethod
+    def get_id_by_phone(cls, phone: str) -> Optional[uuid.UUID]:
+        """
+        Get a seller's ID by phone number, served from an in-process TTL cache
+        so repeat webhook calls for the same seller skip the query.
+
+        Args:
+            phone: Phone number in any format
+
+        Returns:
+            Seller UUID, or None if no seller has this phone
+        """
+        return cls.get_ids_by_phones([phone]).get(phone_number_key(phone))
+
+    @classmethod
+    def get_ids_by_phones(cls, phones: List[str]) -> Dict[str, uuid.UUID]:
+        """
+        Get seller IDs for many phone numbers; cache misses are resolved in one query.
+        Unknown numbers aren't cached, so a seller who signs up is found right away.
+
+        Args:
+            phones: Phone numbers in any format
+
+        Returns:
+            Dict of phone_number_key (last 10 digits) to seller UUID; numbers with no seller are absent
+        """
+        keys = {phone_number_key(phone) for phone in phones}
+        seller_ids = {}
+        with cls._seller_id_by_phone_cache_lock:
+            for key in keys:
+                seller_id = cls._seller_id_by_phone_cache.get(key)
+                if seller_id:
+                    seller_ids[key] = seller_id
+
+        missing = keys - seller_ids.keys()
+        if not missing:
+            return seller_ids
+
+        try:
+            rows = (
+                db.session.query(Seller.phone_normalized, Seller.id)
+                .filter(Seller.phone_normalized.in_(missing))
+                .all()
+            )
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to get seller ids by phone: {str(e)}")
+            raise
+
+        with cls._seller_id_by_phone_cache_lock:
+            for key, seller_id in rows:
+                seller_ids[key] = seller_id
+                cls._seller_id_by_phone_cache[key] = seller_id
+        return seller_ids
+
+    @classmethod
+    def exists_by_email_or_phone(cls, email: str, phone: str) -> bool:
+        """
+        Check whether a seller exists with either this email or this phone, in one query.
+        
+        Args:
+            email: Email address to check
+            phone: Phone number to check (any format)
+            
+        Returns:
+            True if a seller exists with this email or phone
+        """
+        try:
+            with db.session.no_autoflush:
+                return db.session.query(Seller.id).filter(
+                    or_(Seller.email == email, Seller.phone_normalized == phone_number_key(phone))
+                ).first() is not None
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to check seller existence by email/phone {email}/{phone}: {str(e)}")
+            raise
     
     @classmethod
     def get_by_email_or_phone(cls, email: str, phone: str) -> Optional[Seller]:
@@ -114,9 +274,9 @@ class SellerService(BaseService):
             Seller instance or None if not found
         """
         try:
-            normalized_phone = normalize_phone_number(phone)
+            normalized_phone = phone_number_key(phone)
             seller = Seller.query.filter(
-                or_(Seller.email == email, Seller.phone == normalized_phone)
+                or_(Seller.email == email, Seller.phone_normalized == normalized_phone)
             ).first()
             
             if seller:
@@ -1,8 +1,12 @@
 import logging
+import threading
+import time
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+
+import redis
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select
 
 from app import db
 from app.models.jwt_token_blocklist import TokenBlocklist
@@ -16,6 +20,222 @@ class TokenBlocklistService(BaseService):
     Service class for JWT token blacklist management.
     """
     model = TokenBlocklist
+
+    # Logout write-behind: jtis are queued in Redis and flushed to the DB in batches
+    PENDING_QUEUE_KEY = "logout:blocklist"
+    REVOKED_KEY_PREFIX = "revoked:"
+    # DB clock time up to which revoked:<jti> keys are in sync; absent means Redis isn't authoritative
+    SYNC_WATERMARK_KEY = "jwt:blocklist:synced_at"
+    # Each sync re-reads rows this far behind the watermark. created_at is the writing
+    # transaction's start time, so a slow insert can commit a row older than the watermark
+    SYNC_OVERLAP = timedelta(minutes=5)
+    # Fallback TTL when the token expiry is unknown (longest-lived token: refresh)
+    DEFAULT_CACHE_TTL_SECONDS = int(timedelta(days=7).total_seconds())
+    FLUSH_INTERVAL_SECONDS = 2
+    FLUSH_BATCH_SIZE = 500
+
+    _cache_client = None
+    _flusher_thread = None
+    _flusher_lock = threading.Lock()
+
+    @classmethod
+    def _get_cache_client(cls):
+        """Get Redis client for the token blocklist with lazy initialization."""
+        if cls._cache_client is None:
+            try:
+                cls._cache_client = redis.Redis(
+                    host='localhost',
+                    port=6379,
+                    db=4,  # Separate database for the JWT blocklist
+                    decode_responses=True,
+                    socket_timeout=2,
+                    socket_connect_timeout=2
+                )
+                cls._cache_client.ping()
+                logging.info("Redis client initialized for token blocklist")
+            except Exception as e:
+                logging.warning(f"Redis not available for token blocklist: {e}")
+                cls._cache_client = False  # Mark as unavailable
+        return cls._cache_client if cls._cache_client is not False else None
+
+    @classmethod
+    def _cache_ttl(cls, expires_at: Optional[int]) -> int:
+        """Seconds until the token expires, so cached entries clean themselves up."""
+        if not expires_at:
+            return cls.DEFAULT_CACHE_TTL_SECONDS
+        return max(int(expires_at - time.time()), 1)
+
+    @classmethod
+    def enqueue_token_for_blocklist(cls, jti: str, expires_at: Optional[int] = None) -> bool:
+        """
+        Mark a token as revoked in Redis and queue it for a batched DB insert.
+        
+        The Redis entry makes the revocation visible immediately; the durable
+        TokenBlocklist row is written later by flush_pending_tokens.
+        
+        Args:
+            jti: JWT Token ID
+            expires_at: Token "exp" claim (unix seconds), used as the cache TTL
+            
+        Returns:
+            True if queued, False if Redis is unavailable (caller should fall back
+            to add_token_to_blocklist)
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return False
+
+        try:
+            pipe = client.pipeline()
+            pipe.setex(f"{cls.REVOKED_KEY_PREFIX}{jti}", cls._cache_ttl(expires_at), "1")
+            pipe.rpush(cls.PENDING_QUEUE_KEY, jti)
+            pipe.execute()
+            logging.info(f"Queued token {jti} for blocklist")
+            return True
+        except Exception as e:
+            logging.error(f"Failed to queue token {jti} for blocklist: {e}")
+            return False
+
+    @classmethod
+    def is_token_revoked(cls, jti: str) -> bool:
+        """
+        Check whether a token is revoked, using Redis EXISTS once the Redis
+        denylist is in sync with the DB and falling back to the DB otherwise.
+        
+        Args:
+            jti: JWT Token ID
+            
+        Returns:
+            True if the token is revoked
+        """
+        client = cls._get_cache_client()
+        if client:
+            try:
+                pipe = client.pipeline()
+                pipe.exists(f"{cls.REVOKED_KEY_PREFIX}{jti}")
+                pipe.exists(cls.SYNC_WATERMARK_KEY)
+                revoked, synced = pipe.execute()
+                if revoked:
+                    return True
+                if synced:
+                    return False
+            except Exception as e:
+                logging.error(f"Token denylist lookup error for {jti}: {e}")
+
+        # Redis unavailable or not yet synced
+        return cls.is_token_blocklisted(jti)
+
+    @classmethod
+    def sync_denylist_cache(cls) -> int:
+        """
+        Copy blocklist rows written since the last sync into Redis as revoked:<jti>
+        keys. With no watermark (first run, or Redis was reset) this loads every
+        row young enough to belong to an unexpired token.
+        
+        The watermark is read from the DB clock, the same clock that fills
+        created_at, and every sync re-reads SYNC_OVERLAP before it; SETEX is
+        idempotent, so rows seen twice are harmless.
+        
+        Returns:
+            Number of jtis written to Redis
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return 0
+
+        try:
+            watermark = client.get(cls.SYNC_WATERMARK_KEY)
+            # created_at is a naive DB now(), so the watermark is the DB's LOCALTIMESTAMP, not the app clock
+            db_now = db.session.scalar(select(func.localtimestamp()))
+            if watermark:
+                since = datetime.fromisoformat(watermark) - cls.SYNC_OVERLAP
+            else:
+                since = db_now - timedelta(seconds=cls.DEFAULT_CACHE_TTL_SECONDS)
+            jtis = [jti for (jti,) in db.session.query(cls.model.jti).filter(cls.model.created_at >= since)]
+            # End the read transaction; the flusher thread keeps this session
+            db.session.commit()
+
+            pipe = client.pipeline()
+            for jti in jtis:
+                pipe.setex(f"{cls.REVOKED_KEY_PREFIX}{jti}", cls.DEFAULT_CACHE_TTL_SECONDS, "1")
+            pipe.set(cls.SYNC_WATERMARK_KEY, db_now.isoformat())
+            pipe.execute()
+            return len(jtis)
+        except Exception as e:
+            db.session.rollback()
+            logging.error(f"Failed to sync token denylist to Redis: {e}")
+            return 0
+
+    @classmethod
+    def flush_pending_tokens(cls, batch_size: Optional[int] = None) -> int:
+        """
+        Move up to batch_size queued jtis from Redis into the TokenBlocklist table
+        in a single transaction.
+        
+        Args:
+            batch_size: Maximum number of jtis to flush (defaults to FLUSH_BATCH_SIZE)
+            
+        Returns:
+            Number of tokens written to the database
+        """
+        client = cls._get_cache_client()
+        if not client:
+            return 0
+
+        batch_size = batch_size or cls.FLUSH_BATCH_SIZE
+        try:
+            # LRANGE + LTRIM in one MULTI so concurrent flushers never see the same jti
+            pipe = client.pipeline()
+            pipe.lrange(cls.PENDING_QUEUE_KEY, 0, batch_size - 1)
+            pipe.ltrim(cls.PENDING_QUEUE_KEY, batch_size, -1)
+            jtis, _ = pipe.execute()
+        except Exception as e:
+            logging.error(f"Failed to read pending blocklist queue: {e}")
+            return 0
+
+        if not jtis:
+            return 0
+
+        try:
+            return cls.bulk_add_tokens(list(dict.fromkeys(jtis)))
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.error(f"Failed to flush {len(jtis)} pending blocklist tokens, re-queuing: {str(e)}")
+            try:
+                client.lpush(cls.PENDING_QUEUE_KEY, *reversed(jtis))
+            except Exception as re:
+                logging.error(f"Failed to re-queue pending blocklist tokens: {re}")
+            return 0
+
+    @classmethod
+    def start_blocklist_flusher(cls, app) -> None:
+        """
+        Start the background thread that periodically flushes queued jtis and
+        keeps the Redis denylist in sync with the TokenBlocklist table.
+        Safe to call more than once; only one flusher runs per process.
+        Start it in each serving process after fork (gunicorn's post_worker_init
+        in gunicorn.conf.py), not from create_app.
+        
+        Args:
+            app: Flask application (needed for an app context in the thread)
+        """
+        with cls._flusher_lock:
+            if cls._flusher_thread and cls._flusher_thread.is_alive():
+                return
+
+            def _run():
+                while True:
+                    time.sleep(cls.FLUSH_INTERVAL_SECONDS)
+                    try:
+                        with app.app_context():
+                            cls.flush_pending_tokens()
+                            cls.sync_denylist_cache()
+                    except Exception as e:
+                        logging.error(f"Token blocklist flusher error: {e}")
+
+            cls._flusher_thread = threading.Thread(target=_run, name="token-blocklist-flusher", daemon=True)
+            cls._flusher_thread.start()
+            logging.info("Started token blocklist flusher thread")
     
     @classmethod
     def add_token_to_blocklist(cls, jti: str) -> TokenBlocklist:
@@ -93,6 +313,14 @@ class TokenBlocklistService(BaseService):
             
             db.session.delete(token_record)
             db.session.commit()  # Commit the transaction
+
+            # Drop the Redis denylist entry as well
+            client = cls._get_cache_client()
+            if client:
+                try:
+                    client.delete(f"{cls.REVOKED_KEY_PREFIX}{jti}")
+                except Exception as ce:
+                    logging.error(f"Failed to clear cached revocation for {jti}: {ce}")
             
             logging.warning(f"REMOVED token {jti} from blocklist - token is now active!")
             return True
@@ -0,0 +1,11 @@
+# Background tasks that run off the request thread
+
+from .reconcile import enqueue_exotel_recording, enqueue_mobile_app_call_reconciliation, \
+    retry_reconciliation_tasks, MIN_RECORDING_DURATION_SECONDS
+
+__all__ = [
+    'enqueue_exotel_recording',
+    'enqueue_mobile_app_call_reconciliation',
+    'retry_reconciliation_tasks',
+    'MIN_RECORDING_DURATION_SECONDS'
+]
@@ -0,0 +1,317 @@
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app import db
+from app.constants import AWSConstants, MeetingSource, CallDirection
+from app.external.runpod.runpod_client import get_runpod_client
+from app.services import BuyerService, SellerService, CallService, MeetingService, ReconciliationLockService, \
+    ReconciliationTaskService
+from app.utils.call_recording_utils import upload_fileobj_to_s3, download_exotel_recording, \
+    stream_exotel_to_s3, get_audio_duration_seconds, denormalize_phone_number
+
+logging = logging.getLogger(__name__)
+
+# Webhook reconciliation (Exotel download, S3 upload, RunPod dispatch) runs here
+# so the webhook can answer as soon as the request is validated
+_reconcile_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="call-reconcile")
+
+# RunPod dispatch is fire-and-forget, so a slow RunPod API doesn't hold a reconcile worker
+_diarization_dispatch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="runpod-dispatch")
+
+# Concurrent Exotel -> S3 streams for app call batches that reconcile several calls at once
+_recording_upload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="recording-upload")
+
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 2
+
+MIN_RECORDING_DURATION_SECONDS = 5
+
+
+def _run_with_retries(app, task_id, task, payload):
+    """
+    Run a reconciliation task in its own app context, retrying failures with
+    exponential backoff (2s, 4s, 8s) before giving up. Its ReconciliationTask
+    row is deleted on success; on giving up the failure is recorded on the row,
+    which is kept for `flask retry-reconciliation-tasks`.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            with app.app_context():
+                try:
+                    result = task(payload)
+                except Exception:
+                    db.session.rollback()
+                    raise
+                ReconciliationTaskService.complete_task(task_id)
+                return result
+        except Exception as e:
+            if attempt == MAX_RETRIES:
+                logging.exception(f"{task.__name__} failed after {MAX_RETRIES + 1} attempts, left for retry")
+                _record_task_failure(app, task_id, e)
+                return None
+            delay = RETRY_BACKOFF_SECONDS * (2 ** attempt)
+            logging.warning(f"{task.__name__} failed, retrying in {delay}s", exc_info=True)
+            time.sleep(delay)
+
+
+def _record_task_failure(app, task_id, error):
+    try:
+        with app.app_context():
+            ReconciliationTaskService.record_failure(task_id, repr(error))
+    except Exception:
+        # The row is still there, so the sweeper retries it either way
+        logging.exception(f"Failed to record failure of reconciliation task {task_id}")
+
+
+def _enqueue(task, payload):
+    """Store the task durably, then queue it on the reconcile executor."""
+    app = current_app._get_current_object()
+    task_id = ReconciliationTaskService.create_task(task.__name__, payload).id
+    return _reconcile_executor.submit(_run_with_retries, app, task_id, task, payload)
+
+
+def enqueue_exotel_recording(params):
+    """
+    Queue an Exotel recording webhook for background processing.
+
+    Args:
+        params: Validated webhook fields: call_sid (may be None), seller_id, call_from
+            (normalized), call_start_time (aware datetime), call_duration and call_recording_url
+    """
+    # Stored as JSON in reconciliation_tasks, so ids and times go in as strings
+    return _enqueue(process_exotel_recording, {
+        **params,
+        "seller_id": str(params["seller_id"]),
+        "call_start_time": params["call_start_time"].isoformat()
+    })
+
+
+def enqueue_mobile_app_call_reconciliation(mobile_call_ids):
+    """
+    Queue reconciliation of stored MobileAppCalls against pending Exotel calls.
+
+    Args:
+        mobile_call_ids: MobileAppCall UUIDs from one app call payload
+    """
+    return _enqueue(reconcile_mobile_app_calls, [str(mobile_call_id) for mobile_call_id in mobile_call_ids])
+
+
+def retry_reconciliation_tasks():
+    """
+    Run stored reconciliation tasks that gave up or were lost with their worker,
+    in this process and with the usual retries. Run by
+    `flask retry-reconciliation-tasks` on a schedule.
+
+    Returns:
+        Number of tasks that were retried
+    """
+    app = current_app._get_current_object()
+    tasks = ReconciliationTaskService.get_retryable_tasks()
+    for stored_task in tasks:
+        task = RECONCILIATION_TASKS.get(stored_task.task)
+        if not task:
+            logging.error(f"Unknown reconciliation task {stored_task.task} ({stored_task.id})")
+            continue
+        logging.info(f"Retrying reconciliation task {stored_task.task} ({stored_task.id})")
+        _run_with_retries(app, stored_task.id, task, stored_task.payload)
+    return len(tasks)
+
+
+def _start_diarization(job_id):
+    try:
+        get_runpod_client().start_diarization(job_id)
+    except Exception:
+        logging.exception(f"Failed to start diarization for job {job_id}")
+
+
+def _meeting_direction(call_type):
+    """Map an app call type to the Meeting direction; missed and rejected calls are incoming."""
+    if call_type == "outgoing":
+        return CallDirection.OUTGOING.value
+    if call_type in ("incoming", "missed", "rejected"):
+        return CallDirection.INCOMING.value
+    return None
+
+
+def _create_reconciled_meeting(user, mobile_call, exotel_call, s3_url, job_start_time=None):
+    """
+    Claim a matched call pair, then create its Meeting and Job, drop both temp
+    call rows and start diarization. Returns False if another worker already
+    reconciled the pair; raises ReconciliationClaimConflict (so the task is
+    retried) if another worker holds it without having finished.
+    """
+    logging.info(f"Creating new meeting and job entry for reconciled call for user {user.email}")
+    buyer = BuyerService.find_or_create_buyer(mobile_call.buyer_number, user.agency_id)
+
+    # Lock both rows and stage their deletion, so concurrent webhooks can't
+    # reconcile the same pair twice
+    if not CallService.claim_for_reconciliation(mobile_call, exotel_call):
+        return False
+
+    # Calculate original end_time from start_time + duration to avoid the 3-second reconciliation buffer
+    corrected_end_time = mobile_call.start_time + timedelta(seconds=mobile_call.duration)
+    # One commit inserts the Meeting and Job and deletes the claimed call rows
+    meeting = MeetingService.create_meeting_with_job(
+        buyer_id=buyer.id,
+        seller_id=user.id,
+        title=f"Meeting between {denormalize_phone_number(mobile_call.buyer_number)} and {user.name}",
+        start_time=mobile_call.start_time,
+        s3_audio_url=s3_url,
+        job_start_time=job_start_time,
+        end_time=corrected_end_time,
+        source=MeetingSource.PHONE,
+        direction=_meeting_direction(mobile_call.call_type)
+    )
+
+    # Dispatched only after the commit, so RunPod never sees an uncommitted job
+    logging.info("Initializing task for diarization.")
+    _diarization_dispatch_executor.submit(_start_diarization, meeting.job.id)
+    logging.info(f"Queued diarization for meeting ID: {meeting.id}")
+    return True
+
+
+def process_exotel_recording(params):
+    """
+    Store an Exotel recording and reconcile it with a pending mobile app call,
+    then record its CallSid as delivered. Safe to retry: an ExotelCall already
+    stored for the same caller and start time is reused instead of inserted again.
+    """
+    _store_and_reconcile_exotel_recording(params)
+    # Only after the work is done: a run that fails or is lost leaves the CallSid
+    # unrecorded, so Exotel's redelivery is processed instead of turned away
+    if params.get("call_sid"):
+        CallService.record_exotel_call_delivery(params["call_sid"])
+
+
+def _store_and_reconcile_exotel_recording(params):
+    call_from = params["call_from"]
+    call_start_time = datetime.fromisoformat(params["call_start_time"])
+    call_duration = params["call_duration"]
+    call_recording_url = params["call_recording_url"]
+
+    user = SellerService.get_by_id(params["seller_id"])
+    if not user:
+        logging.error(f"No user found with phone number: {call_from}")
+        return
+
+    logging.info("Downloading exotel audio file")
+    # The recording is read twice (duration, then S3 upload) but never written to a named temp file
+    with download_exotel_recording(call_recording_url) as recording:
+        duration_seconds = get_audio_duration_seconds(recording)
+        if duration_seconds < MIN_RECORDING_DURATION_SECONDS:
+            logging.error(f"Call duration too low to process: {duration_seconds} seconds")
+            return
+
+        logging.info(f"duration of recorded audio file is {duration_seconds}")
+        call_end_time = call_start_time + timedelta(seconds=duration_seconds)
+
+        exotel_call = CallService.get_exotel_call_by_details(call_from, call_start_time)
+        if not exotel_call:
+            logging.info(f"Creating Exotel call record for user {user.email}")
+            exotel_call = CallService.create_exotel_call(
+                call_from=call_from,
+                start_time=call_start_time,
+                end_time=call_end_time,
+                duration=int(call_duration) if call_duration else 0,
+                call_recording_url=call_recording_url
+            )
+
+        logging.info("Searching for matching mobile app call")
+        matching_app_call = CallService.find_matching_mobile_app_call(
+            seller_number=call_from,
+            start_time=call_start_time,
+            end_time=call_end_time
+        )
+        if not matching_app_call:
+            logging.info(f"No matching app call found. Saving in Exotel call temp table with id {exotel_call.id}")
+            return
+
+        logging.info(f"matching app call found with id: {matching_app_call.id}")
+        # Keeps a concurrent app call reconciliation of the same pair from uploading too.
+        # The id is captured up front: the row is deleted once the meeting is committed
+        exotel_call_id = exotel_call.id
+        acquired, lock_token = ReconciliationLockService.acquire(exotel_call_id)
+        if not acquired:
+            logging.info(f"ExotelCall {exotel_call_id} is being reconciled by another worker")
+            return
+
+        try:
+            s3_key = f"recordings/exotel/{call_from}/{matching_app_call.id or exotel_call_id}.mp3"
+            # End the read transaction so nothing is held open across the upload;
+            # rows are locked only when the pair is claimed
+            db.session.commit()
+
+            logging.info("Saving audio file to S3 after matching app call log has been found")
+            recording.seek(0)
+            s3_url = upload_fileobj_to_s3(recording, AWSConstants.AUDIO_FILES_S3_BUCKET, s3_key)
+
+            _create_reconciled_meeting(user, matching_app_call, exotel_call, s3_url, job_start_time=call_start_time)
+        finally:
+            ReconciliationLockService.release(exotel_call_id, lock_token)
+
+
+def reconcile_mobile_app_calls(mobile_call_ids):
+    """
+    Reconcile stored MobileAppCalls with pending Exotel calls, using one query
+    for all of them. Calls that were already reconciled (and so deleted) are
+    skipped, which makes retries safe.
+    """
+    mobile_calls = CallService.get_mobile_app_calls_by_ids(mobile_call_ids)
+    if not mobile_calls:
+        logging.info("MobileAppCalls already reconciled")
+        return
+
+    logging.info("Searching for matching exotel calls")
+    matches = CallService.find_matching_exotel_calls(mobile_calls)
+
+    reconciled = []
+    # (ExotelCall id, lock token) per reconciled pair; the ids are captured here
+    # because reconciled rows are deleted by the time the locks are released
+    locks = []
+    for mobile_call in mobile_calls:
+        matching_exotel_call = matches.get(mobile_call.id)
+        if not matching_exotel_call:
+            logging.info(
+                f"No matching Exotel call found. Mobile call saved for future reconciliation with id: {mobile_call.id}"
+            )
+            continue
+
+        logging.info(f"matching exotel call found with id: {matching_exotel_call.id}")
+        # Keeps a concurrent Exotel webhook for the same call from uploading too
+        acquired, lock_token = ReconciliationLockService.acquire(matching_exotel_call.id)
+        if not acquired:
+            logging.info(f"ExotelCall {matching_exotel_call.id} is being reconciled by another worker")
+            continue
+        s3_key = f"recordings/exotel/{mobile_call.seller_number}/{mobile_call.mobile_app_call_id or uuid.uuid4()}.mp3"
+        locks.append((matching_exotel_call.id, lock_token))
+        reconciled.append((mobile_call, matching_exotel_call, matching_exotel_call.call_recording_url, s3_key))
+
+    if not reconciled:
+        return
+
+    # End the read transaction so nothing is held open across the uploads;
+    # rows are locked only when each pair is claimed
+    db.session.commit()
+
+    try:
+        # The recordings are independent, so stream them to S3 concurrently rather than one after another
+        s3_urls = list(_recording_upload_executor.map(
+            lambda item: stream_exotel_to_s3(item[2], AWSConstants.AUDIO_FILES_S3_BUCKET, item[3]),
+            reconciled
+        ))
+
+        for (mobile_call, matching_exotel_call, _, _), s3_url in zip(reconciled, s3_urls):
+            user = SellerService.get_by_id(mobile_call.user_id)
+            _create_reconciled_meeting(user, mobile_call, matching_exotel_call, s3_url)
+    finally:
+        for exotel_call_id, lock_token in locks:
+            ReconciliationLockService.release(exotel_call_id, lock_token)
+
+
+# Task functions by name, for running tasks stored in reconciliation_tasks
+RECONCILIATION_TASKS = {task.__name__: task for task in (process_exotel_recording, reconcile_mobile_app_calls)}
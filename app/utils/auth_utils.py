@@ -1,7 +1,11 @@
+import atexit
 import json
+import queue
 import random
 import string
 import logging
+import threading
+import time
 
 import smtplib
 from email.mime.text import MIMEText
@@ -12,6 +16,9 @@ from app.external.aws.s3_client import S3Client
 
 logging = logging.getLogger(__name__)
 
+# Applies to the SMTP connect and every command, so a hung SES connection can't stall the email worker
+SMTP_TIMEOUT_SECONDS = 10
+
 
 def generate_secure_otp(length=8):
     characters = string.ascii_letters + string.digits  # A-Z, a-z, 0-9
@@ -26,44 +33,15 @@ def generate_secure_otp(length=8):
     return otp
 
 
-def send_otp_email(to_email, otp):
-    logging.info(f"Sending otp to {to_email}")
-    subject = "System Generated Password for Logging in to Chirpworks"
-    body = f"Your System Generated Password is: {otp}"
-
-    msg = MIMEText(body)
-    msg['Subject'] = subject
+def _build_otp_message(to_email, otp):
+    msg = MIMEText(f"Your System Generated Password is: {otp}")
+    msg['Subject'] = "System Generated Password for Logging in to Chirpworks"
     msg['From'] = 'noreply@chirpworks.ai'
     msg['To'] = to_email
-
-    try:
-        if not AWSConstants.SMTP_USERNAME or not AWSConstants.SMTP_PASSWORD:
-            logging.error("SMTP credentials not configured")
-            return False
-        assert AWSConstants.SMTP_USERNAME is not None
-        assert AWSConstants.SMTP_PASSWORD is not None
-        with smtplib.SMTP_SSL(AWSConstants.SMTP_SERVER, AWSConstants.SMTP_PORT) as server:
-            server.login(AWSConstants.SMTP_USERNAME, AWSConstants.SMTP_PASSWORD)
-            server.sendmail(msg['From'], to_email, msg.as_string())
-        return True
-    except Exception as e:
-        logging.info(f"SES email failed: {e}")
-        return False
+    return msg
 
 
-def send_password_reset_confirmation_email(to_email, user_name):
-    """
-    Send a confirmation email after password has been successfully reset.
-    
-    Args:
-        to_email: User's email address
-        user_name: User's display name
-        
-    Returns:
-        bool: True if email sent successfully, False otherwise
-    """
-    logging.info(f"Sending password reset confirmation email to {to_email}")
-    subject = "Password Reset Successful - Chirpworks"
+def _build_password_reset_confirmation_message(to_email, user_name):
     body = f"""Hello {user_name},
 
 Your password has been successfully reset for your Chirpworks account.
@@ -81,24 +59,158 @@ Best regards,
 The Chirpworks Team"""
 
     msg = MIMEText(body)
-    msg['Subject'] = subject
+    msg['Subject'] = "Password Reset Successful - Chirpworks"
     msg['From'] = 'noreply@chirpworks.ai'
     msg['To'] = to_email
+    return msg
+
+
+def _smtp_configured():
+    if not AWSConstants.SMTP_USERNAME or not AWSConstants.SMTP_PASSWORD:
+        logging.error("SMTP credentials not configured")
+        return False
+    return True
 
+
+def _open_smtp_connection():
+    server = smtplib.SMTP_SSL(AWSConstants.SMTP_SERVER, AWSConstants.SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
     try:
-        if not AWSConstants.SMTP_USERNAME or not AWSConstants.SMTP_PASSWORD:
-            logging.error("SMTP credentials not configured")
+        server.login(AWSConstants.SMTP_USERNAME, AWSConstants.SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+class EmailWorker:
+    """
+    Single background consumer for outgoing emails.
+
+    Messages go through a bounded queue and are sent over one long-lived SMTP
+    connection, so bursts of signups share a TLS handshake and are paced to
+    the SES send rate instead of opening a connection per email.
+    """
+    MAX_QUEUE_SIZE = 1000
+    SEND_RATE_PER_SECOND = 14  # SES default sending rate
+    IDLE_DISCONNECT_SECONDS = 30  # Close the connection before the server drops it
+
+    _STOP = object()
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._server = None
+        atexit.register(self.shutdown)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="email-worker", daemon=True)
+                self._thread.start()
+
+    def has_capacity(self):
+        """Whether the queue can take another email right now."""
+        return not self._queue.full()
+
+    def submit(self, msg):
+        """
+        Queue a message for sending.
+
+        Args:
+            msg: MIMEText message with From and To set
+
+        Returns:
+            bool: False if the queue is full and the message was dropped
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(msg)
+            return True
+        except queue.Full:
+            logging.error(f"Email queue full, dropping email to {msg['To']}")
             return False
-        assert AWSConstants.SMTP_USERNAME is not None
-        assert AWSConstants.SMTP_PASSWORD is not None
-        with smtplib.SMTP_SSL(AWSConstants.SMTP_SERVER, AWSConstants.SMTP_PORT) as server:
-            server.login(AWSConstants.SMTP_USERNAME, AWSConstants.SMTP_PASSWORD)
-            server.sendmail(msg['From'], to_email, msg.as_string())
-        logging.info(f"Password reset confirmation email sent successfully to {to_email}")
-        return True
-    except Exception as e:
-        logging.error(f"Failed to send password reset confirmation email to {to_email}: {e}")
-        return False
+
+    def shutdown(self, timeout=10):
+        """Send whatever is already queued, then stop the worker, waiting at most about 2 x timeout."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            # The worker is stuck or far behind; don't hold up interpreter exit for it
+            logging.error(f"Email queue still full after {timeout}s, exiting with {self._queue.qsize()} emails unsent")
+            return
+        self._thread.join(timeout)
+
+    def _disconnect(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    def _send(self, msg):
+        if not _smtp_configured():
+            return
+        for attempt in range(2):
+            try:
+                if self._server is None:
+                    self._server = _open_smtp_connection()
+                self._server.sendmail(msg['From'], msg['To'], msg.as_string())
+                logging.info(f"Email sent to {msg['To']}")
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Connection went stale; reconnect once and retry
+                self._server = None
+            except Exception as e:
+                logging.error(f"Failed to send email to {msg['To']}: {e}")
+                self._disconnect()
+                return
+        logging.error(f"Failed to send email to {msg['To']}: SMTP connection lost")
+
+    def _run(self):
+        min_interval = 1.0 / self.SEND_RATE_PER_SECOND
+        while True:
+            try:
+                msg = self._queue.get(timeout=self.IDLE_DISCONNECT_SECONDS)
+            except queue.Empty:
+                self._disconnect()
+                continue
+            if msg is self._STOP:
+                self._disconnect()
+                return
+            started = time.monotonic()
+            self._send(msg)
+            elapsed = time.monotonic() - started
+            if elapsed < min_interval:
+                time.sleep(min_interval - elapsed)
+
+
+email_worker = EmailWorker()
+
+
+def queue_otp_email(to_email, otp):
+    """
+    Queue the OTP email on the shared email worker.
+
+    Returns:
+        bool: False if the email queue is full
+    """
+    logging.info(f"Queueing otp email to {to_email}")
+    return email_worker.submit(_build_otp_message(to_email, otp))
+
+
+def queue_password_reset_confirmation_email(to_email, user_name):
+    """
+    Queue the password reset confirmation email on the shared email worker.
+
+    Returns:
+        bool: False if the email queue is full
+    """
+    logging.info(f"Queueing password reset confirmation email to {to_email}")
+    return email_worker.submit(_build_password_reset_confirmation_message(to_email, user_name))
 
 
 def add_agency_to_list(agency_id, agency_name):
@@ -112,6 +224,12 @@ def add_agency_to_list(agency_id, agency_name):
     )
 
 
+# Claims embedded in both access and refresh tokens (see generate_user_claims)
+USER_CLAIM_KEYS = (
+    "user_id", "user_name", "user_email", "user_role", "user_phone", "agency_id", "agency_name"
+)
+
+
 def generate_user_claims(user: Seller):
     user_claims = {
         "user_id": str(user.id),
@@ -1,16 +1,47 @@
 import logging
+import re
 import tempfile
 
 import requests
+from boto3.s3.transfer import TransferConfig
 
 from pydub import AudioSegment
 
 from app.constants import ExotelCreds
-from app.external.aws.s3_client import S3Client
+from app.external.aws.s3_client import get_s3_client
 from app.constants import MobileAppCallStatus
 
 logging = logging.getLogger(__name__)
 
+_MIB = 1024 * 1024
+
+# Exotel recordings are buffered in memory up to this size before spilling to disk
+RECORDING_SPOOL_MAX_BYTES = 16 * _MIB
+
+# Recordings above 8 MiB go up as parallel 64 MiB parts instead of a single PUT
+RECORDING_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * _MIB,
+    multipart_chunksize=64 * _MIB,
+    max_concurrency=16,
+    use_threads=True
+)
+
+_NON_DIGIT_RE = re.compile(r'\D')
+# Every byte except ASCII 0-9, for stripping formatting from ASCII phone numbers with bytes.translate
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not 0x30 <= b <= 0x39)
+
+
+def _digits_only(phone_number):
+    """
+    Strip everything but digits. Already-normalized numbers are returned as-is and
+    ASCII input goes through a C-level bytes.translate; the regex only sees other Unicode.
+    """
+    if phone_number.isdecimal():
+        return phone_number
+    if phone_number.isascii():
+        return phone_number.encode('ascii').translate(None, _NON_DIGIT_BYTES).decode('ascii')
+    return _NON_DIGIT_RE.sub('', phone_number)
+
 
 def find_or_create_buyer(buyer_phone, seller_agency_id):
     """
@@ -23,64 +54,86 @@ def find_or_create_buyer(buyer_phone, seller_agency_id):
     return BuyerService.find_or_create_buyer(buyer_phone, seller_agency_id)
 
 
-def download_exotel_file_from_url(url: str):
+def _exotel_authenticated_url(url: str):
     url = url.split("https://")[1]
-    url = f"https://{ExotelCreds.EXOTEL_API_KEY}:{ExotelCreds.EXOTEL_API_TOKEN}@{url}"
-    return download_file_from_url(url)
+    return f"https://{ExotelCreds.EXOTEL_API_KEY}:{ExotelCreds.EXOTEL_API_TOKEN}@{url}"
 
 
-def download_file_from_url(url):
+def download_exotel_recording(url: str):
     """
-    Download a file from a URL to a temporary file location
-    Returns the path to the temporary file
+    Download an Exotel recording into a SpooledTemporaryFile, which stays in
+    memory for typical call lengths and only spills to disk for long ones.
+    The caller closes it (use it as a context manager); there is no path to clean up.
     """
+    spool = tempfile.SpooledTemporaryFile(max_size=RECORDING_SPOOL_MAX_BYTES, suffix='.mp3')
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-
-        # Create a temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-        logging.info(f"Download file to {temp_file.name}")
-
-        # Write the content to the temporary file
-        for chunk in response.iter_content(chunk_size=8192):
-            temp_file.write(chunk)
-
-        temp_file.close()
-        return temp_file.name
-    except Exception as e:
-        logging.error(f"Failed to downlaod file at url: {url}")
-
-
-def upload_file_to_s3(file_path, bucket_name, s3_key):
+        with requests.get(_exotel_authenticated_url(url), stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                spool.write(chunk)
+        spool.seek(0)
+        return spool
+    except Exception:
+        spool.close()
+        raise
+
+
+def upload_fileobj_to_s3(fileobj, bucket_name, s3_key):
     """
-    Upload a file to S3 bucket
+    Upload a file-like object to S3 bucket from its current position
     Returns the S3 URL of the uploaded file
     """
     logging.info("Uploading file to S3")
-    s3_client = S3Client()
-    # Upload the file to S3
-    s3_client.upload_file(
+    get_s3_client().upload_fileobj(
         bucket_name=bucket_name,
-        file_path=file_path,
-        object_name=s3_key
+        fileobj=fileobj,
+        object_name=s3_key,
+        config=RECORDING_TRANSFER_CONFIG
     )
-    # Generate the S3 URL
-    s3_url = f"s3://{bucket_name}/{s3_key}"
-    return s3_url
+    return f"s3://{bucket_name}/{s3_key}"
 
 
-def get_audio_duration_seconds(filepath):
-    audio = AudioSegment.from_file(filepath)
+def stream_exotel_to_s3(url: str, bucket_name, s3_key):
+    """
+    Stream an Exotel recording straight into an S3 multipart upload, without
+    a temp file; parts are uploaded while the rest is still downloading.
+    Returns the S3 URL of the uploaded file
+    """
+    logging.info("Streaming Exotel recording to S3")
+    with requests.get(_exotel_authenticated_url(url), stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        get_s3_client().upload_fileobj(
+            bucket_name=bucket_name,
+            fileobj=response.raw,
+            object_name=s3_key,
+            config=RECORDING_TRANSFER_CONFIG
+        )
+    return f"s3://{bucket_name}/{s3_key}"
+
+
+def get_audio_duration_seconds(file):
+    """Duration of an audio file, given its path or a file-like object."""
+    audio = AudioSegment.from_file(file)
     return len(audio) / 1000.0
 
 
 def normalize_phone_number(phone_number):
-    if len(phone_number) >= 10:
-        phone_number = '0091' + phone_number[len(phone_number)-10:]
+    """
+    Normalize to '0091' + last 10 digits. Formatting characters are stripped
+    first, so '+91 98765 43210' and '9876543210' normalize identically.
+    """
+    digits = _digits_only(phone_number)
+    if len(digits) >= 10:
+        phone_number = '0091' + digits[-10:]
     return phone_number
 
 
+def phone_number_key(phone_number):
+    """Digits-only last 10 digits of a phone number; matches sellers.phone_normalized."""
+    return _digits_only(phone_number or '')[-10:]
+
+
 def denormalize_phone_number(phone_number):
     if len(phone_number) >= 10:
         phone_number = '+91 ' + phone_number[len(phone_number)-10:]
@@ -0,0 +1,37 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Datetimes are passed through to DefaultJSONProvider.default so responses
+    keep Flask's existing date format; UUIDs, dataclasses and plain containers
+    are encoded natively by orjson.
+    """
+
+    def _options(self, sort_keys=None, indent=None):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        option = self._options(kwargs.get("sort_keys"), kwargs.get("indent"))
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Build the jsonify() response straight from orjson's bytes, skipping
+        the str round-trip and re-encode that the default provider does.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent=indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
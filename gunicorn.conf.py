@@ -0,0 +1,18 @@
+# Gunicorn server hooks for the chirp app. The container runs gunicorn with
+# --preload, so create_app() runs once in the master and workers are forked from it.
+
+
+def post_fork(server, worker):
+    # Don't let a forked worker reuse pooled DB connections opened in the master
+    from app.extensions import db
+
+    app = worker.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # Background threads run in each worker, never in the master (or in flask CLI commands)
+    from app.services.token_service import TokenBlocklistService
+
+    TokenBlocklistService.start_blocklist_flusher(worker.wsgi)
@@ -0,0 +1,105 @@
+"""create app_calls partitions by moving rows out of the default partition
+
+Revision ID: a0b1c2d3e4f5
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a0b1c2d3e4f5'
+down_revision = 'f8a9b0c1d2e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Make create_app_calls_partition safe once rows have landed in
+    app_calls_default. Postgres rejects CREATE TABLE ... PARTITION OF for a
+    range that overlaps rows in the DEFAULT partition, so the month's table is
+    created standalone, the month's rows are moved into it from the default
+    partition, and it is then attached (which builds the parent's indexes and
+    constraints on it).
+
+    ensure_app_calls_partitions takes a transaction-level advisory lock, since
+    scheduled runs (flask ensure-app-call-partitions) can overlap.
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_app_calls_partition(month_start date)
+        RETURNS void AS $$
+        DECLARE
+            from_date date := date_trunc('month', month_start)::date;
+            to_date date := (date_trunc('month', month_start) + interval '1 month')::date;
+            partition_name text := 'app_calls_' || to_char(from_date, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN;
+            END IF;
+
+            EXECUTE format('CREATE TABLE %I (LIKE app_calls INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM app_calls_default WHERE start_time >= %L AND start_time < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                from_date, to_date, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE app_calls ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, from_date, to_date
+            );
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_app_calls_partitions(months_ahead integer DEFAULT 3)
+        RETURNS void AS $$
+        DECLARE
+            i integer;
+        BEGIN
+            -- Serializes concurrent runs from several app processes
+            PERFORM pg_advisory_xact_lock(hashtext('ensure_app_calls_partitions'));
+            FOR i IN 0..months_ahead LOOP
+                PERFORM create_app_calls_partition((now() + make_interval(months => i))::date);
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Catch up on any month that fell behind before this revision
+    op.execute("SELECT ensure_app_calls_partitions(3);")
+
+
+def downgrade():
+    """
+    Restore the original partition functions.
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_app_calls_partition(month_start date)
+        RETURNS void AS $$
+        DECLARE
+            from_date date := date_trunc('month', month_start)::date;
+            to_date date := (date_trunc('month', month_start) + interval '1 month')::date;
+            partition_name text := 'app_calls_' || to_char(from_date, 'YYYY_MM');
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF app_calls FOR VALUES FROM (%L) TO (%L)',
+                partition_name, from_date, to_date
+            );
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_app_calls_partitions(months_ahead integer DEFAULT 3)
+        RETURNS void AS $$
+        DECLARE
+            i integer;
+        BEGIN
+            FOR i IN 0..months_ahead LOOP
+                PERFORM create_app_calls_partition((now() + make_interval(months => i))::date);
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
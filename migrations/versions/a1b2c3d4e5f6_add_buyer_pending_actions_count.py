@@ -0,0 +1,71 @@
+"""add trigger-maintained pending_actions_count to buyers
+
+Revision ID: a1b2c3d4e5f6
+Revises: f3a4b5c6d7e8
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1b2c3d4e5f6'
+down_revision = 'f3a4b5c6d7e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add buyers.pending_actions_count, kept in step with actions by a trigger
+    (so bulk deletes and cascades are counted too), and backfill it.
+    """
+    op.add_column('buyers', sa.Column('pending_actions_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION buyers_sync_pending_actions_count()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.status = 'PENDING' THEN
+                    UPDATE buyers SET pending_actions_count = pending_actions_count - 1
+                    WHERE id = OLD.buyer_id;
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.status = 'PENDING' THEN
+                    UPDATE buyers SET pending_actions_count = pending_actions_count + 1
+                    WHERE id = NEW.buyer_id;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER actions_pending_count_trg
+        AFTER INSERT OR DELETE OR UPDATE OF status, buyer_id ON actions
+        FOR EACH ROW EXECUTE FUNCTION buyers_sync_pending_actions_count();
+    """)
+
+    op.execute("""
+        UPDATE buyers b
+        SET pending_actions_count = a.pending_count
+        FROM (
+            SELECT buyer_id, count(*) AS pending_count
+            FROM actions
+            WHERE status = 'PENDING'
+            GROUP BY buyer_id
+        ) a
+        WHERE b.id = a.buyer_id;
+    """)
+
+
+def downgrade():
+    """
+    Drop the pending actions trigger and buyers.pending_actions_count.
+    """
+    op.execute("DROP TRIGGER IF EXISTS actions_pending_count_trg ON actions;")
+    op.execute("DROP FUNCTION IF EXISTS buyers_sync_pending_actions_count();")
+    op.drop_column('buyers', 'pending_actions_count')
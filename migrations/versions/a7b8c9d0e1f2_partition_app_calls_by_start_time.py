@@ -0,0 +1,140 @@
+"""partition app_calls by start_time (monthly range)
+
+Revision ID: a7b8c9d0e1f2
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7b8c9d0e1f2'
+down_revision = 'f1a2b3c4d5e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Convert app_calls into a table partitioned by RANGE (start_time) with one
+    partition per month, so analytics date-range queries only touch the
+    relevant partitions.
+
+    meetings is intentionally left unpartitioned: jobs, actions and
+    call_performance reference meetings.id, and a partitioned table can only
+    back a foreign key with a unique constraint that includes start_time.
+    """
+    op.execute("ALTER TABLE app_calls RENAME TO app_calls_unpartitioned;")
+
+    op.execute("""
+        CREATE TABLE app_calls (
+            LIKE app_calls_unpartitioned INCLUDING DEFAULTS
+        ) PARTITION BY RANGE (start_time);
+    """)
+
+    # Creates the partition covering the month of the given date; the scheduled
+    # `flask ensure-app-call-partitions` command runs ensure_app_calls_partitions()
+    # to keep partitions ahead of inserts
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_app_calls_partition(month_start date)
+        RETURNS void AS $$
+        DECLARE
+            from_date date := date_trunc('month', month_start)::date;
+            to_date date := (date_trunc('month', month_start) + interval '1 month')::date;
+            partition_name text := 'app_calls_' || to_char(from_date, 'YYYY_MM');
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF app_calls FOR VALUES FROM (%L) TO (%L)',
+                partition_name, from_date, to_date
+            );
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_app_calls_partitions(months_ahead integer DEFAULT 3)
+        RETURNS void AS $$
+        DECLARE
+            i integer;
+        BEGIN
+            FOR i IN 0..months_ahead LOOP
+                PERFORM create_app_calls_partition((now() + make_interval(months => i))::date);
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Partitions for all existing data, plus a few months ahead
+    op.execute("""
+        DO $$
+        DECLARE
+            month_cursor date;
+        BEGIN
+            SELECT date_trunc('month', COALESCE(min(start_time), now()))::date
+            INTO month_cursor FROM app_calls_unpartitioned;
+            WHILE month_cursor <= date_trunc('month', now())::date LOOP
+                PERFORM create_app_calls_partition(month_cursor);
+                month_cursor := (month_cursor + interval '1 month')::date;
+            END LOOP;
+            PERFORM ensure_app_calls_partitions(3);
+        END $$;
+    """)
+
+    # Safety net so inserts never fail if the monthly job falls behind
+    op.execute("CREATE TABLE IF NOT EXISTS app_calls_default PARTITION OF app_calls DEFAULT;")
+
+    op.execute("INSERT INTO app_calls SELECT * FROM app_calls_unpartitioned;")
+    op.execute("DROP TABLE app_calls_unpartitioned;")
+
+    # Constraints are added after the old table is gone so app_calls_pkey is free;
+    # the primary key has to include the partition key
+    op.execute("ALTER TABLE app_calls ADD PRIMARY KEY (id, start_time);")
+    op.execute("""
+        ALTER TABLE app_calls
+        ADD CONSTRAINT app_calls_user_id_fkey FOREIGN KEY (user_id) REFERENCES sellers (id);
+    """)
+
+    # Recreate the analytics indexes on the partitioned parent (propagated to every partition)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_app_calls_user_time_covering
+        ON app_calls (user_id, start_time) INCLUDE (call_type, status, buyer_number);
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_app_calls_start_time_brin
+        ON app_calls USING brin (start_time);
+    """)
+
+    op.execute("ANALYZE app_calls;")
+
+
+def downgrade():
+    """
+    Convert app_calls back into a regular table.
+    """
+    op.execute("ALTER TABLE app_calls RENAME TO app_calls_partitioned;")
+
+    op.execute("""
+        CREATE TABLE app_calls (
+            LIKE app_calls_partitioned INCLUDING DEFAULTS
+        );
+    """)
+    op.execute("INSERT INTO app_calls SELECT * FROM app_calls_partitioned;")
+    op.execute("DROP TABLE app_calls_partitioned CASCADE;")
+    op.execute("ALTER TABLE app_calls ADD PRIMARY KEY (id);")
+    op.execute("""
+        ALTER TABLE app_calls
+        ADD CONSTRAINT app_calls_user_id_fkey FOREIGN KEY (user_id) REFERENCES sellers (id);
+    """)
+
+    op.execute("DROP FUNCTION IF EXISTS ensure_app_calls_partitions(integer);")
+    op.execute("DROP FUNCTION IF EXISTS create_app_calls_partition(date);")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_app_calls_user_time_covering
+        ON app_calls (user_id, start_time) INCLUDE (call_type, status, buyer_number);
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_app_calls_start_time_brin
+        ON app_calls USING brin (start_time);
+    """)
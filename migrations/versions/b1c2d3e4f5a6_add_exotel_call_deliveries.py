@@ -0,0 +1,46 @@
+"""move Exotel CallSid dedupe from exotel_calls to exotel_call_deliveries
+
+Revision ID: b1c2d3e4f5a6
+Revises: a0b1c2d3e4f5
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b1c2d3e4f5a6'
+down_revision = 'a0b1c2d3e4f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Record accepted Exotel recording webhooks by CallSid in their own table.
+    exotel_calls rows are deleted when a call is reconciled, so a CallSid stored
+    there could not catch a redelivery that arrives after reconciliation.
+    """
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS exotel_call_deliveries (
+            call_sid VARCHAR(64) PRIMARY KEY,
+            received_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        );
+    """)
+
+    op.execute("DROP INDEX IF EXISTS uq_exotel_calls_call_sid;")
+    op.execute("ALTER TABLE exotel_calls DROP COLUMN IF EXISTS call_sid;")
+
+
+def downgrade():
+    """
+    Restore exotel_calls.call_sid and drop exotel_call_deliveries.
+    """
+    op.execute("ALTER TABLE exotel_calls ADD COLUMN IF NOT EXISTS call_sid VARCHAR(64);")
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_exotel_calls_call_sid
+        ON exotel_calls (call_sid);
+    """)
+
+    op.execute("DROP TABLE IF EXISTS exotel_call_deliveries;")
@@ -0,0 +1,34 @@
+"""add (buyer_id, start_time DESC) index to meetings
+
+Revision ID: b2c3d4e5f6a7
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2c3d4e5f6a7'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Index meetings by (buyer_id, start_time DESC) so "latest meeting per buyer"
+    lookups are a single index probe.
+    """
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_meetings_buyer_start_time
+        ON meetings (buyer_id, start_time DESC) INCLUDE (seller_id);
+    """)
+
+
+def downgrade():
+    """
+    Drop the meetings (buyer_id, start_time) index.
+    """
+    op.execute("DROP INDEX IF EXISTS idx_meetings_buyer_start_time;")
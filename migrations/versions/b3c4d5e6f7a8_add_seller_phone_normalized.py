@@ -0,0 +1,41 @@
+"""add generated phone_normalized column to sellers
+
+Revision ID: b3c4d5e6f7a8
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3c4d5e6f7a8'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add sellers.phone_normalized (last 10 digits of phone) as a stored generated
+    column with a unique index, so phone lookups match regardless of formatting.
+    """
+    op.execute(r"""
+        ALTER TABLE sellers
+        ADD COLUMN IF NOT EXISTS phone_normalized VARCHAR(20)
+        GENERATED ALWAYS AS (right(regexp_replace(phone, '\D', '', 'g'), 10)) STORED;
+    """)
+
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS sellers_phone_norm_idx
+        ON sellers (phone_normalized);
+    """)
+
+
+def downgrade():
+    """
+    Drop sellers.phone_normalized and its index.
+    """
+    op.execute("DROP INDEX IF EXISTS sellers_phone_norm_idx;")
+    op.drop_column('sellers', 'phone_normalized')
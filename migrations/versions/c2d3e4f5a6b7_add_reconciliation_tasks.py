@@ -0,0 +1,45 @@
+"""add reconciliation_tasks for retrying lost webhook reconciliation work
+
+Revision ID: c2d3e4f5a6b7
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2d3e4f5a6b7'
+down_revision = 'b1c2d3e4f5a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Persist each queued reconciliation task until it succeeds, so work that
+    gives up or is lost with its worker can be retried by a sweeper.
+    """
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS reconciliation_tasks (
+            id UUID PRIMARY KEY,
+            task VARCHAR(64) NOT NULL,
+            payload JSON NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        );
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_reconciliation_tasks_updated_at
+        ON reconciliation_tasks (updated_at);
+    """)
+
+
+def downgrade():
+    """
+    Drop reconciliation_tasks.
+    """
+    op.execute("DROP TABLE IF EXISTS reconciliation_tasks;")
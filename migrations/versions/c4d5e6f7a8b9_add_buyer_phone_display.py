@@ -0,0 +1,38 @@
+"""add generated phone_display column to buyers
+
+Revision ID: c4d5e6f7a8b9
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d5e6f7a8b9'
+down_revision = 'b2c3d4e5f6a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add buyers.phone_display, the '+91 <last 10>' display form produced by
+    denormalize_phone_number, as a stored generated column so read endpoints
+    can return it as-is.
+    """
+    op.execute("""
+        ALTER TABLE buyers
+        ADD COLUMN IF NOT EXISTS phone_display VARCHAR(20)
+        GENERATED ALWAYS AS (
+            CASE WHEN length(phone) >= 10 THEN '+91 ' || right(phone, 10) ELSE phone END
+        ) STORED;
+    """)
+
+
+def downgrade():
+    """
+    Drop buyers.phone_display.
+    """
+    op.drop_column('buyers', 'phone_display')
@@ -0,0 +1,33 @@
+"""add created_at index to token_blocklist
+
+Revision ID: c5d6e7f8a9b0
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d6e7f8a9b0'
+down_revision = 'b3c4d5e6f7a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Index token_blocklist.created_at for the incremental Redis denylist sync.
+    """
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_token_blocklist_created_at
+        ON token_blocklist (created_at);
+    """)
+
+
+def downgrade():
+    """
+    Drop the token_blocklist.created_at index.
+    """
+    op.execute("DROP INDEX IF EXISTS idx_token_blocklist_created_at;")
@@ -0,0 +1,44 @@
+"""add covering index for the agency buyer list
+
+Revision ID: d6e7f8a9b0c1
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6e7f8a9b0c1'
+down_revision = 'c4d5e6f7a8b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Replace idx_buyers_agency_last_contacted with the same key plus the small
+    columns the buyer list returns, so the agency export is an index-only scan
+    and the paginated list reads only products_discussed from the heap.
+    products_discussed itself is left out: JSON values can exceed the btree row size.
+    """
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_buyers_agency_last_contacted_covering
+        ON buyers (agency_id, last_contacted_at DESC NULLS LAST, id DESC)
+        INCLUDE (name, email, phone_display, company_name);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_buyers_agency_last_contacted;")
+
+    op.execute("ANALYZE buyers;")
+
+
+def downgrade():
+    """
+    Restore the non-covering agency buyer list index.
+    """
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_buyers_agency_last_contacted
+        ON buyers (agency_id, last_contacted_at DESC NULLS LAST, id DESC);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_buyers_agency_last_contacted_covering;")
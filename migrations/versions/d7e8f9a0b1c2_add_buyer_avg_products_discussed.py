@@ -0,0 +1,33 @@
+"""add materialized avg_products_discussed column to buyers
+
+Revision ID: d7e8f9a0b1c2
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e8f9a0b1c2'
+down_revision = 'c5d6e7f8a9b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add buyers.avg_products_discussed, the products aggregated from the buyer's
+    meetings, so buyer reads don't rescan every meeting. Rows start NULL; run
+    `flask backfill-products-discussed` once to fill them. After that a buyer's
+    row is refreshed whenever one of its meetings' analysis lands.
+    """
+    op.add_column('buyers', sa.Column('avg_products_discussed', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    """
+    Drop buyers.avg_products_discussed.
+    """
+    op.drop_column('buyers', 'avg_products_discussed')
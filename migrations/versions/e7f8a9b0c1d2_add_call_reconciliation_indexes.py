@@ -0,0 +1,45 @@
+"""add phone + time window indexes for call reconciliation
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7f8a9b0c1d2'
+down_revision = 'd6e7f8a9b0c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Index the phone + time window lookups the Exotel and app call webhooks use to
+    reconcile a recording with its call log (CallService.find_matching_*), so they
+    become index range scans instead of sequential scans.
+    """
+    # app_calls is partitioned; an index on the parent is created on every partition
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_app_calls_seller_time
+        ON app_calls (seller_number, start_time, end_time);
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_exotel_calls_from_time
+        ON exotel_calls (call_from, start_time, end_time);
+    """)
+
+    op.execute("ANALYZE app_calls;")
+    op.execute("ANALYZE exotel_calls;")
+
+
+def downgrade():
+    """
+    Drop the call reconciliation indexes.
+    """
+    op.execute("DROP INDEX IF EXISTS ix_exotel_calls_from_time;")
+    op.execute("DROP INDEX IF EXISTS ix_app_calls_seller_time;")
@@ -0,0 +1,49 @@
+"""add materialized last_contacted_at to buyers for keyset pagination
+
+Revision ID: e9f0a1b2c3d4
+Revises: d7e8f9a0b1c2
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9f0a1b2c3d4'
+down_revision = 'd7e8f9a0b1c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add buyers.last_contacted_at (start of the buyer's latest meeting), backfill
+    it from meetings, and index it per agency so the buyer list can be keyset
+    paginated on (last_contacted_at DESC, id DESC).
+    """
+    op.add_column('buyers', sa.Column('last_contacted_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.execute("""
+        UPDATE buyers b
+        SET last_contacted_at = m.last_contacted_at
+        FROM (
+            SELECT buyer_id, max(start_time) AS last_contacted_at
+            FROM meetings
+            GROUP BY buyer_id
+        ) m
+        WHERE b.id = m.buyer_id;
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_buyers_agency_last_contacted
+        ON buyers (agency_id, last_contacted_at DESC NULLS LAST, id DESC);
+    """)
+
+
+def downgrade():
+    """
+    Drop buyers.last_contacted_at and its index.
+    """
+    op.execute("DROP INDEX IF EXISTS idx_buyers_agency_last_contacted;")
+    op.drop_column('buyers', 'last_contacted_at')
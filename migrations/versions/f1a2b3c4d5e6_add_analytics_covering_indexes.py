@@ -0,0 +1,60 @@
+"""add covering indexes for analytics call counts
+
+Revision ID: f1a2b3c4d5e6
+Revises: vonage_integration_001, d2e5a6f8b1c0
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a2b3c4d5e6'
+down_revision = ('vonage_integration_001', 'd2e5a6f8b1c0')
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add covering indexes so the per-hour/per-day analytics COUNTs can be
+    answered with index-only scans.
+    """
+    # Meetings: filtered by (seller_id, start_time), counted by direction, joined to buyers
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_meetings_seller_time_covering
+        ON meetings (seller_id, start_time) INCLUDE (direction, buyer_id);
+    """)
+
+    # App calls: filtered by (user_id, start_time), counted by call_type/status, unique leads by buyer_number
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_app_calls_user_time_covering
+        ON app_calls (user_id, start_time) INCLUDE (call_type, status, buyer_number);
+    """)
+
+    # Cheap BRIN indexes for wide start_time ranges on append-mostly tables
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_meetings_start_time_brin
+        ON meetings USING brin (start_time);
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_app_calls_start_time_brin
+        ON app_calls USING brin (start_time);
+    """)
+
+    # Refresh planner statistics; VACUUM (for the visibility map) cannot run inside
+    # the migration transaction and is left to autovacuum
+    op.execute("ANALYZE meetings;")
+    op.execute("ANALYZE app_calls;")
+
+
+def downgrade():
+    """
+    Drop the analytics covering indexes.
+    """
+    op.execute("DROP INDEX IF EXISTS idx_app_calls_start_time_brin;")
+    op.execute("DROP INDEX IF EXISTS idx_meetings_start_time_brin;")
+    op.execute("DROP INDEX IF EXISTS idx_app_calls_user_time_covering;")
+    op.execute("DROP INDEX IF EXISTS idx_meetings_seller_time_covering;")
@@ -0,0 +1,30 @@
+"""add updated_at to buyers
+
+Revision ID: f3a4b5c6d7e8
+Revises: e9f0a1b2c3d4
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a4b5c6d7e8'
+down_revision = 'e9f0a1b2c3d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add buyers.updated_at, used as the ETag for conditional GETs on buyer reads.
+    """
+    op.add_column('buyers', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+
+
+def downgrade():
+    """
+    Drop buyers.updated_at.
+    """
+    op.drop_column('buyers', 'updated_at')
@@ -0,0 +1,39 @@
+"""add unique call_sid to exotel_calls
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a9b0c1d2e3'
+down_revision = 'e7f8a9b0c1d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Store Exotel's CallSid on exotel_calls with a unique index, so a redelivered
+    recording webhook is detected up front and CallService.create_exotel_call can
+    insert with ON CONFLICT (call_sid) DO NOTHING. Existing rows keep a NULL
+    call_sid, which the unique index allows any number of.
+    """
+    op.execute("ALTER TABLE exotel_calls ADD COLUMN IF NOT EXISTS call_sid VARCHAR(64);")
+
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_exotel_calls_call_sid
+        ON exotel_calls (call_sid);
+    """)
+
+
+def downgrade():
+    """
+    Drop exotel_calls.call_sid and its unique index.
+    """
+    op.execute("DROP INDEX IF EXISTS uq_exotel_calls_call_sid;")
+    op.drop_column('exotel_calls', 'call_sid')
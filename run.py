@@ -3,4 +3,7 @@ from app import create_app
 
 if __name__ == "__main__":
     app = create_app()
+    # Under gunicorn this is started per worker by gunicorn.conf.py
+    from app.services.token_service import TokenBlocklistService
+    TokenBlocklistService.start_blocklist_flusher(app)
     app.run(debug=True, host="0.0.0.0", port=8000)